@@ -5,6 +5,36 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # 응답 캐시 ('simple': 프로세스 내 LRU + TTL, 'null': 비활성화)
+    RESPONSE_CACHE_TYPE = os.environ.get('RESPONSE_CACHE_TYPE') or 'simple'
+    RESPONSE_CACHE_MAXSIZE = int(os.environ.get('RESPONSE_CACHE_MAXSIZE') or 256)
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL') or 300)
+    # 캐시 miss 동시 계산 수 상한 (같은 요청은 한 번만 계산하고 결과 공유, 0 이면 제한 없음)
+    RESPONSE_CACHE_MAX_CONCURRENT = int(os.environ.get('RESPONSE_CACHE_MAX_CONCURRENT') or 4)
+    # 데이터 버전(ETag/캐시 키) 재확인 주기(초): 다른 프로세스의 적재가 이 시간 안에 반영됨, 0 이면 요청마다 조회
+    RESPONSE_CACHE_VERSION_CHECK_INTERVAL = float(os.environ.get('RESPONSE_CACHE_VERSION_CHECK_INTERVAL') or 1.0)
+
+    # /api 페이지네이션 (limit 기본값 / 최대값, 전체 스트리밍 시 DB 배치 크기)
+    API_PAGE_SIZE = 100
+    API_MAX_PAGE_SIZE = 10000
+    API_STREAM_BATCH_SIZE = 5000
+
+    # 요청 계측 (Server-Timing 헤더 + Prometheus text 엔드포인트, None 이면 엔드포인트 미등록)
+    METRICS_ENABLED = (os.environ.get('METRICS_ENABLED') or '1') != '0'
+    METRICS_ENDPOINT = '/metrics'
+    # /metrics 접근 허용 대역 (콤마 구분 CIDR, 기본: loopback + 사설망)
+    METRICS_ALLOWED_NETWORKS = tuple(
+        (os.environ.get('METRICS_ALLOWED_NETWORKS') or '127.0.0.0/8,::1/128,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16')
+        .split(',')
+    )
+
+    # 배치 조회 (/batch 하위 요청 동시 실행 스레드 수, 워커 프로세스마다 DB 커넥션 풀 크기 이하로)
+    BATCH_MAX_WORKERS = int(os.environ.get('BATCH_MAX_WORKERS') or 4)
+    BATCH_MAX_REQUESTS = 10
+
+    # 실거래가 컬럼 스냅샷 디렉터리 (워커가 memory-map 으로 공유, 미지정 시 SQL 경로만 사용)
+    TRANSACTION_SNAPSHOT_DIR = os.environ.get('TRANSACTION_SNAPSHOT_DIR') or None
+
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DEV_DATABASE_URL') or \
@@ -15,8 +45,20 @@ class ProductionConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///prod.db'
 
+    # 커넥션 풀 (gunicorn 워커 프로세스마다 별도 풀)
+    # pool_pre_ping: 끊긴 커넥션 사용 전 확인 | pool_recycle: MySQL wait_timeout 이전에 재연결(초)
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE') or 5),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW') or 10),
+        'pool_pre_ping': True,
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE') or 1800),
+    }
+
 class TestingConfig(Config):
     TESTING = True
+    RESPONSE_CACHE_TYPE = 'null'
+    RESPONSE_CACHE_VERSION_CHECK_INTERVAL = 0
+    TRANSACTION_SNAPSHOT_DIR = None
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
 
 config = {
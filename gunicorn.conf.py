@@ -0,0 +1,37 @@
+import os
+import multiprocessing
+
+# gunicorn 설정 (gunicorn -c gunicorn.conf.py wsgi:app)
+# 워커 프로세스 수 x 워커당 스레드 수 = 동시 처리 요청 수
+# DB 커넥션은 워커마다 풀(DB_POOL_SIZE + DB_MAX_OVERFLOW)을 따로 가짐
+
+bind = os.getenv('GUNICORN_BIND') or '0.0.0.0:5050'
+
+# 워커 수 기본값: CPU 코어 * 2 + 1
+workers = int(os.getenv('GUNICORN_WORKERS') or multiprocessing.cpu_count() * 2 + 1)
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS') or 4)
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT') or 60)
+graceful_timeout = 30
+keepalive = 5
+
+# 메모리 누수 대비 워커 주기적 재시작 (동시에 재시작되지 않도록 jitter)
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS') or 1000)
+max_requests_jitter = 100
+
+# 마스터에서 앱을 한 번 로드한 뒤 fork (pandas/numpy 등 메모리 공유)
+preload_app = True
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL') or 'info'
+
+
+def post_fork(server, worker):
+    # fork 이전에 마스터에서 만든 커넥션을 워커가 공유하지 않도록 풀 초기화
+    from wsgi import app
+    from myapp import db
+
+    with app.app_context():
+        db.engine.dispose(close=False)
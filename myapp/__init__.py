@@ -13,6 +13,24 @@ def create_app(config_name='default'):
 
     Migrate(app, db)
 
+    from myapp.cache import cache
+    cache.init_app(app)
+
+    from myapp.responses import compression
+    compression.init_app(app)
+
+    from myapp.metrics import metrics
+    metrics.init_app(app)
+
+    from myapp.parking.spatial import parking_index
+    parking_index.init_app(app)
+
+    from myapp.batch import batch
+    batch.init_app(app)
+
+    from myapp.snapshot import transaction_snapshot
+    transaction_snapshot.init_app(app)
+
     from myapp import models
 
     from myapp.auth import auth_bp
@@ -33,4 +51,12 @@ def create_app(config_name='default'):
     from myapp.parking import parking_bp
     app.register_blueprint(parking_bp, url_prefix='/parking')
 
+    from myapp.commands import explain, summary, snapshot, export, ingest, bench
+    app.cli.add_command(explain)
+    app.cli.add_command(summary)
+    app.cli.add_command(snapshot)
+    app.cli.add_command(export)
+    app.cli.add_command(ingest)
+    app.cli.add_command(bench)
+
     return app
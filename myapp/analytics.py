@@ -0,0 +1,485 @@
+import numpy as np
+
+# 분석 라우트 공통 계산 함수 (NumPy 배열 입력, DataFrame/복사 없이 벡터 연산)
+# 그룹 계산은 그룹 키 기준으로 정렬된(연속된) 배열을 가정하고,
+# 각 행이 새 그룹의 시작인지를 나타내는 starts(bool 배열)로 그룹을 구분
+
+
+def column(rows, i, dtype=object):
+    """
+    SQL 결과 행 튜플 목록에서 i번째 컬럼을 배열로 추출
+    NULL은 float 컬럼에서 NaN, 그 밖의 컬럼은 None 을 유지한 object 배열 (ex. 접수연도가 NULL인 그룹)
+    """
+    values = [row[i] for row in rows]
+    if dtype is float:
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    if dtype is not object and None in values:
+        return np.array(values, dtype=object)
+    return np.array(values, dtype=dtype)
+
+
+def sort_order(*keys):
+    """
+    여러 키 기준 안정 정렬 인덱스 (첫 번째 키가 1순위, None은 맨 뒤)
+    """
+    if not keys or len(keys[0]) == 0:
+        return np.arange(len(keys[0]) if keys else 0)
+
+    codes = []
+    for key in reversed(keys):
+        if key.dtype != object:
+            codes.append(key)
+            continue
+
+        # 문자열 값 -> 정렬 순서 코드 (None은 가장 큰 코드)
+        present = np.not_equal(key, None)
+        uniques = np.array(sorted(set(key[present].tolist())), dtype=object)
+        code = np.full(len(key), len(uniques), dtype=np.int64)
+        code[present] = np.searchsorted(uniques, key[present])
+        codes.append(code)
+    return np.lexsort(codes)
+
+
+def group_starts(*keys):
+    """
+    정렬된 키 배열에서 그룹이 시작되는 위치 (True)
+    """
+    n = len(keys[0])
+    starts = np.zeros(n, dtype=bool)
+    if n == 0:
+        return starts
+
+    starts[0] = True
+    for key in keys:
+        starts[1:] |= key[1:] != key[:-1]
+    return starts
+
+
+def group_ids(starts):
+    """
+    행별 그룹 번호 (0부터)
+    """
+    return np.cumsum(starts) - 1
+
+
+def group_ffill(values, starts):
+    """
+    그룹 안에서만 NaN을 직전 값으로 채움 (그룹 경계를 넘지 않음)
+    """
+    n = len(values)
+    positions = np.arange(n)
+    last_valid = np.where(np.isnan(values), -1, positions)
+    last_valid = np.maximum.accumulate(last_valid) if n else last_valid
+
+    group_start = np.maximum.accumulate(np.where(starts, positions, 0)) if n else positions
+    filled = np.full(n, np.nan)
+    ok = last_valid >= group_start
+    filled[ok] = values[last_valid[ok]]
+    return filled
+
+
+def yoy_change_rate(values, starts):
+    """
+    그룹별 전년 대비 상승률(%) = pandas groupby().pct_change().mul(100).round(2)
+    (pandas와 동일하게 NaN은 그룹 안에서 직전 값으로 채운 뒤 계산, 그룹 첫 행은 NaN)
+    """
+    filled = group_ffill(values, starts)
+    shifted = np.empty_like(filled)
+    shifted[:1] = np.nan
+    shifted[1:] = filled[:-1]
+    shifted[starts] = np.nan
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = filled / shifted - 1
+    return np.round(rate * 100, 2)
+
+
+def group_first_last(values, starts):
+    """
+    그룹별 첫/마지막 유효값(NaN 제외) = pandas groupby().agg(["first", "last"])
+    """
+    ends = np.empty_like(starts)
+    ends[:-1] = starts[1:]
+    ends[-1:] = True
+
+    last = group_ffill(values, starts)[ends]
+    # 뒤집어서 ffill 하면 첫 유효값
+    first = group_ffill(values[::-1], ends[::-1])[::-1][starts]
+    return first, last
+
+
+def group_sum(values, starts):
+    return np.add.reduceat(values, np.flatnonzero(starts)) if len(values) else values[:0]
+
+
+def total_change_rate(first, last):
+    """
+    최초 대비 최종 상승률(%) 소수 둘째 자리 반올림
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.round((last - first) / first * 100, 2)
+
+
+def dense_rank_desc(values):
+    """
+    내림차순 dense rank (1부터, NaN은 꼴찌 다음 순위)
+    """
+    valid = ~np.isnan(values)
+    uniques = np.unique(values[valid])
+    rank = np.full(len(values), len(uniques) + 1, dtype=np.int64)
+    rank[valid] = len(uniques) - np.searchsorted(uniques, values[valid])
+    return rank
+
+
+def format_thousands(values):
+    """
+    소수 첫째 자리 반올림 후 천 단위 콤마 문자열 ex) 12345678.6 -> "12,345,679", NaN -> "-"
+    """
+    if len(values) == 0:
+        return np.empty(0, dtype=object)
+
+    valid = ~np.isnan(values)
+    ints = np.where(valid, np.round(values, 0), 0).astype(np.int64)
+    magnitude = np.abs(ints)
+
+    # 하위 3자리부터 콤마로 이어 붙임
+    rest = magnitude // 1000
+    out = (magnitude % 1000).astype(np.str_)
+    out = np.where(rest > 0, np.char.zfill(out, 3), out)
+    while np.any(rest > 0):
+        has_group = rest > 0
+        group = rest % 1000
+        rest = rest // 1000
+        part = group.astype(np.str_)
+        part = np.where(rest > 0, np.char.zfill(part, 3), part)
+        out = np.where(has_group, np.char.add(np.char.add(part, ','), out), out)
+
+    out = np.where(ints < 0, np.char.add('-', out), out)
+    return np.where(valid, out, '-').astype(object)
+
+
+def fill_missing(array, na='-'):
+    """
+    배열 -> JSON 응답용 list (float NaN / None은 na, 2차원 배열은 중첩 list)
+    """
+    if array.dtype.kind == 'f':
+        missing = np.isnan(array)
+        array = array.astype(object)
+        array[missing] = na
+    elif array.dtype == object:
+        missing = np.equal(array, None) | np.not_equal(array, array)  # None / NaN
+        if missing.any():
+            array = array.copy()
+            array[missing] = na
+    return array.tolist()
+
+
+def to_records(columns, na='-'):
+    """
+    {컬럼명: 배열} -> JSON 응답용 dict 목록 (float NaN / None은 na)
+    """
+    names = list(columns)
+    values = [fill_missing(columns[name], na) for name in names]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def to_columns(columns, na='-'):
+    """
+    {컬럼명: 배열} -> JSON 응답용 {컬럼명: list} (키 이름을 행마다 반복하지 않는 컬럼 형식)
+    """
+    return {name: fill_missing(values, na) for name, values in columns.items()}
+
+
+def pivot_by_year(columns, keys, values, attributes=(), totals=(), year="reception_year"):
+    """
+    긴 형식(series 키 + 연도 행) -> series × year 행렬
+    - keys: series 구분 컬럼, series 순서는 입력에서 처음 나온 순서
+    - values: series × year 행렬로 만들 컬럼 (해당 연도 행이 없으면 NaN / None)
+    - attributes: series 안에서 값이 같은 컬럼 (series 첫 행 값 사용)
+    - totals: series 단위 합계 컬럼
+    반환값: {"years": 배열, "series": {컬럼명: 배열}, "values": {컬럼명: 2차원 배열}}
+    """
+    n = len(columns[year])
+    # 연도 목록은 오름차순 (접수연도가 NULL인 행이 있으면 None 이 맨 뒤)
+    year_order = sort_order(columns[year])
+    year_starts = group_starts(columns[year][year_order])
+    years = columns[year][year_order][year_starts]
+    year_index = np.empty(n, dtype=np.int64)
+    year_index[year_order] = group_ids(year_starts)
+
+    # series 번호: 키 정렬 후 그룹 번호 -> 처음 나온 위치 순으로 다시 번호 매김
+    order = sort_order(*(columns[key] for key in keys))
+    starts = group_starts(*(columns[key][order] for key in keys))
+    group = np.empty(n, dtype=np.int64)
+    group[order] = group_ids(starts)
+
+    n_series = int(starts.sum())
+    first_row = np.full(n_series, n, dtype=np.int64)
+    np.minimum.at(first_row, group, np.arange(n))
+    appearance = np.argsort(first_row, kind="stable")
+    series_index = np.empty(n_series, dtype=np.int64)
+    series_index[appearance] = np.arange(n_series)
+    series = series_index[group]
+    first_row = first_row[appearance]
+
+    matrices = {}
+    for name in values:
+        if columns[name].dtype.kind == "f":
+            matrix = np.full((n_series, len(years)), np.nan)
+            matrix[series, year_index] = columns[name]
+        else:
+            # 정수/문자열 컬럼은 빈 칸을 None으로 둬야 값 타입이 유지됨
+            matrix = np.full((n_series, len(years)), None, dtype=object)
+            matrix[series, year_index] = columns[name].tolist()
+        matrices[name] = matrix
+
+    series_columns = {name: columns[name][first_row] for name in (*keys, *attributes)}
+    for name in totals:
+        total = np.bincount(series, weights=columns[name], minlength=n_series)
+        series_columns[name] = total.astype(columns[name].dtype)
+
+    return {"years": years, "series": series_columns, "values": matrices}
+
+
+# ---------------------------------------------------------------------------
+# 라우트별 계산 (입력/출력: 컬럼명 -> 배열 dict, 출력은 응답 행 순서로 정렬된 상태)
+# ---------------------------------------------------------------------------
+
+def district_change_rank(yearly):
+    """
+    /district: 지역구별 최초 연도 대비 최종 연도 상승률 + dense rank + 평단가 포맷
+    yearly: district_name, reception_year, avg_price_per_sqm, transaction_count
+    """
+    # Task2: 지역구별 전체 상승률 계산 (지역구가 NULL인 행은 그룹에서 제외)
+    order = sort_order(yearly["district_name"], yearly["reception_year"])
+    order = order[np.not_equal(yearly["district_name"][order], None)]
+
+    district_name = yearly["district_name"][order]
+    starts = group_starts(district_name)
+    first, last = group_first_last(yearly["avg_price_per_sqm"][order], starts)
+
+    total_rate = {
+        "district_name": district_name[starts],
+        "first": first,
+        "last": last,
+        "transaction_count": group_sum(yearly["transaction_count"][order], starts),
+        "total_change_rate": total_change_rate(first, last),
+    }
+
+    # Task3: 상승률 기준 dense rank 적용 후 랭킹으로 정렬
+    total_rate["rank"] = dense_rank_desc(total_rate["total_change_rate"])
+    order = sort_order(total_rate["rank"], total_rate["district_name"])
+
+    # Task4: 프론트 출력용 평단가 포맷 컬럼 생성
+    total_rate["price_per_sqm_format"] = format_thousands(total_rate["last"])
+
+    return {name: values[order] for name, values in total_rate.items()}
+
+
+def building_yoy_change(yearly):
+    """
+    /building: 건물유형별 전년 대비 상승률 (행 순서는 입력 그대로 유지)
+    yearly: building_use, reception_year(오름차순), avg_price_per_sqm
+    """
+    # 건물유형 기준 안정 정렬 -> 그룹 안에서는 연도 순서 유지
+    order = sort_order(yearly["building_use"])
+    starts = group_starts(yearly["building_use"][order])
+
+    yoy = np.empty(len(order))
+    yoy[order] = yoy_change_rate(yearly["avg_price_per_sqm"][order], starts)
+    yoy[np.equal(yearly["building_use"], None)] = np.nan
+
+    return {**yearly, "yoy_change_rate": yoy}
+
+
+def dong_yearly_changes(yearly):
+    """
+    법정동별 연도 상승률 + 전체 상승률 (법정동 단위 계산, 행 순서 유지)
+    yearly: district_name, legal_dong_name, reception_year, avg_price_per_sqm, transaction_count
+            (법정동 | 지역구 | 연도 순 정렬 -> (지역구, 법정동) 그룹은 연속된 행)
+    법정동마다 독립적으로 계산되므로 일부 법정동만 다시 계산해서 저장해 둘 수 있음 (summary.refresh_dong_changes)
+    """
+    starts = group_starts(yearly["district_name"], yearly["legal_dong_name"])
+    # 지역구/법정동이 NULL인 행은 그룹 계산에서 제외
+    missing_key = np.equal(yearly["district_name"], None) | np.equal(yearly["legal_dong_name"], None)
+
+    # Task 2: 연도별 상승률
+    yoy = yoy_change_rate(yearly["avg_price_per_sqm"], starts)
+    yoy[missing_key] = np.nan
+
+    # Task 3: 전체 상승률 -> 연도별 행에 그대로 붙임 (최초/최근 평단가는 저장/포맷용)
+    first, last = group_first_last(yearly["avg_price_per_sqm"], starts)
+    group = group_ids(starts)
+    total = total_change_rate(first, last)[group]
+    total[missing_key] = np.nan
+
+    return {
+        **yearly,
+        "yoy_change_rate": yoy,
+        "total_change_rate": total,
+        "first_price": first[group],
+        "last_price": last[group],
+    }
+
+
+def rank_dong_changes(changes):
+    """
+    dong_yearly_changes 결과 -> 전체 상승률 dense rank + 최근 평단가 포맷, rank + year 정렬
+    (랭킹은 조회 범위(필터) 안에서 매번 계산)
+    """
+    starts = group_starts(changes["district_name"], changes["legal_dong_name"])
+    group = group_ids(starts)
+    missing_key = np.equal(changes["district_name"], None) | np.equal(changes["legal_dong_name"], None)
+
+    # Task 4: 전체 랭킹 붙이기, rank + year 정렬 (같은 순위/연도는 입력 순서 유지)
+    change_rank = dense_rank_desc(changes["total_change_rate"])
+    order = sort_order(change_rank, changes["reception_year"])
+
+    result = {
+        name: values for name, values in changes.items() if name not in ("first_price", "last_price")
+    }
+    result["change_rank"] = change_rank
+    # Task 5: 포맷은 그룹 단위로 한 번만 계산 후 연도별 행에 붙임
+    result["price_per_sqm_format"] = np.where(
+        missing_key, "-", format_thousands(changes["last_price"][starts])[group]
+    )
+    return {name: values[order] for name, values in result.items()}
+
+
+def dong_change_rank(yearly):
+    """
+    /predict/location: 법정동별 연도 상승률 + 전체 상승률 dense rank + 최근 평단가 포맷
+    """
+    return rank_dong_changes(dong_yearly_changes(yearly))
+
+
+def dong_change_top(per_dong, n=5, bottom=False):
+    """
+    /predict/ranking: 법정동 전체 상승률 상위(하위) n위까지 (동률은 같은 순위로 모두 포함)
+    per_dong: district_name, legal_dong_name, first_price, last_price, transaction_count
+              (법정동당 한 행, SQL 윈도 함수로 최초/최근 연도 평단가까지 계산된 상태)
+    change_rank는 /predict/location 과 같은 전체 기준 dense rank
+    """
+    missing_key = np.equal(per_dong["district_name"], None) | np.equal(per_dong["legal_dong_name"], None)
+    total = total_change_rate(per_dong["first_price"], per_dong["last_price"])
+    total[missing_key] = np.nan
+    change_rank = dense_rank_desc(total)
+
+    # 전체 정렬 없이 순위 기준으로 n위 안쪽 행만 고른 뒤 그 행들만 정렬
+    if bottom:
+        lowest = int(np.unique(total[~np.isnan(total)]).size)
+        selected = np.flatnonzero((change_rank > lowest - n) & (change_rank <= lowest))
+        rank_key = -change_rank[selected]
+    else:
+        selected = np.flatnonzero((change_rank <= n) & ~np.isnan(total))
+        rank_key = change_rank[selected]
+
+    order = selected[sort_order(
+        rank_key,
+        per_dong["legal_dong_name"][selected],
+        per_dong["district_name"][selected],
+    )]
+    return {
+        "district_name": per_dong["district_name"][order],
+        "legal_dong_name": per_dong["legal_dong_name"][order],
+        "change_rank": change_rank[order],
+        "total_change_rate": total[order],
+        "avg_price_per_sqm": per_dong["last_price"][order],
+        "price_per_sqm_format": format_thousands(per_dong["last_price"][order]),
+        "transaction_count": per_dong["transaction_count"][order],
+    }
+
+
+def parking_accessibility(transactions, parking):
+    """
+    법정동별 주차 접근성 지수(PAI) = 주차 수용 면수 / 거래 건수 (거래 1건당 주차면)
+    transactions: district_name, legal_dong_name, transaction_count, avg_price_per_sqm (법정동당 한 행)
+    parking: district_name, legal_dong_name, parking_lot_count, parking_capacity (법정동당 한 행)
+    거래가 있는 법정동 기준 left join (주차장이 없는 법정동은 수용 면수 0 -> 지수 0)
+    """
+    position = {
+        key: i for i, key in enumerate(zip(parking["district_name"].tolist(), parking["legal_dong_name"].tolist()))
+    }
+    matched = np.array([
+        position.get(key, -1)
+        for key in zip(transactions["district_name"].tolist(), transactions["legal_dong_name"].tolist())
+    ], dtype=np.int64)
+    found = matched >= 0
+
+    lot_count = np.zeros(len(matched), dtype=np.int64)
+    capacity = np.zeros(len(matched), dtype=np.int64)
+    lot_count[found] = parking["parking_lot_count"][matched[found]]
+    capacity[found] = parking["parking_capacity"][matched[found]]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        index = np.round(capacity / transactions["transaction_count"], 4)
+    index[~np.isfinite(index)] = np.nan
+
+    return {
+        "district_name": transactions["district_name"],
+        "legal_dong_name": transactions["legal_dong_name"],
+        "parking_lot_count": lot_count,
+        "parking_capacity": capacity,
+        "transaction_count": transactions["transaction_count"],
+        "avg_price_per_sqm": transactions["avg_price_per_sqm"],
+        "accessibility_index": index,
+    }
+
+
+def rank_parking_accessibility(per_dong):
+    """
+    /parking/accessibility: 접근성 지수 dense rank (1 = 거래 대비 주차면이 가장 많은 법정동) + 평단가 포맷
+    rank -> 법정동 -> 지역구 순 정렬 (랭킹은 조회 범위(필터) 안에서 계산)
+    """
+    accessibility_rank = dense_rank_desc(per_dong["accessibility_index"])
+    order = sort_order(accessibility_rank, per_dong["legal_dong_name"], per_dong["district_name"])
+
+    result = {
+        **per_dong,
+        "accessibility_rank": accessibility_rank,
+        "price_per_sqm_format": format_thousands(per_dong["avg_price_per_sqm"]),
+    }
+    return {name: values[order] for name, values in result.items()}
+
+
+def period_series(monthly, period="month"):
+    """
+    /trend: 계약 연월별 합계/건수 -> 월별(또는 분기별) 평균 평단가 + 직전 기간 대비 상승률
+    monthly: contract_month(YYYYMM), price_per_sqm_sum, price_per_sqm_count, transaction_count (연월 오름차순, 연월당 한 행)
+    평균은 합계/건수로 다시 계산하므로 분기 평균도 거래 단위 평균과 같음
+    """
+    month = monthly["contract_month"]
+    year = month // 100
+    if period == "quarter":
+        sub = (month % 100 - 1) // 3 + 1
+        key = year * 10 + sub
+    else:
+        sub = month % 100
+        key = month
+
+    starts = group_starts(key)
+    price_sum = group_sum(monthly["price_per_sqm_sum"], starts)
+    price_count = group_sum(monthly["price_per_sqm_count"], starts)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg = np.where(price_count > 0, price_sum / price_count, np.nan)
+
+    year, sub = year[starts], sub[starts]
+    if period == "quarter":
+        label = np.array([f"{y}-Q{q}" for y, q in zip(year.tolist(), sub.tolist())], dtype=object)
+    else:
+        label = np.array([f"{y}-{m:02d}" for y, m in zip(year.tolist(), sub.tolist())], dtype=object)
+
+    # 직전 기간 대비 상승률: 전체가 한 그룹 (평단가가 없는 기간은 건너뛰고 직전 유효 값과 비교)
+    single = np.zeros(len(avg), dtype=bool)
+    single[:1] = True
+    change_rate = yoy_change_rate(avg, single)
+    change_rate[np.isnan(avg)] = np.nan
+    return {
+        "period": label,
+        "year": year,
+        period: sub,
+        "avg_price_per_sqm": avg,
+        "price_per_sqm_format": format_thousands(avg),
+        "change_rate": change_rate,
+        "transaction_count": group_sum(monthly["transaction_count"], starts),
+    }
@@ -1,87 +1,93 @@
-from flask import jsonify, render_template
+from flask import jsonify, render_template, request, current_app, stream_with_context
 from . import api_bp
+from .streaming import (
+    STREAM_FORMATS, resolve_columns, parse_int_arg, iter_keyset_rows, next_cursor, stream_response,
+)
 from myapp.models import RealEstateTransaction, PublicParking, Api
+from myapp.cache import cache
+from myapp.export import EXPORT_DATASETS, validate_export, iter_dataset_bytes
 
 @api_bp.route('/', methods=['GET','POST'])
 def apis():
     apis = Api.query.all()
     return render_template('api/apis.html', apis=apis)
 
+def stream_table(model, pk_column):
+    """
+    테이블 행을 keyset 페이지네이션 + 컬럼 projection 으로 스트리밍
+    - after: 이전 페이지 마지막 pk (기본 0)
+    - limit: 페이지 크기 (기본 API_PAGE_SIZE, 0이면 전체를 배치 단위로 스트리밍)
+    - fields: 내려줄 컬럼 (콤마 구분, 기본 기존 응답 컬럼)
+    - format: json (기본, JSON 배열) | ndjson
+    - 값이 올바르지 않으면 400
+    """
+    try:
+        columns = resolve_columns(model, request.args.get('fields'))
+        after = parse_int_arg(request.args, 'after', 0)
+        limit = parse_int_arg(request.args, 'limit', current_app.config['API_PAGE_SIZE'])
+        fmt = request.args.get('format', 'json')
+        if fmt not in STREAM_FORMATS:
+            raise ValueError(f'지원하지 않는 format: {fmt} (가능한 값: {", ".join(STREAM_FORMATS)})')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    names = [column.name for column in columns]
+    batch_size = current_app.config['API_STREAM_BATCH_SIZE']
+
+    # 전체 스트리밍: 커서 없이 끝까지
+    if limit == 0:
+        rows = iter_keyset_rows(pk_column, columns, after=after, batch_size=batch_size)
+        return stream_response(rows, names, fmt)
+
+    # 페이지 조회: 다음 커서는 pk 인덱스로 먼저 구해서 헤더에 싣고, 행은 조회하면서 바로 스트리밍
+    limit = min(limit, current_app.config['API_MAX_PAGE_SIZE'])
+    cursor = next_cursor(pk_column, after, limit)
+    headers = {'X-Next-Cursor': str(cursor)} if cursor is not None else {}
+
+    rows = iter_keyset_rows(pk_column, columns, after=after, limit=limit, batch_size=batch_size)
+    return stream_response(rows, names, fmt, headers=headers)
+
+# GET 조회는 데이터 버전 + 쿼리스트링 기준 ETag (If-None-Match 가 같으면 DB 조회 없이 304)
 @api_bp.route('/real_estate_transactions', methods=['GET','POST'])
+@cache.conditional('real_estate_transaction')
 def get_real_estate_transactions():
-    transactions = RealEstateTransaction.query.limit(100).all()
-    return jsonify([{
-        'ret_id': transaction.ret_id,
-        'reception_year': transaction.reception_year,
-        'district_code': transaction.district_code,
-        'district_name': transaction.district_name,
-        'legal_dong_code': transaction.legal_dong_code,
-        'legal_dong_name': transaction.legal_dong_name,
-        'jibun_type': transaction.jibun_type,
-        'jibun_type_name': transaction.jibun_type_name,
-        'main_number': transaction.main_number,
-        'sub_number': transaction.sub_number,
-        'building_name': transaction.building_name,
-        'contract_date': transaction.contract_date,
-        'amount': transaction.amount,
-        'building_area': transaction.building_area,
-        'land_area': transaction.land_area,
-        'floor': transaction.floor,
-        'right_type': transaction.right_type,
-        'cancel_date': transaction.cancel_date,
-        'construction_year': transaction.construction_year,
-        'building_use': transaction.building_use,
-        'declaration_type': transaction.declaration_type,
-        'broker_district_name': transaction.broker_district_name
-    } for transaction in transactions])
+    return stream_table(RealEstateTransaction, RealEstateTransaction.ret_id)
 
 @api_bp.route('/public_parkings', methods=['GET','POST'])
+@cache.conditional('public_parking', 'parking_occupancy')
 def get_public_parkings():
-    parkings = PublicParking.query.limit(100).all()
-    return jsonify([{
-        'pp_id': parking.pp_id,
-        'parking_code': parking.parking_code,
-        'parking_name': parking.parking_name,
-        'address': parking.address,
-        'parking_type': parking.parking_type,
-        'parking_type_name': parking.parking_type_name,
-        'operation_type': parking.operation_type,
-        'operation_type_name': parking.operation_type_name,
-        'phone_number': parking.phone_number,
-        'parking_status_available': parking.parking_status_available,
-        'parking_status_available_name': parking.parking_status_available_name,
-        'total_spaces': parking.total_spaces,
-        'current_parking': parking.current_parking,
-        'current_parking_update_time': parking.current_parking_update_time,
-        'pay_type': parking.pay_type,
-        'pay_type_name': parking.pay_type_name,
-        'night_free_open': parking.night_free_open,
-        'night_free_open_name': parking.night_free_open_name,
-        'weekday_start_time': parking.weekday_start_time,
-        'weekday_end_time': parking.weekday_end_time,
-        'weekend_start_time': parking.weekend_start_time,
-        'weekend_end_time': parking.weekend_end_time,
-        'holiday_start_time': parking.holiday_start_time,
-        'holiday_end_time': parking.holiday_end_time,
-        'saturday_pay_type': parking.saturday_pay_type,
-        'saturday_pay_type_name': parking.saturday_pay_type_name,
-        'holiday_pay_type': parking.holiday_pay_type,
-        'holiday_pay_type_name': parking.holiday_pay_type_name,
-        'monthly_rate': parking.monthly_rate,
-        'street_parking_group_no': parking.street_parking_group_no,
-        'basic_rate': parking.basic_rate,
-        'basic_time_min': parking.basic_time_min,
-        'add_rate': parking.add_rate,
-        'add_time_min': parking.add_time_min,
-        'bus_basic_rate': parking.bus_basic_rate,
-        'bus_basic_time_min': parking.bus_basic_time_min,
-        'bus_add_rate': parking.bus_add_rate,
-        'bus_add_time_min': parking.bus_add_time_min,
-        'day_max_rate': parking.day_max_rate,
-        'lat': parking.lat,
-        'lng': parking.lng,
-        'share_parking_company_name': parking.share_parking_company_name,
-        'share_parking': parking.share_parking,
-        'share_parking_company_link': parking.share_parking_company_link,
-        'share_parking_etc': parking.share_parking_etc
-    } for parking in parkings])
+    return stream_table(PublicParking, PublicParking.pp_id)
+
+# 분석용 컬럼 포맷 내보내기 (Parquet / Arrow IPC)
+@api_bp.route('/export/<dataset>', methods=['GET'])
+def export_dataset(dataset):
+    """
+    - format: parquet (기본) | arrow
+    - district: 자치구 필터, year: 접수연도 필터 (실거래가만)
+    """
+    if dataset not in EXPORT_DATASETS:
+        return jsonify({'error': f'알 수 없는 데이터셋: {dataset}'}), 404
+
+    fmt = request.args.get('format', 'parquet')
+    district_name = request.args.get('district')
+
+    try:
+        year = parse_int_arg(request.args, 'year', None)
+        validate_export(dataset, fmt=fmt, district_name=district_name, year=year)
+    except (ValueError, RuntimeError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    # 배치(row group) 단위로 기록하면서 바로 스트리밍 (전체 파일을 만든 뒤 응답하지 않음)
+    extension = 'parquet' if fmt == 'parquet' else 'arrow'
+    mimetype = 'application/vnd.apache.parquet' if fmt == 'parquet' else 'application/vnd.apache.arrow.file'
+    chunks = iter_dataset_bytes(dataset, fmt=fmt, district_name=district_name, year=year)
+    return current_app.response_class(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={dataset}.{extension}'},
+    )
+
+# 응답 캐시 hit/miss 카운터 (워커 프로세스 단위)
+@api_bp.route('/cache_stats', methods=['GET'])
+def get_cache_stats():
+    return jsonify(cache.stats())
@@ -0,0 +1,143 @@
+from flask import current_app, stream_with_context
+from sqlalchemy import select
+from myapp import db
+
+
+# 응답 형식
+STREAM_FORMATS = ('json', 'ndjson')
+
+# fields 미지정 시 기본 컬럼 (기존 /api 응답 컬럼 그대로, 이후 추가된 파생/코드 컬럼은 fields 로 지정할 때만)
+DEFAULT_COLUMNS = {
+    'real_estate_transaction': (
+        'ret_id', 'reception_year', 'district_code', 'district_name', 'legal_dong_code', 'legal_dong_name',
+        'jibun_type', 'jibun_type_name', 'main_number', 'sub_number', 'building_name', 'contract_date', 'amount',
+        'building_area', 'land_area', 'floor', 'right_type', 'cancel_date', 'construction_year', 'building_use',
+        'declaration_type', 'broker_district_name',
+    ),
+    'public_parking': (
+        'pp_id', 'parking_code', 'parking_name', 'address', 'parking_type', 'parking_type_name', 'operation_type',
+        'operation_type_name', 'phone_number', 'parking_status_available', 'parking_status_available_name',
+        'total_spaces', 'current_parking', 'current_parking_update_time', 'pay_type', 'pay_type_name',
+        'night_free_open', 'night_free_open_name', 'weekday_start_time', 'weekday_end_time', 'weekend_start_time',
+        'weekend_end_time', 'holiday_start_time', 'holiday_end_time', 'saturday_pay_type', 'saturday_pay_type_name',
+        'holiday_pay_type', 'holiday_pay_type_name', 'monthly_rate', 'street_parking_group_no', 'basic_rate',
+        'basic_time_min', 'add_rate', 'add_time_min', 'bus_basic_rate', 'bus_basic_time_min', 'bus_add_rate',
+        'bus_add_time_min', 'day_max_rate', 'lat', 'lng', 'share_parking_company_name', 'share_parking',
+        'share_parking_company_link', 'share_parking_etc',
+    ),
+}
+
+
+def default_columns(model):
+    """
+    기본 출력 컬럼 (DEFAULT_COLUMNS 에 없는 테이블은 전체 컬럼)
+    """
+    table_columns = model.__table__.columns
+    names = DEFAULT_COLUMNS.get(model.__tablename__)
+    if names is None:
+        return list(table_columns)
+    return [table_columns[name] for name in names]
+
+
+def parse_int_arg(args, name, default, minimum=0):
+    """
+    쿼리스트링 정수 값 검증 (없으면 default), 정수가 아니거나 minimum 미만이면 ValueError
+    """
+    value = args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f'{name} 값이 올바르지 않습니다: {value}')
+    if number < minimum:
+        raise ValueError(f'{name}은 {minimum} 이상이어야 합니다.')
+    return number
+
+
+def resolve_columns(model, fields=None):
+    """
+    fields 파라미터(콤마 구분) -> 컬럼 목록, 미지정 시 기본 컬럼 (코드 컬럼은 fields 로 지정할 때만)
+    존재하지 않는 컬럼이 있으면 ValueError
+    """
+    table_columns = model.__table__.columns
+    if not fields:
+        return default_columns(model)
+
+    names = [name.strip() for name in fields.split(',') if name.strip()]
+    unknown = [name for name in names if name not in table_columns]
+    if unknown:
+        raise ValueError(f"알 수 없는 컬럼: {', '.join(unknown)}")
+
+    return [table_columns[name] for name in names]
+
+
+def iter_keyset_rows(pk_column, columns, after=0, limit=None, batch_size=5000, conditions=()):
+    """
+    pk > after 기준 keyset 페이지네이션으로 (pk, *columns) 튜플을 배치 단위 조회
+    limit=None 이면 테이블 끝까지 (배치 크기만큼만 메모리 사용)
+    conditions: 추가 WHERE 조건
+    """
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        result = db.session.execute(
+            select(pk_column, *columns)
+            .where(pk_column > after, *conditions)
+            .order_by(pk_column)
+            .limit(size)
+        )
+
+        # 배치를 리스트로 모으지 않고 결과 커서에서 바로 내보냄
+        count = 0
+        for row in result:
+            yield row
+            count += 1
+            after = row[0]
+
+        if count < size:
+            return
+
+        if remaining is not None:
+            remaining -= count
+
+
+def next_cursor(pk_column, after, limit, conditions=()):
+    """
+    after 이후 limit 번째 행의 pk (페이지가 가득 차면 다음 커서, 아니면 None)
+    본문을 스트리밍하기 전에 헤더로 내려주기 위해 pk 인덱스만 조회
+    """
+    return db.session.execute(
+        select(pk_column)
+        .where(pk_column > after, *conditions)
+        .order_by(pk_column)
+        .offset(limit - 1)
+        .limit(1)
+    ).scalar()
+
+
+def encode_rows(rows, names, fmt='json'):
+    """
+    (pk, *values) 튜플 -> JSON 배열 / NDJSON 청크 generator
+    """
+    def dumps(row):
+        return current_app.json.dumps(dict(zip(names, row[1:])), separators=(',', ':'))
+
+    if fmt == 'ndjson':
+        for row in rows:
+            yield dumps(row) + '\n'
+        return
+
+    yield '['
+    for i, row in enumerate(rows):
+        yield (',' if i else '') + dumps(row)
+    yield ']'
+
+
+def stream_response(rows, names, fmt='json', headers=None):
+    mimetype = 'application/x-ndjson' if fmt == 'ndjson' else 'application/json'
+    return current_app.response_class(
+        stream_with_context(encode_rows(rows, names, fmt)),
+        mimetype=mimetype,
+        headers=headers,
+    )
@@ -0,0 +1,167 @@
+import os
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from flask import current_app, request
+from werkzeug.exceptions import HTTPException
+from myapp.responses import dumps, json_response
+
+# 여러 조회 라우트를 한 번의 요청으로 묶어서 실행 (대시보드 첫 로딩)
+# - 하위 요청마다 워커 스레드에서 별도 요청/앱 컨텍스트로 뷰 함수 실행 -> DB 세션도 하위 요청마다 따로 사용
+# - 응답 캐시/형식 처리는 각 라우트에서 단독 호출과 똑같이 동작
+# - 하위 응답 본문(JSON bytes)은 다시 파싱하지 않고 그대로 이어 붙여서 한 번에 응답
+
+logger = logging.getLogger(__name__)
+
+# 묶어서 호출할 수 있는 라우트 (POST + JSON body, 조회 전용)
+BATCH_PATHS = (
+    '/district',
+    '/building',
+    '/trend',
+    '/predict/location',
+    '/predict/ranking',
+    '/query/search',
+    '/parking/data',
+    '/parking/nearest',
+    '/parking/accessibility',
+)
+
+
+class BatchRequests:
+    """
+    배치 조회 엔드포인트 확장
+    - BATCH_ENDPOINT: 엔드포인트 경로 (None 이면 등록 안 함)
+    - BATCH_MAX_WORKERS: 하위 요청 실행 스레드 수 (워커 프로세스마다 공유하는 풀, DB 커넥션 풀 크기 이하로)
+    - BATCH_MAX_REQUESTS: 한 번에 묶을 수 있는 하위 요청 수
+    - BATCH_TIMEOUT: 배치 전체 대기 시간(초), 넘긴 하위 요청은 504
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('BATCH_ENDPOINT', '/batch')
+        app.config.setdefault('BATCH_MAX_WORKERS', 4)
+        app.config.setdefault('BATCH_MAX_REQUESTS', 10)
+        app.config.setdefault('BATCH_TIMEOUT', 30)
+        app.extensions['batch_requests'] = {
+            'lock': threading.Lock(),
+            'executor': None,
+            'pid': None,
+        }
+
+        if app.config['BATCH_ENDPOINT']:
+            app.add_url_rule(app.config['BATCH_ENDPOINT'], 'batch', self.view, methods=['POST'])
+
+    @property
+    def _state(self):
+        return current_app.extensions['batch_requests']
+
+    def _executor(self):
+        """
+        스레드 풀은 처음 사용할 때 생성 (gunicorn preload_app 으로 fork 된 워커에서는 다시 생성)
+        """
+        state = self._state
+        with state['lock']:
+            if state['executor'] is None or state['pid'] != os.getpid():
+                state['executor'] = ThreadPoolExecutor(
+                    max_workers=current_app.config['BATCH_MAX_WORKERS'], thread_name_prefix='batch',
+                )
+                state['pid'] = os.getpid()
+            return state['executor']
+
+    @staticmethod
+    def parse(data, max_requests):
+        """
+        body {"requests": [{"id": "building", "path": "/building", "body": {...}}, ...]}
+        -> [(id, path, body), ...], 형식이 틀리면 ValueError (id 생략 시 순번)
+        """
+        items = data.get('requests')
+        if not isinstance(items, list) or not items:
+            raise ValueError('requests 는 하위 요청 목록이어야 합니다.')
+        if len(items) > max_requests:
+            raise ValueError(f'하위 요청은 최대 {max_requests}개까지 가능합니다.')
+
+        parsed, ids = [], set()
+        for i, item in enumerate(items):
+            if not isinstance(item, dict):
+                raise ValueError(f'{i}번째 하위 요청 형식이 올바르지 않습니다.')
+            request_id = str(item.get('id') if item.get('id') is not None else i)
+            path = item.get('path')
+            body = item.get('body') or {}
+            if path not in BATCH_PATHS:
+                raise ValueError(f'묶을 수 없는 경로: {path} (가능한 경로: {", ".join(BATCH_PATHS)})')
+            if not isinstance(body, dict):
+                raise ValueError(f'{request_id}: body 는 JSON 객체여야 합니다.')
+            if request_id in ids:
+                raise ValueError(f'중복된 id: {request_id}')
+            ids.add(request_id)
+            parsed.append((request_id, path, body))
+        return parsed
+
+    @staticmethod
+    def dispatch(app, path, body):
+        """
+        워커 스레드에서 하위 요청 1건 실행 -> (status, JSON bytes, 소요 시간)
+        요청 컨텍스트가 앱 컨텍스트도 새로 만들므로 DB 세션은 이 하위 요청 전용 (종료 시 정리)
+        """
+        started = time.perf_counter()
+        with app.test_request_context(path, method='POST', json=body):
+            try:
+                rv = app.view_functions[request.url_rule.endpoint](**request.view_args)
+                response = app.make_response(rv)
+                return response.status_code, response.get_data(), time.perf_counter() - started
+            except HTTPException as e:
+                if e.response is not None:  # abort(json_response(...)) 로 중단한 라우트는 그 응답 그대로
+                    return e.response.status_code, e.response.get_data(), time.perf_counter() - started
+                return e.code, dumps({'error': e.description}), time.perf_counter() - started
+            except Exception:
+                logger.exception('배치 하위 요청 실패: %s', path)
+                return 500, dumps({'error': '하위 요청 처리 중 오류가 발생했습니다.'}), time.perf_counter() - started
+
+    def run(self, items):
+        """
+        하위 요청 동시 실행 -> [(id, status, JSON bytes, 소요 시간), ...] (요청 순서)
+        """
+        app = current_app._get_current_object()
+        executor = self._executor()
+        futures = [executor.submit(self.dispatch, app, path, body) for _, path, body in items]
+        wait(futures, timeout=current_app.config['BATCH_TIMEOUT'])
+
+        results = []
+        for (request_id, path, _), future in zip(items, futures):
+            if future.done():
+                results.append((request_id, *future.result()))
+            else:
+                future.cancel()
+                results.append((request_id, 504, dumps({'error': f'{path} 처리 시간 초과'}), None))
+        return results
+
+    def view(self):
+        """
+        POST /batch: 하위 요청을 스레드 풀에서 동시에 실행하고 한 번에 응답
+        응답: {"results": {id: {"status": 200, "body": <하위 응답 JSON>, "elapsed_ms": 12.3}, ...}}
+        """
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return json_response({'error': '요청 body 는 JSON 객체여야 합니다.'}, 400)
+        try:
+            items = self.parse(data, current_app.config['BATCH_MAX_REQUESTS'])
+        except ValueError as e:
+            return json_response({'error': str(e)}, 400)
+
+        parts = []
+        for request_id, status, body, elapsed in self.run(items):
+            elapsed_ms = 'null' if elapsed is None else f'{elapsed * 1000:.2f}'
+            parts.append(
+                dumps(request_id) + b':{"status":' + str(status).encode() + b',"body":' + body
+                + b',"elapsed_ms":' + elapsed_ms.encode() + b'}'
+            )
+        return current_app.response_class(
+            b'{"results":{' + b','.join(parts) + b'}}', mimetype='application/json',
+        )
+
+
+batch = BatchRequests()
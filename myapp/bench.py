@@ -0,0 +1,234 @@
+import time
+import numpy as np
+import pandas as pd
+from myapp import analytics
+
+# 분석 계산 마이크로 벤치마크
+# 기존 라우트의 pandas 구현(리팩토링 전 코드 그대로)과 analytics 모듈을 같은 입력으로 비교
+
+DISTRICT_COLUMNS = ["district_name", "reception_year", "avg_price_per_sqm", "transaction_count"]
+BUILDING_COLUMNS = ["building_use", "reception_year", "avg_price_per_sqm"]
+DONG_COLUMNS = ["district_name", "legal_dong_name", "reception_year", "avg_price_per_sqm", "transaction_count"]
+
+
+def make_yearly_rows(n_districts=25, n_dongs=20, years=range(2015, 2026), seed=0):
+    """
+    SQL 집계 결과와 같은 모양의 합성 행 (지역구 × 법정동 × 연도)
+    반환값: {'district': rows, 'building': rows, 'dong': rows}
+    """
+    rng = np.random.default_rng(seed)
+    years = list(years)
+    districts = [f"{i:02d}구" for i in range(n_districts)]
+    dongs = [f"{i:03d}동" for i in range(n_dongs)]
+
+    dong_rows = []
+    for dong in dongs:
+        for district in districts:
+            base = rng.uniform(5e6, 2e7)
+            for year in years:
+                base *= rng.uniform(0.9, 1.15)
+                dong_rows.append((district, dong, year, float(base), int(rng.integers(1, 200))))
+
+    district_rows = [
+        (district, year, float(rng.uniform(5e6, 2e7)), int(rng.integers(100, 5000)))
+        for district in districts for year in years
+    ]
+    building_rows = [
+        (building_use, year, float(rng.uniform(5e6, 2e7)))
+        for year in years for building_use in ('아파트', '연립다세대', '단독다가구', '오피스텔')
+    ]
+    return {'district': district_rows, 'building': building_rows, 'dong': dong_rows}
+
+
+# ---------------------------------------------------------------------------
+# 리팩토링 전 pandas 구현 (비교 기준)
+# ---------------------------------------------------------------------------
+
+def legacy_district(rows):
+    df_yearly = pd.DataFrame(rows, columns=DISTRICT_COLUMNS)
+    total_rate_df = (
+        df_yearly
+        .sort_values(["district_name", "reception_year"])
+        .groupby("district_name")
+        .agg(
+            first=("avg_price_per_sqm", "first"),
+            last=("avg_price_per_sqm", "last"),
+            transaction_count=("transaction_count", "sum"),
+        )
+        .reset_index()
+    )
+    total_rate_df["total_change_rate"] = (
+        (total_rate_df["last"] - total_rate_df["first"])
+        / total_rate_df["first"] * 100
+    ).round(2)
+
+    df = total_rate_df.copy()
+    df["rank"] = df["total_change_rate"].rank(method="dense", ascending=False).astype(int)
+    df = df.sort_values(["rank", "district_name"])
+
+    df = df.copy()
+    df["price_per_sqm_format"] = df["last"].round(0).map(lambda x: f"{int(x):,}")
+    return df.fillna("-").to_dict(orient="records")
+
+
+def legacy_building(rows):
+    df = pd.DataFrame(rows, columns=BUILDING_COLUMNS)
+    df = df.copy()
+    df["yoy_change_rate"] = (
+        df.groupby("building_use")["avg_price_per_sqm"].pct_change().mul(100).round(2)
+    )
+    return df.fillna("-").to_dict(orient="records")
+
+
+def legacy_dong(rows):
+    df = pd.DataFrame(rows, columns=DONG_COLUMNS)
+    if df.empty:
+        return []
+
+    df = df.copy()
+    df["yoy_change_rate"] = (
+        df.groupby(["district_name", "legal_dong_name"])["avg_price_per_sqm"]
+        .pct_change().mul(100).round(2)
+    )
+
+    df = df.copy()
+    total_rate = (
+        df.sort_values(["district_name", "legal_dong_name", "reception_year"])
+        .groupby(["district_name", "legal_dong_name"])["avg_price_per_sqm"]
+        .agg(["first", "last"])
+        .reset_index()
+    )
+    total_rate["total_change_rate"] = (
+        (total_rate["last"] - total_rate["first"]) / total_rate["first"] * 100
+    ).round(2)
+    df = df.merge(
+        total_rate[["district_name", "legal_dong_name", "total_change_rate", "last"]],
+        on=["district_name", "legal_dong_name"],
+        how="left",
+    )
+
+    df = df.copy()
+    df["change_rank"] = df["total_change_rate"].rank(method="dense", ascending=False).astype(int)
+    df = df.sort_values(["change_rank", "reception_year"])
+
+    df = df.copy()
+    df["price_per_sqm_format"] = (
+        df["last"].round(0).map(lambda x: f"{int(x):,}" if pd.notna(x) else "-")
+    )
+    df["yoy_change_rate"] = df["yoy_change_rate"].fillna("-")
+    df["total_change_rate"] = df["total_change_rate"].fillna("-")
+    df = df.drop(columns=["last"], errors="ignore")
+    return df.fillna("-").to_dict(orient="records")
+
+
+# ---------------------------------------------------------------------------
+# analytics 모듈 구현 (라우트와 동일하게 SQL 행 -> 컬럼 배열 변환 포함)
+# ---------------------------------------------------------------------------
+
+def to_columns(rows, names, dtypes):
+    return {name: analytics.column(rows, i, dtype) for i, (name, dtype) in enumerate(zip(names, dtypes))}
+
+
+def numpy_district(rows):
+    yearly = to_columns(rows, DISTRICT_COLUMNS, (object, np.int64, float, np.int64))
+    return analytics.to_records(analytics.district_change_rank(yearly))
+
+
+def numpy_building(rows):
+    yearly = to_columns(rows, BUILDING_COLUMNS, (object, np.int64, float))
+    return analytics.to_records(analytics.building_yoy_change(yearly))
+
+
+def numpy_dong(rows):
+    yearly = to_columns(rows, DONG_COLUMNS, (object, object, np.int64, float, np.int64))
+    return analytics.to_records(analytics.dong_change_rank(yearly))
+
+
+BENCH_CASES = {
+    'district': (legacy_district, numpy_district),
+    'building': (legacy_building, numpy_building),
+    'predict_location': (legacy_dong, numpy_dong),
+}
+
+
+def cpu_ms(func, rows, repeat):
+    """
+    호출 1회당 CPU 시간(ms) 중앙값 (time.process_time 기준)
+    """
+    samples = []
+    for _ in range(repeat):
+        started = time.process_time()
+        func(rows)
+        samples.append((time.process_time() - started) * 1000)
+    return float(np.median(samples))
+
+
+def run_analytics_bench(n_districts=25, n_dongs=20, repeat=20, seed=0):
+    """
+    라우트별 기존(pandas) / 변경(analytics) CPU 시간 비교 + 결과 동일 여부
+    반환값: [{'case', 'rows', 'legacy_ms', 'numpy_ms', 'speedup', 'same'}, ...]
+    """
+    data = make_yearly_rows(n_districts, n_dongs, seed=seed)
+    data['predict_location'] = data.pop('dong')
+
+    results = []
+    for case, (legacy, vectorized) in BENCH_CASES.items():
+        rows = data[case]
+        legacy_ms = cpu_ms(legacy, rows, repeat)
+        numpy_ms = cpu_ms(vectorized, rows, repeat)
+        results.append({
+            'case': case,
+            'rows': len(rows),
+            'legacy_ms': legacy_ms,
+            'numpy_ms': numpy_ms,
+            'speedup': legacy_ms / numpy_ms if numpy_ms else float('inf'),
+            'same': legacy(rows) == vectorized(rows),
+        })
+    return results
+
+
+# ---------------------------------------------------------------------------
+# 주차장 근접 검색: 격자 인덱스 vs 전체 거리 계산
+# ---------------------------------------------------------------------------
+
+def run_nearest_bench(snapshot, queries=1000, radius_m=1000, k=10, min_available=1, seed=0):
+    """
+    데이터 좌표 범위 안의 임의 지점으로 인덱스 조회와 전체 스캔 결과/시간 비교
+    반환값: {'queries', 'indexed', 'index_us', 'scan_us', 'speedup', 'mismatches'}
+    """
+    from myapp.parking.spatial import brute_force_query
+
+    index = snapshot.index
+    points = index.points
+    if not len(points):
+        return {'queries': 0, 'indexed': 0, 'index_us': 0.0, 'scan_us': 0.0, 'speedup': 0.0, 'mismatches': 0}
+
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(index.lat[points].min(), index.lat[points].max(), queries)
+    lngs = rng.uniform(index.lng[points].min(), index.lng[points].max(), queries)
+    with np.errstate(invalid='ignore'):
+        mask = snapshot.available >= min_available if min_available > 0 else None
+    # 전체 스캔은 NaN 좌표를 거리 NaN 으로 제외
+    all_lat = np.nan_to_num(index.lat, nan=0.0)
+    all_lng = np.nan_to_num(index.lng, nan=0.0)
+
+    def timed(func):
+        started = time.perf_counter()
+        results = [func(lat, lng) for lat, lng in zip(lats, lngs)]
+        return results, (time.perf_counter() - started) / queries * 1e6
+
+    indexed, index_us = timed(lambda lat, lng: index.query(lat, lng, radius_m, k, mask=mask))
+    scanned, scan_us = timed(lambda lat, lng: brute_force_query(lat, lng, all_lat, all_lng, radius_m, k, mask=mask))
+
+    mismatches = sum(
+        1 for (a_ids, a_dist), (b_ids, b_dist) in zip(indexed, scanned)
+        if len(a_ids) != len(b_ids) or not np.allclose(a_dist, b_dist)
+    )
+    return {
+        'queries': queries,
+        'indexed': len(points),
+        'index_us': index_us,
+        'scan_us': scan_us,
+        'speedup': scan_us / index_us if index_us else float('inf'),
+        'mismatches': mismatches,
+    }
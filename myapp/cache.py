@@ -0,0 +1,396 @@
+import json
+import hashlib
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import wraps
+from flask import current_app, request, has_app_context
+from sqlalchemy import select
+from myapp.models import DataVersion
+from myapp.responses import request_params, choose_encoding
+from myapp import db
+
+
+# 응답 캐시 키에서 제외하는 버전 (수시로 바뀌고 캐시 대상 라우트 결과와 무관)
+# - parking_occupancy: 주차 현황 피드 배치마다 증가 (주차장 메모리 테이블 증분 반영 기준)
+UNCACHED_VERSIONS = ('parking_occupancy',)
+
+
+def read_data_versions():
+    """
+    전체 데이터셋 버전 튜플 (UNCACHED_VERSIONS 포함)
+    """
+    rows = db.session.execute(
+        select(DataVersion.name, DataVersion.version).order_by(DataVersion.name)
+    ).all()
+    return tuple((name, version) for name, version in rows)
+
+
+def select_versions(versions, names=None):
+    """
+    names 데이터셋 버전만 골라냄 (None 이면 응답 캐시 키 기준: UNCACHED_VERSIONS 제외 전체)
+    """
+    if names is None:
+        return tuple(item for item in versions if item[0] not in UNCACHED_VERSIONS)
+    return tuple(item for item in versions if item[0] in names)
+
+
+def get_data_version(names=None):
+    """
+    데이터셋별 버전 튜플 ex) (('public_parking', 2), ('real_estate_transaction', 5))
+    """
+    return select_versions(read_data_versions(), names)
+
+
+def canonical_params(params):
+    """
+    조회 파라미터 dict -> 키 정렬 JSON 문자열 (캐시 키 / ETag 계산용)
+    """
+    return json.dumps(params, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def make_etag(key):
+    """
+    캐시 키(경로, 파라미터, 데이터 버전) -> 강한 ETag 값 (따옴표 제외)
+    데이터 버전이 같으면 같은 파라미터의 응답 본문은 바뀌지 않으므로 본문을 해시하지 않고 키로 계산
+    """
+    return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+
+def bump_data_version(*names):
+    """
+    데이터 적재/갱신 후 호출 -> 버전이 바뀌면 모든 워커의 캐시 항목이 무효화됨
+    """
+    for name in names:
+        row = db.session.get(DataVersion, name)
+        if row is None:
+            row = DataVersion(name=name, version=0)
+            db.session.add(row)
+        row.version += 1
+        row.updated_at = datetime.now()
+    db.session.commit()
+
+    # 같은 프로세스의 버전 메모는 바로 만료 (다른 워커는 확인 주기 안에 반영)
+    if has_app_context() and 'response_cache' in current_app.extensions:
+        current_app.extensions['response_cache']['versions_checked_at'] = 0.0
+
+
+class SimpleCacheBackend:
+    """
+    프로세스 내 LRU + TTL 캐시
+    """
+
+    def __init__(self, maxsize=256, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._items[key]
+                return None
+
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class NullCacheBackend:
+    """
+    캐시 비활성화
+    """
+
+    def __init__(self, **kwargs):
+        pass
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def clear(self):
+        pass
+
+    def __len__(self):
+        return 0
+
+
+CACHE_BACKENDS = {
+    'simple': SimpleCacheBackend,
+    'null': NullCacheBackend,
+}
+
+
+class Flight:
+    """
+    진행 중인 계산 1건 (같은 키로 들어온 요청들이 결과를 기다림)
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None  # (본문, status, mimetype), 계산이 실패하면 None
+
+
+class ResponseCache:
+    """
+    라우트 + 정규화된 JSON body 기준 응답 캐시
+    - RESPONSE_CACHE_TYPE: 'simple' | 'null'
+    - 캐시 키에 데이터 버전을 포함해서 적재 후에는 자동으로 miss
+    - single-flight: 같은 키의 요청이 동시에 miss 나면 한 요청만 계산하고 나머지는 그 결과를 받음 (워커 프로세스 단위)
+    - RESPONSE_CACHE_MAX_CONCURRENT: 동시에 계산하는 요청 수 상한 (0 이면 제한 없음)
+    - RESPONSE_CACHE_WAIT_TIMEOUT: 계산 차례 / 다른 요청의 결과를 기다리는 최대 시간(초), 넘으면 503
+    - GET 요청: 캐시 키로 강한 ETag 를 만들고, If-None-Match 가 같으면 캐시/DB 조회 없이 304
+    - RESPONSE_CACHE_VERSION_CHECK_INTERVAL: 데이터 버전 테이블을 다시 읽는 주기(초), 0 이면 요청마다 조회
+      (이 주기 안에서는 요청마다 SQL 없이 워커 메모리의 버전 사용)
+    - RESPONSE_CACHE_CONTROL: ETag 응답의 Cache-Control (기본 no-cache: 브라우저/프록시가 저장하되 매번 재검증)
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RESPONSE_CACHE_TYPE', 'simple')
+        app.config.setdefault('RESPONSE_CACHE_MAXSIZE', 256)
+        app.config.setdefault('RESPONSE_CACHE_TTL', 300)
+        app.config.setdefault('RESPONSE_CACHE_MAX_CONCURRENT', 4)
+        app.config.setdefault('RESPONSE_CACHE_WAIT_TIMEOUT', 30)
+        app.config.setdefault('RESPONSE_CACHE_VERSION_CHECK_INTERVAL', 1.0)
+        app.config.setdefault('RESPONSE_CACHE_CONTROL', 'no-cache')
+
+        backend_cls = CACHE_BACKENDS[app.config['RESPONSE_CACHE_TYPE']]
+        max_concurrent = app.config['RESPONSE_CACHE_MAX_CONCURRENT']
+        app.extensions['response_cache'] = {
+            'backend': backend_cls(
+                maxsize=app.config['RESPONSE_CACHE_MAXSIZE'],
+                ttl=app.config['RESPONSE_CACHE_TTL'],
+            ),
+            'flights': {},
+            'versions': None,
+            'versions_checked_at': 0.0,
+            'slots': threading.BoundedSemaphore(max_concurrent) if max_concurrent else None,
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'rejected': 0,
+            'not_modified': 0,
+            'lock': threading.Lock(),
+        }
+
+    @property
+    def _state(self):
+        return current_app.extensions['response_cache']
+
+    def _count(self, counter):
+        state = self._state
+        with state['lock']:
+            state[counter] += 1
+
+    def data_version(self, names=None):
+        """
+        get_data_version 과 같은 결과를 RESPONSE_CACHE_VERSION_CHECK_INTERVAL 동안 워커 메모리에서 재사용
+        """
+        state = self._state
+        now = time.monotonic()
+        if state['versions'] is None or now - state['versions_checked_at'] >= current_app.config['RESPONSE_CACHE_VERSION_CHECK_INTERVAL']:
+            state['versions'] = read_data_versions()
+            state['versions_checked_at'] = now
+        return select_versions(state['versions'], names)
+
+    def make_key(self, names=None):
+        return request.path, canonical_params(request_params()), self.data_version(names)
+
+    def _not_modified(self, etag):
+        """
+        GET 요청의 If-None-Match 가 현재 ETag 와 같으면 304 응답, 아니면 None
+        - 압축 접미사는 이 요청의 Accept-Encoding 으로 받을 방식만 인정
+          (압축하지 않는 작은 응답은 접미사 없는 ETag 이므로 함께 비교)
+        """
+        if request.method not in ('GET', 'HEAD') or not request.if_none_match:
+            return None
+
+        candidates = [etag]
+        encoding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+        if encoding is not None and current_app.config['JSON_COMPRESS_MIN_SIZE']:
+            candidates.append(f'{etag}-{encoding}')
+        matched = next((tag for tag in candidates if request.if_none_match.contains(tag)), None)
+        if matched is None and not request.if_none_match.star_tag:
+            return None
+
+        self._count('not_modified')
+        response = current_app.response_class(status=304)
+        self._validators(response, matched or etag)
+        response.vary.add('Accept-Encoding')
+        return response
+
+    @staticmethod
+    def _validators(response, etag):
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = current_app.config['RESPONSE_CACHE_CONTROL']
+
+    @staticmethod
+    def _response(result, cache_status):
+        data, status, mimetype = result
+        response = current_app.response_class(data, status=status, mimetype=mimetype)
+        response.headers['X-Cache'] = cache_status
+        return response
+
+    def _busy(self):
+        self._count('rejected')
+        response = current_app.response_class(
+            json.dumps({'error': '요청이 많아 잠시 후 다시 시도해 주세요.'}, ensure_ascii=False),
+            status=503, mimetype='application/json',
+        )
+        response.headers['Retry-After'] = '1'
+        return response
+
+    def _compute(self, view, args, kwargs, key):
+        """
+        계산 슬롯(동시 계산 수 제한)을 얻어서 뷰 실행 -> (응답, (본문, status, mimetype)), 200 이면 캐시에 저장
+        슬롯을 기다리다 시간이 넘으면 (None, None)
+        """
+        state = self._state
+        slots = state['slots']
+        if slots is not None and not slots.acquire(timeout=current_app.config['RESPONSE_CACHE_WAIT_TIMEOUT']):
+            return None, None
+
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+            result = (response.get_data(), response.status_code, response.mimetype)
+        finally:
+            if slots is not None:
+                slots.release()
+
+        if response.status_code == 200:
+            state['backend'].set(key, (result[0], result[2]))
+        return response, result
+
+    def _cached_response(self, view, args, kwargs, key):
+        """
+        캐시 HIT / 같은 키 계산 대기(single-flight) / 직접 계산 순서로 응답
+        """
+        state = self._state
+        entry = state['backend'].get(key)
+        if entry is not None:
+            self._count('hits')
+            data, mimetype = entry
+            return self._response((data, 200, mimetype), 'HIT')
+
+        # single-flight: 같은 키를 계산 중인 요청이 있으면 그 결과를 기다림
+        with state['lock']:
+            flight = state['flights'].get(key)
+            leader = flight is None
+            if leader:
+                flight = state['flights'][key] = Flight()
+
+        if not leader:
+            if flight.done.wait(current_app.config['RESPONSE_CACHE_WAIT_TIMEOUT']) and flight.result is not None:
+                self._count('coalesced')
+                return self._response(flight.result, 'COALESCED')
+            if not flight.done.is_set():
+                return self._busy()
+            # 먼저 계산하던 요청이 실패 -> 직접 계산
+
+        self._count('misses')
+        try:
+            response, result = self._compute(view, args, kwargs, key)
+            if leader:
+                flight.result = result
+        finally:
+            if leader:
+                with state['lock']:
+                    state['flights'].pop(key, None)
+                flight.done.set()
+
+        if response is None:
+            return self._busy()
+        response.headers['X-Cache'] = 'MISS'
+        return response
+
+    def cached(self, view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = self.make_key()
+            if request.method not in ('GET', 'HEAD'):
+                return self._cached_response(view, args, kwargs, key)
+
+            # 조건부 GET: 캐시 백엔드 / 뷰(SQL)보다 먼저 확인
+            etag = make_etag(key)
+            not_modified = self._not_modified(etag)
+            if not_modified is not None:
+                return not_modified
+
+            response = self._cached_response(view, args, kwargs, key)
+            if response.status_code == 200:
+                self._validators(response, etag)
+            return response
+
+        return wrapper
+
+    def conditional(self, *names):
+        """
+        응답 캐시 없이 ETag / 304 만 적용 (스트리밍 응답 등)
+        names: 응답 내용이 의존하는 데이터셋 버전 (UNCACHED_VERSIONS 도 지정 가능)
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return view(*args, **kwargs)
+
+                etag = make_etag(self.make_key(names or None))
+                not_modified = self._not_modified(etag)
+                if not_modified is not None:
+                    return not_modified
+
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    self._validators(response, etag)
+                return response
+
+            return wrapper
+
+        return decorator
+
+    def clear(self):
+        self._state['backend'].clear()
+
+    def stats(self):
+        state = self._state
+        total = state['hits'] + state['misses'] + state['coalesced']
+        return {
+            'type': current_app.config['RESPONSE_CACHE_TYPE'],
+            'size': len(state['backend']),
+            'hits': state['hits'],
+            'misses': state['misses'],
+            'coalesced': state['coalesced'],
+            'rejected': state['rejected'],
+            'not_modified': state['not_modified'],
+            'in_flight': len(state['flights']),
+            'hit_rate': round((state['hits'] + state['coalesced']) / total, 4) if total else 0,
+        }
+
+
+cache = ResponseCache()
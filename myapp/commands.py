@@ -0,0 +1,532 @@
+import os
+import sys
+import time
+import click
+import numpy as np
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import select, update, text
+from myapp.models import RealEstateTransaction, TransactionYearlySummary, contract_month_of
+from myapp.summary import (
+    refresh_transaction_summary, refresh_parking_accessibility, rebuild_monthly_summary, build_dong_yearly_stmt,
+    dong_changes_available,
+)
+from myapp.lookup import backfill_lookup_codes
+from myapp.cache import bump_data_version
+from myapp.snapshot import (
+    transaction_snapshot, write_snapshot, prune_snapshots, current_version, TransactionSnapshot, same_table,
+)
+from myapp.export import EXPORT_DATASETS, EXPORT_FORMATS, write_dataset
+from myapp.ingest import INGEST_DATASETS, ingest_csv
+from myapp.bench import run_analytics_bench, run_nearest_bench, to_columns, DONG_COLUMNS
+from myapp import analytics
+from myapp.loadtest import (
+    build_endpoints, table_counts, seed_database, run_client_bench, run_http_load,
+    make_baseline, save_baseline, load_baseline, compare_baselines,
+)
+from myapp import db
+
+
+def fetch_sample_filters():
+    """
+    실행 계획 확인용 필터 값 (테이블의 첫 행 기준, 비어 있으면 기본값)
+    """
+    row = db.session.execute(
+        select(
+            RealEstateTransaction.district_name,
+            RealEstateTransaction.legal_dong_name,
+            RealEstateTransaction.building_use,
+            RealEstateTransaction.amount,
+        ).limit(1)
+    ).first()
+    return row or ('도봉구', '방학동', '아파트', 100000)
+
+
+def build_route_statements():
+    """
+    라우트별로 실제 실행되는 SELECT 문
+    """
+    from myapp.main.routes import (
+        build_yearly_avg_price_by_district_stmt,
+        build_yearly_avg_price_by_building_stmt,
+        build_monthly_price_stmt,
+    )
+    from myapp.predict.routes import build_yearly_avg_price_by_dong_stmt, build_dong_change_stmt
+    from myapp.query.routes import build_search_stmt
+
+    district_name, legal_dong_name, building_use, amount = fetch_sample_filters()
+
+    return [
+        ('/query/search (구/동/용도/금액)', build_search_stmt(
+            district_name=district_name,
+            legal_dong_name=legal_dong_name,
+            building_use=building_use,
+            amount=amount,
+        ).limit(1000)),
+        ('/query/search (구)', build_search_stmt(district_name=district_name).limit(1000)),
+        ('/query/search (용도/금액)', build_search_stmt(building_use=building_use, amount=amount).limit(1000)),
+        ('/query/search (금액)', build_search_stmt(amount=amount).limit(1000)),
+        ('/query/search (전체, 기본 조회)', build_search_stmt().limit(1000)),
+        ('/predict/location (전체)', build_yearly_avg_price_by_dong_stmt()),
+        ('/predict/location (구/동)', build_yearly_avg_price_by_dong_stmt(
+            district_name=district_name,
+            legal_dong_name=legal_dong_name,
+        )),
+        ('/predict/ranking (구)', build_dong_change_stmt(
+            build_yearly_avg_price_by_dong_stmt(district_name=district_name),
+        )),
+        ('/district', build_yearly_avg_price_by_district_stmt()),
+        ('/building', build_yearly_avg_price_by_building_stmt()),
+        ('/trend (구, 기간)', build_monthly_price_stmt(district_name=district_name, start=202001, end=202312)),
+    ]
+
+
+def explain_stmt(stmt):
+    """
+    dialect별 실행 계획 조회 -> (계획 라인 목록, 테이블 풀스캔 여부, 정렬 단계 여부)
+    """
+    dialect = db.engine.dialect
+    sql = str(stmt.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+
+    if dialect.name == 'sqlite':
+        rows = db.session.execute(text(f'EXPLAIN QUERY PLAN {sql}')).all()
+        lines = [row[3] for row in rows]
+        # 서브쿼리(CO-ROUTINE / MATERIALIZE) 결과 스캔은 테이블 풀스캔이 아님
+        derived = {line.split()[1] for line in lines if line.startswith(('CO-ROUTINE ', 'MATERIALIZE '))}
+        full_scan = any(
+            line.startswith('SCAN ') and 'INDEX' not in line and line.split()[1] not in derived
+            for line in lines
+        )
+        sort = any(line.startswith('USE TEMP B-TREE FOR ORDER BY') for line in lines)
+    elif dialect.name in ('mysql', 'mariadb'):
+        rows = db.session.execute(text(f'EXPLAIN {sql}')).mappings().all()
+        lines = [', '.join(f'{k}={v}' for k, v in row.items()) for row in rows]
+        full_scan = any(row['type'] == 'ALL' for row in rows)
+        sort = any('filesort' in (row['Extra'] or '') for row in rows)
+    else:
+        rows = db.session.execute(text(f'EXPLAIN {sql}')).all()
+        lines = [row[0] for row in rows]
+        full_scan = any('Seq Scan' in line for line in lines)
+        sort = any(line.strip().lstrip('->').strip().startswith('Sort ') for line in lines)
+
+    return lines, full_scan, sort
+
+
+@click.command('explain')
+@with_appcontext
+def explain():
+    """라우트별 SQL 실행 계획 출력 (테이블 풀스캔 / LIMIT 조회의 정렬 단계가 있으면 exit code 1)"""
+    click.echo(f'DB: {db.engine.url.render_as_string(hide_password=True)}')
+
+    full_scans, sorts = [], []
+    for route, stmt in build_route_statements():
+        lines, full_scan, sort = explain_stmt(stmt)
+        # LIMIT 조회(페이지)는 인덱스 순서로 읽어야 앞 N행만 읽고 끝남 (정렬 단계가 있으면 조건에 맞는 행 전체를 읽고 정렬)
+        sort = sort and stmt._limit_clause is not None
+        click.echo(f'\n[{route}]{" FULL SCAN" if full_scan else ""}{" SORT" if sort else ""}')
+        for line in lines:
+            click.echo(f'  {line}')
+        if full_scan:
+            full_scans.append(route)
+        if sort:
+            sorts.append(route)
+
+    click.echo(f'\n풀스캔 {len(full_scans)}건' + (f': {", ".join(full_scans)}' if full_scans else ''))
+    click.echo(f'LIMIT 조회 정렬 {len(sorts)}건' + (f': {", ".join(sorts)}' if sorts else ''))
+    if full_scans or sorts:
+        sys.exit(1)
+
+
+@click.group('summary')
+def summary():
+    """연도별 평단가 집계 테이블 관리"""
+
+
+@summary.command('refresh')
+@click.option('--full', is_flag=True, help='전체 삭제 후 재집계')
+@with_appcontext
+def refresh_summary(full):
+    """새로 적재된 거래를 집계 테이블에 반영"""
+    key_count, transaction_count, dong_count = refresh_transaction_summary(full=full)
+    bump_data_version('real_estate_transaction')
+    click.echo(f'집계 테이블 갱신 완료: 키 {key_count}건, 거래 {transaction_count}건 반영, 법정동 {dong_count}곳 상승률 재계산')
+
+
+@summary.command('backfill-month')
+@click.option('--batch-size', default=10000, show_default=True, help='UPDATE 배치 크기')
+@click.option('--all', 'refresh_all', is_flag=True, help='이미 채워진 행도 다시 파싱')
+@with_appcontext
+def backfill_month(batch_size, refresh_all):
+    """기존 거래 행의 계약일을 파싱해 계약 연월 컬럼 채우기 + 월별 집계 테이블 재집계"""
+    stmt = select(RealEstateTransaction.ret_id, RealEstateTransaction.contract_date).order_by(RealEstateTransaction.ret_id)
+    if not refresh_all:
+        stmt = stmt.where(
+            RealEstateTransaction.contract_month.is_(None), RealEstateTransaction.contract_date.isnot(None),
+        )
+
+    # ret_id 기준 keyset 페이지 단위로 읽어서 전체 행을 메모리에 올리지 않음
+    last_id, row_count = 0, 0
+    while True:
+        rows = db.session.execute(stmt.where(RealEstateTransaction.ret_id > last_id).limit(batch_size)).all()
+        if not rows:
+            break
+
+        params = [{'ret_id': ret_id, 'contract_month': contract_month_of(contract_date)} for ret_id, contract_date in rows]
+        # 기본키 기준 ORM bulk UPDATE (executemany)
+        db.session.execute(update(RealEstateTransaction), params)
+        db.session.commit()
+        last_id, row_count = rows[-1][0], row_count + len(rows)
+
+    key_count = rebuild_monthly_summary()
+    bump_data_version('real_estate_transaction')
+    click.echo(f'계약 연월 backfill 완료: {row_count}건, 월별 집계 키 {key_count}건')
+
+
+@summary.command('backfill-lookup')
+@click.option('--batch-size', default=10000, show_default=True, help='UPDATE 배치 크기')
+@click.option('--all', 'refresh_all', is_flag=True, help='이미 채워진 행도 다시 매핑')
+@with_appcontext
+def backfill_lookup(batch_size, refresh_all):
+    """기존 거래 행의 구/동/용도 등 문자열 컬럼 -> 참조 테이블 코드 컬럼 채우기 + 집계 테이블 재집계"""
+    row_count = backfill_lookup_codes(batch_size=batch_size, refresh_all=refresh_all)
+    key_count, transaction_count, dong_count = refresh_transaction_summary(full=True)
+    bump_data_version('real_estate_transaction')
+    click.echo(f'코드 컬럼 backfill 완료: {row_count}건, 집계 키 {key_count}건 재집계')
+
+
+@summary.command('compare')
+@with_appcontext
+def compare_summary():
+    """저장된 법정동 상승률과 집계 테이블에서 새로 계산한 /predict/location 응답 비교 (전체 + 자치구별)"""
+    from myapp.predict.routes import fetch_dong_yearly_changes
+
+    if not dong_changes_available():
+        raise click.ClickException('법정동 상승률 테이블이 비어 있습니다. flask summary refresh 를 먼저 실행하세요.')
+
+    def expected(district_name):
+        stmt = build_dong_yearly_stmt()
+        if district_name:
+            stmt = stmt.where(TransactionYearlySummary.district_name == district_name)
+        yearly = to_columns(db.session.execute(stmt).fetchall(), DONG_COLUMNS, (object, object, np.int64, float, np.int64))
+        return analytics.to_records(analytics.dong_change_rank(yearly))
+
+    districts = db.session.execute(
+        select(TransactionYearlySummary.district_name).where(TransactionYearlySummary.district_name.isnot(None)).distinct()
+    ).scalars().all()
+
+    mismatches = 0
+    for district_name in [None, *sorted(districts)]:
+        actual = analytics.to_records(analytics.rank_dong_changes(fetch_dong_yearly_changes(district_name)))
+        if actual != expected(district_name):
+            mismatches += 1
+            click.echo(f'불일치: district={district_name}')
+
+    click.echo(f'비교 {len(districts) + 1}건, 불일치 {mismatches}건')
+    if mismatches:
+        sys.exit(1)
+
+
+@click.group('snapshot')
+def snapshot():
+    """실거래가 컬럼 스냅샷 (memory-map 집계 엔진) 관리"""
+
+
+@snapshot.command('build')
+@click.option('--dir', 'root', default=None, help='스냅샷 디렉터리 (기본 TRANSACTION_SNAPSHOT_DIR)')
+@with_appcontext
+def build_snapshot(root):
+    """현재 데이터 버전의 스냅샷 생성 (적재 후 실행해 두면 워커는 만들지 않고 로드만 함)"""
+    root = root or current_app.config['TRANSACTION_SNAPSHOT_DIR']
+    if not root:
+        raise click.ClickException('TRANSACTION_SNAPSHOT_DIR 가 지정되지 않았습니다. (--dir 로 지정 가능)')
+
+    started = time.perf_counter()
+    path = write_snapshot(root, current_version(), current_app.config['TRANSACTION_SNAPSHOT_BATCH_SIZE'])
+    prune_snapshots(root, keep=path)
+    snapshot = TransactionSnapshot(path)
+    size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    click.echo(
+        f'스냅샷 생성: {path} | 버전 {snapshot.version} | {len(snapshot):,}행 | {size / 1024 / 1024:.1f}MB '
+        f'| 지역구 {len(snapshot.districts)} / 법정동 {len(snapshot.dong_names)} / 건물용도 {len(snapshot.building_uses)} '
+        f'| {time.perf_counter() - started:.1f}s'
+    )
+
+
+@snapshot.command('compare')
+@click.option('--repeat', default=5, show_default=True, help='케이스별 반복 횟수 (중앙값 사용)')
+@with_appcontext
+def compare_snapshot(repeat):
+    """스냅샷 집계와 원본 테이블 SQL 집계 비교 (지역구 / 건물유형 / 법정동 / 랭킹 / 월별, 결과가 다르면 exit 1)"""
+    from myapp.main.routes import (
+        build_yearly_avg_price_by_district_summary_stmt, build_yearly_avg_price_by_building_summary_stmt,
+        build_monthly_price_stmt,
+    )
+    from myapp.predict.routes import build_yearly_avg_price_by_dong_stmt, build_dong_change_stmt
+
+    snapshot = transaction_snapshot.build() if transaction_snapshot.enabled else None
+    if snapshot is None:
+        raise click.ClickException('스냅샷을 사용할 수 없습니다. TRANSACTION_SNAPSHOT_DIR 를 지정하세요.')
+
+    def sql(stmt, names, dtypes):
+        return to_columns(db.session.execute(stmt).fetchall(), names, dtypes)
+
+    district_name, legal_dong_name, building_use, amount = fetch_sample_filters()
+    amount = int(amount or 100000)
+    yearly_dtypes = (object, object, np.int64, float, np.int64)
+    change_names = ['district_name', 'legal_dong_name', 'first_price', 'last_price', 'transaction_count']
+    monthly_names = ['contract_month', 'price_per_sqm_sum', 'price_per_sqm_count', 'transaction_count']
+
+    # (이름, SQL 결과, 스냅샷 결과, 정렬 키) - 지역구/건물유형은 같은 기준(평단가 계산 가능 거래)인 집계 테이블과 비교
+    cases = [
+        ('district', lambda: sql(build_yearly_avg_price_by_district_summary_stmt(),
+                                 ['district_name', 'reception_year', 'avg_price_per_sqm', 'transaction_count'],
+                                 (object, np.int64, float, np.int64)),
+         snapshot.yearly_by_district, ('district_name', 'reception_year')),
+        ('building', lambda: sql(build_yearly_avg_price_by_building_summary_stmt(),
+                                 ['building_use', 'reception_year', 'avg_price_per_sqm'], (object, np.int64, float)),
+         snapshot.yearly_by_building, ('building_use', 'reception_year')),
+    ]
+    for filters in ({}, {'district_name': district_name}, {'district_name': district_name, 'legal_dong_name': legal_dong_name},
+                    {'building_use': building_use}, {'amount': amount}, {'district_name': district_name, 'amount': amount}):
+        cases.append((
+            f'dong {filters}',
+            lambda filters=filters: sql(build_yearly_avg_price_by_dong_stmt(**filters), DONG_COLUMNS, yearly_dtypes),
+            lambda filters=filters: snapshot.yearly_by_dong(**filters),
+            ('district_name', 'legal_dong_name', 'reception_year'),
+        ))
+        if 'legal_dong_name' not in filters:
+            cases.append((
+                f'ranking {filters}',
+                lambda filters=filters: sql(build_dong_change_stmt(build_yearly_avg_price_by_dong_stmt(**filters)),
+                                            change_names, (object, object, float, float, np.int64)),
+                lambda filters=filters: snapshot.dong_change(**filters),
+                ('district_name', 'legal_dong_name'),
+            ))
+        if 'amount' not in filters:
+            cases.append((
+                f'monthly {filters}',
+                lambda filters=filters: sql(build_monthly_price_stmt(**filters), monthly_names, (np.int64, float, np.int64, np.int64)),
+                lambda filters=filters: snapshot.monthly_price(**filters),
+                ('contract_month',),
+            ))
+
+    def median_ms(fn):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = fn()
+            timings.append((time.perf_counter() - started) * 1000)
+        return result, float(np.median(timings))
+
+    mismatches = 0
+    click.echo(f'스냅샷 버전 {snapshot.version}, {len(snapshot):,}행')
+    for name, expected_fn, actual_fn, keys in cases:
+        expected, sql_ms = median_ms(expected_fn)
+        actual, snapshot_ms = median_ms(actual_fn)
+        same = same_table(expected, actual, list(keys))
+        mismatches += not same
+        click.echo(
+            f"{'OK ' if same else '불일치'} {name:<70} 행 {len(expected[keys[0]]):>6} "
+            f"| SQL {sql_ms:8.2f}ms | 스냅샷 {snapshot_ms:8.2f}ms"
+        )
+
+    click.echo(f'비교 {len(cases)}건, 불일치 {mismatches}건')
+    if mismatches:
+        sys.exit(1)
+
+
+@click.command('export')
+@click.argument('dataset', type=click.Choice(list(EXPORT_DATASETS)))
+@click.option('-o', '--output', required=True, type=click.Path(dir_okay=False), help='출력 파일 경로')
+@click.option('--format', 'fmt', type=click.Choice(EXPORT_FORMATS), default='parquet', show_default=True)
+@click.option('--district', default=None, help='자치구 필터')
+@click.option('--year', type=int, default=None, help='접수연도 필터 (실거래가만)')
+@click.option('--batch-size', default=50000, show_default=True, help='DB 조회 / row group 배치 크기')
+@with_appcontext
+def export(dataset, output, fmt, district, year, batch_size):
+    """테이블을 Parquet / Arrow IPC 파일로 내보내기 (노트북에서 memory-map 으로 읽기)"""
+    try:
+        row_count = write_dataset(dataset, output, fmt=fmt, district_name=district, year=year, batch_size=batch_size)
+    except (ValueError, RuntimeError) as e:
+        raise click.ClickException(str(e))
+    click.echo(f'{dataset} -> {output}: {row_count}건')
+
+
+@click.command('ingest')
+@click.argument('dataset', type=click.Choice(list(INGEST_DATASETS)))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunksize', default=50000, show_default=True, help='청크(트랜잭션) 단위 행 수')
+@click.option('--encoding', default='utf-8-sig', show_default=True, help='CSV 인코딩 (열린데이터광장 원본은 cp949)')
+@with_appcontext
+def ingest(dataset, path, chunksize, encoding):
+    """실거래가 / 주차장 CSV 적재 (natural key 기준 upsert, 재실행 시 바뀐 행만 반영)"""
+    def report(stats):
+        click.echo(
+            f"{stats['rows']:>10,}행 | 신규 {stats['inserted']:,} | 변경 {stats['updated']:,} "
+            f"| 동일 {stats['unchanged']:,} | {stats['rows_per_sec']:,.0f} rows/sec"
+        )
+
+    try:
+        stats = ingest_csv(dataset, path, chunksize=chunksize, encoding=encoding, progress=report)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    # 후속 갱신: 집계 테이블 + 데이터 버전 (기존 행이 바뀌었으면 집계 테이블 전체 재집계)
+    if dataset == 'transactions':
+        if stats['inserted'] or stats['updated']:
+            refresh_transaction_summary(full=bool(stats['updated']))
+            bump_data_version('real_estate_transaction')
+    elif stats['inserted'] or stats['updated']:
+        refresh_parking_accessibility()
+        bump_data_version('public_parking')
+
+    click.echo(f"적재 완료: {stats['rows']:,}행, {stats['elapsed']:.1f}s, {stats['rows_per_sec']:,.0f} rows/sec")
+
+
+@click.group('bench')
+def bench():
+    """성능 측정"""
+
+
+@bench.command('analytics')
+@click.option('--districts', default=25, show_default=True, help='합성 데이터 지역구 수')
+@click.option('--dongs', default=20, show_default=True, help='지역구당 법정동 수')
+@click.option('--repeat', default=20, show_default=True, help='케이스별 반복 횟수 (중앙값 사용)')
+def bench_analytics(districts, dongs, repeat):
+    """분석 라우트 계산 단계 CPU 시간 비교 (기존 pandas vs analytics), 결과가 다르면 exit 1"""
+    results = run_analytics_bench(n_districts=districts, n_dongs=dongs, repeat=repeat)
+
+    click.echo(f"{'case':<18}{'rows':>8}{'pandas ms':>12}{'numpy ms':>12}{'speedup':>10}  same")
+    for r in results:
+        click.echo(
+            f"{r['case']:<18}{r['rows']:>8,}{r['legacy_ms']:>12.2f}{r['numpy_ms']:>12.2f}"
+            f"{r['speedup']:>9.1f}x  {'OK' if r['same'] else 'DIFF'}"
+        )
+
+    if not all(r['same'] for r in results):
+        sys.exit(1)
+
+
+@bench.command('nearest')
+@click.option('--queries', default=1000, show_default=True, help='조회 지점 수 (데이터 좌표 범위 안 임의 지점)')
+@click.option('--radius', default=1000, show_default=True, help='반경(m)')
+@click.option('-k', default=10, show_default=True, help='최대 주차장 수')
+@with_appcontext
+def bench_nearest(queries, radius, k):
+    """주차장 근접 검색: 격자 인덱스 vs 전체 거리 계산 (결과가 다르면 exit 1)"""
+    from myapp.parking.spatial import parking_index
+
+    r = run_nearest_bench(parking_index.build(), queries=queries, radius_m=radius, k=k)
+    click.echo(
+        f"주차장 {r['indexed']:,}곳, 조회 {r['queries']:,}회 | 인덱스 {r['index_us']:.1f}us "
+        f"| 전체 스캔 {r['scan_us']:.1f}us | {r['speedup']:.1f}x | 불일치 {r['mismatches']}건"
+    )
+    if r['mismatches']:
+        sys.exit(1)
+
+
+@bench.command('seed')
+@click.option('--transactions', default=100000, show_default=True, help='실거래가 행 수 (100k ~ 10M)')
+@click.option('--parkings', default=5000, show_default=True, help='공영주차장 행 수')
+@click.option('--seed', 'seed_value', default=0, show_default=True, help='난수 시드 (같은 시드 = 같은 데이터)')
+@click.option('--chunksize', default=100000, show_default=True, help='INSERT 배치 행 수')
+@click.option('--append', is_flag=True, help='기존 데이터가 있어도 추가 적재')
+@with_appcontext
+def bench_seed(transactions, parkings, seed_value, chunksize, append):
+    """벤치마크용 합성 데이터 적재 (집계 테이블 재집계 포함)"""
+    counts = table_counts()
+    if not append and (counts['transactions'] or counts['parkings']):
+        raise click.ClickException(
+            f"이미 데이터가 있습니다 (실거래가 {counts['transactions']:,}행, 주차장 {counts['parkings']:,}행). "
+            "빈 DB를 사용하거나 --append 를 지정하세요."
+        )
+
+    def report(stats):
+        click.echo(f"실거래가 {stats['transactions']:>12,}행 | 주차장 {stats['parkings']:>10,}행 | {stats['elapsed']:.1f}s")
+
+    stats = seed_database(transactions, parkings, seed=seed_value, chunksize=chunksize, progress=report)
+    click.echo(f"적재 완료: {stats['elapsed']:.1f}s")
+
+
+def echo_results(results):
+    click.echo(f"{'endpoint':<30}{'count':>7}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rps':>10}")
+    for name, r in results.items():
+        click.echo(
+            f"{name:<30}{r['count']:>7}{r['errors']:>5}{r.get('p50_ms', 0):>10.2f}"
+            f"{r.get('p95_ms', 0):>10.2f}{r.get('p99_ms', 0):>10.2f}{r['rps']:>10.1f}"
+        )
+
+
+def select_endpoints(names):
+    endpoints = build_endpoints(*fetch_sample_filters())
+    if not names:
+        return endpoints
+
+    unknown = set(names) - {endpoint['name'] for endpoint in endpoints}
+    if unknown:
+        raise click.ClickException(f"알 수 없는 엔드포인트: {', '.join(sorted(unknown))}")
+    return [endpoint for endpoint in endpoints if endpoint['name'] in names]
+
+
+@bench.command('client')
+@click.option('-o', '--output', type=click.Path(dir_okay=False), default=None, help='결과 JSON baseline 경로')
+@click.option('--iterations', default=20, show_default=True, help='엔드포인트별 요청 수')
+@click.option('--warmup', default=1, show_default=True, help='측정 전 워밍업 요청 수')
+@click.option('--cold', is_flag=True, help='매 요청 전 응답 캐시 비우기')
+@click.option('-e', '--endpoint', 'names', multiple=True, help='측정할 엔드포인트 이름 (반복 지정 가능, 기본 전체)')
+@with_appcontext
+def bench_client(output, iterations, warmup, cold, names):
+    """Flask test client로 엔드포인트별 지연시간 측정"""
+    endpoints = select_endpoints(names)
+    results = run_client_bench(current_app._get_current_object(), endpoints, iterations, warmup, cold)
+    echo_results(results)
+
+    if output:
+        save_baseline(
+            make_baseline('client', results, iterations=iterations, cold=cold, database=table_counts()),
+            output,
+        )
+        click.echo(f'baseline 저장: {output}')
+
+
+@bench.command('http')
+@click.option('--url', default='http://127.0.0.1:5050', show_default=True, help='실행 중인 서버 주소')
+@click.option('-o', '--output', type=click.Path(dir_okay=False), default=None, help='결과 JSON baseline 경로')
+@click.option('--concurrency', default=8, show_default=True, help='동시 요청 스레드 수')
+@click.option('--iterations', default=50, show_default=True, help='엔드포인트별 요청 수')
+@click.option('-e', '--endpoint', 'names', multiple=True, help='측정할 엔드포인트 이름 (반복 지정 가능, 기본 전체)')
+@with_appcontext
+def bench_http(url, output, concurrency, iterations, names):
+    """실행 중인 서버에 동시 HTTP 부하 (필터 샘플 값은 현재 설정의 DB 기준)"""
+    endpoints = select_endpoints(names)
+    results = run_http_load(url, endpoints, concurrency=concurrency, iterations=iterations)
+    echo_results(results)
+
+    if output:
+        save_baseline(
+            make_baseline('http', results, url=url, concurrency=concurrency, iterations=iterations),
+            output,
+        )
+        click.echo(f'baseline 저장: {output}')
+
+
+@bench.command('compare')
+@click.argument('base', type=click.Path(exists=True, dir_okay=False))
+@click.argument('new', type=click.Path(exists=True, dir_okay=False))
+@click.option('--metric', type=click.Choice(['p50_ms', 'p95_ms', 'p99_ms', 'mean_ms', 'rps']),
+              default='p95_ms', show_default=True)
+@click.option('--threshold', default=0.2, show_default=True, help='허용 악화 비율 (0.2 = 20%)')
+def bench_compare(base, new, metric, threshold):
+    """두 baseline 비교, 허용 비율 이상 악화된 엔드포인트가 있으면 exit 1"""
+    base_baseline, new_baseline = load_baseline(base), load_baseline(new)
+    click.echo(f"base: {base_baseline['meta'].get('commit')}  new: {new_baseline['meta'].get('commit')}  ({metric})")
+
+    rows = compare_baselines(base_baseline, new_baseline, metric=metric, threshold=threshold)
+    for r in rows:
+        click.echo(
+            f"{r['name']:<30}{r['base']:>10.2f}{r['new']:>10.2f}{r['change']:>+9.1%}"
+            f"  {'REGRESSION' if r['regressed'] else 'OK'}"
+        )
+
+    if any(r['regressed'] for r in rows):
+        sys.exit(1)
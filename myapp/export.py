@@ -0,0 +1,182 @@
+import sqlalchemy as sa
+from myapp.api.streaming import iter_keyset_rows
+from myapp.models import RealEstateTransaction, PublicParking
+
+# pyarrow는 내보내기에서만 사용 (미설치 환경에서도 앱은 동작)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+EXPORT_FORMATS = ('parquet', 'arrow')
+
+# 데이터셋 이름 -> (모델, keyset 기준 pk) | 이름은 /api 엔드포인트와 동일
+EXPORT_DATASETS = {
+    'real_estate_transactions': (RealEstateTransaction, RealEstateTransaction.ret_id),
+    'public_parkings': (PublicParking, PublicParking.pp_id),
+}
+
+
+def require_pyarrow():
+    if pa is None:
+        raise RuntimeError('pyarrow가 설치되어 있지 않습니다. (pip install pyarrow)')
+
+
+def arrow_type(column):
+    """
+    SQLAlchemy 컬럼 타입 -> Arrow 타입
+    """
+    if isinstance(column.type, sa.Integer):  # BigInteger 포함
+        return pa.int64()
+    if isinstance(column.type, sa.Float):
+        return pa.float64()
+    if isinstance(column.type, sa.DateTime):
+        return pa.timestamp('us')
+    if isinstance(column.type, sa.Date):
+        return pa.date32()
+    return pa.string()
+
+
+def export_columns(model):
+    """
+    내보낼 컬럼: 참조 테이블 코드 컬럼(외래키)은 제외 (같은 값의 이름 컬럼이 이미 있음)
+    """
+    return [column for column in model.__table__.columns if not column.foreign_keys]
+
+
+def build_schema(model):
+    columns = export_columns(model)
+    return pa.schema([pa.field(column.name, arrow_type(column)) for column in columns])
+
+
+def build_partition_conditions(model, district_name=None, year=None):
+    """
+    자치구 / 접수연도 필터 (연도 컬럼이 없는 테이블은 year 지정 시 ValueError)
+    """
+    conditions = []
+
+    if district_name:
+        conditions.append(model.district_name == district_name)
+
+    if year is not None:
+        if 'reception_year' not in model.__table__.columns:
+            raise ValueError(f'{model.__tablename__} 테이블은 연도 필터를 지원하지 않습니다.')
+        conditions.append(model.reception_year == year)
+
+    return conditions
+
+
+def iter_record_batches(dataset, district_name=None, year=None, batch_size=50000):
+    """
+    DB에서 keyset 배치 단위로 읽어 Arrow RecordBatch 생성 (배치 크기만큼만 메모리 사용)
+    """
+    require_pyarrow()
+    model, pk_column = EXPORT_DATASETS[dataset]
+    schema = build_schema(model)
+    columns = export_columns(model)
+    conditions = build_partition_conditions(model, district_name, year)
+
+    batch = []
+    for row in iter_keyset_rows(pk_column, columns, batch_size=batch_size, conditions=conditions):
+        batch.append(row[1:])
+        if len(batch) == batch_size:
+            yield to_record_batch(batch, schema)
+            batch = []
+
+    if batch:
+        yield to_record_batch(batch, schema)
+
+
+def to_record_batch(rows, schema):
+    # 행 튜플 -> 컬럼 리스트로 전치 후 타입 지정 배열 생성
+    values = list(zip(*rows))
+    arrays = [pa.array(column_values, type=field.type) for column_values, field in zip(values, schema)]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def validate_export(dataset, fmt='parquet', district_name=None, year=None):
+    """
+    내보내기 인자 검증 (응답/파일을 열기 전에 호출), 올바르지 않으면 ValueError / RuntimeError
+    """
+    require_pyarrow()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f'지원하지 않는 포맷: {fmt}')
+    model, _ = EXPORT_DATASETS[dataset]
+    build_partition_conditions(model, district_name, year)
+
+
+def open_writer(sink, schema, fmt):
+    if fmt == 'parquet':
+        return pq.ParquetWriter(sink, schema, compression='zstd')
+    return pa.ipc.new_file(sink, schema)
+
+
+def write_dataset(dataset, sink, fmt='parquet', district_name=None, year=None, batch_size=50000):
+    """
+    데이터셋을 Parquet(배치마다 row group) 또는 Arrow IPC 파일로 기록
+    sink: 파일 경로 또는 쓰기 가능한 파일 객체
+    반환값: 기록한 행 수
+    """
+    validate_export(dataset, fmt, district_name, year)
+    schema = build_schema(EXPORT_DATASETS[dataset][0])
+
+    row_count = 0
+    with open_writer(sink, schema, fmt) as writer:
+        for batch in iter_record_batches(dataset, district_name, year, batch_size):
+            writer.write_batch(batch)
+            row_count += batch.num_rows
+
+    return row_count
+
+
+class ChunkSink:
+    """
+    순차 쓰기 전용 파일 객체: writer 가 기록한 bytes 를 모아 두었다가 drain() 으로 꺼냄
+    Parquet / Arrow IPC 파일은 앞에서부터 순서대로 쓰고 footer 를 마지막에 붙이므로 seek 없이 스트리밍 가능
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def writable(self):
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_dataset_bytes(dataset, fmt='parquet', district_name=None, year=None, batch_size=50000):
+    """
+    데이터셋 파일을 배치(row group) 단위로 기록하면서 bytes 청크로 반환 (응답 스트리밍용)
+    인자 검증은 validate_export 로 먼저 (응답 시작 후에는 오류 응답을 보낼 수 없음)
+    """
+    sink = ChunkSink()
+    with open_writer(sink, build_schema(EXPORT_DATASETS[dataset][0]), fmt) as writer:
+        for batch in iter_record_batches(dataset, district_name, year, batch_size):
+            writer.write_batch(batch)
+            data = sink.drain()
+            if data:
+                yield data
+    # footer
+    yield sink.drain()
@@ -0,0 +1,257 @@
+import time
+import pandas as pd
+import sqlalchemy as sa
+from sqlalchemy import select, insert, update, and_
+from myapp.models import RealEstateTransaction, PublicParking, split_address, contract_month_of
+from myapp.lookup import assign_lookup_codes
+from myapp import db
+
+# 서울 열린데이터광장 CSV 헤더 -> 컬럼 (영문 컬럼명 헤더도 그대로 허용)
+TRANSACTION_CSV_COLUMNS = {
+    '접수연도': 'reception_year',
+    '자치구코드': 'district_code',
+    '자치구명': 'district_name',
+    '법정동코드': 'legal_dong_code',
+    '법정동명': 'legal_dong_name',
+    '지번구분': 'jibun_type',
+    '지번구분명': 'jibun_type_name',
+    '본번': 'main_number',
+    '부번': 'sub_number',
+    '건물명': 'building_name',
+    '계약일': 'contract_date',
+    '물건금액(만원)': 'amount',
+    '건물면적(㎡)': 'building_area',
+    '토지면적(㎡)': 'land_area',
+    '층': 'floor',
+    '권리구분': 'right_type',
+    '취소일': 'cancel_date',
+    '건축년도': 'construction_year',
+    '건물용도': 'building_use',
+    '신고구분': 'declaration_type',
+    '신고한 개업공인중개사 시군구명': 'broker_district_name',
+}
+
+PARKING_CSV_COLUMNS = {
+    '주차장코드': 'parking_code',
+    '주차장명': 'parking_name',
+    '주소': 'address',
+    '주차장 종류': 'parking_type',
+    '주차장 종류명': 'parking_type_name',
+    '운영구분': 'operation_type',
+    '운영구분명': 'operation_type_name',
+    '전화번호': 'phone_number',
+    '주차현황 정보 제공여부': 'parking_status_available',
+    '주차현황 정보 제공여부명': 'parking_status_available_name',
+    '총 주차면': 'total_spaces',
+    '현재 주차 차량수': 'current_parking',
+    '현재 주차 차량수 업데이트시간': 'current_parking_update_time',
+    '유무료구분': 'pay_type',
+    '유무료구분명': 'pay_type_name',
+    '야간무료개방여부': 'night_free_open',
+    '야간무료개방여부명': 'night_free_open_name',
+    '평일 운영 시작시각(HHMM)': 'weekday_start_time',
+    '평일 운영 종료시각(HHMM)': 'weekday_end_time',
+    '주말 운영 시작시각(HHMM)': 'weekend_start_time',
+    '주말 운영 종료시각(HHMM)': 'weekend_end_time',
+    '공휴일 운영 시작시각(HHMM)': 'holiday_start_time',
+    '공휴일 운영 종료시각(HHMM)': 'holiday_end_time',
+    '토요일 유,무료 구분': 'saturday_pay_type',
+    '토요일 유,무료 구분명': 'saturday_pay_type_name',
+    '공휴일 유,무료 구분': 'holiday_pay_type',
+    '공휴일 유,무료 구분명': 'holiday_pay_type_name',
+    '월 정기권 금액': 'monthly_rate',
+    '노상 주차장 관리그룹번호': 'street_parking_group_no',
+    '기본 주차 요금': 'basic_rate',
+    '기본 주차 시간(분 단위)': 'basic_time_min',
+    '추가 단위 요금': 'add_rate',
+    '추가 단위 시간(분 단위)': 'add_time_min',
+    '버스 기본 주차 요금': 'bus_basic_rate',
+    '버스 기본 주차 시간(분 단위)': 'bus_basic_time_min',
+    '버스 추가 단위 요금': 'bus_add_rate',
+    '버스 추가 단위 시간(분 단위)': 'bus_add_time_min',
+    '일 최대 요금': 'day_max_rate',
+    '주차장 위치 좌표 위도': 'lat',
+    '주차장 위치 좌표 경도': 'lng',
+    '공유 주차장 관리업체명': 'share_parking_company_name',
+    '공유 주차장 여부': 'share_parking',
+    '공유 주차장 관리업체 링크': 'share_parking_company_link',
+    '공유 주차장 기타사항': 'share_parking_etc',
+}
+
+# natural_key: 같은 거래/주차장을 식별하는 컬럼
+#   원본에 같은 키의 행이 여러 개일 수 있어서 (노상 주차장은 주소별 행 수 = 주차면수)
+#   키 + 같은 키 안에서의 순번(pk 순서)으로 기존 행과 매칭
+# partition_key: 기존 행을 이 단위로만 메모리에 올려서 비교
+INGEST_DATASETS = {
+    'transactions': {
+        'model': RealEstateTransaction,
+        'csv_columns': TRANSACTION_CSV_COLUMNS,
+        'natural_key': (
+            'reception_year', 'district_code', 'legal_dong_code', 'jibun_type', 'main_number',
+            'sub_number', 'building_name', 'contract_date', 'floor', 'building_area',
+        ),
+        'partition_key': ('reception_year', 'district_code'),
+    },
+    'parking': {
+        'model': PublicParking,
+        'csv_columns': PARKING_CSV_COLUMNS,
+        'natural_key': ('parking_code', 'address'),
+        'partition_key': (),
+    },
+}
+
+
+def read_csv_chunks(path, spec, chunksize=50000, encoding='utf-8-sig'):
+    """
+    CSV를 chunksize 행씩 읽어 컬럼 매핑 + 타입 변환 후 레코드(dict) 리스트로 반환
+    """
+    table = spec['model'].__table__
+    pk_name = table.primary_key.columns.keys()[0]
+
+    for df in pd.read_csv(path, chunksize=chunksize, dtype=str, encoding=encoding):
+        df = df.rename(columns=lambda c: spec['csv_columns'].get(c.strip(), c.strip()))
+        df = df[[c for c in df.columns if c in table.columns and c != pk_name]]
+
+        missing = [key for key in spec['natural_key'] if key not in df.columns]
+        if missing:
+            raise ValueError(f"CSV에 키 컬럼이 없습니다: {', '.join(missing)}")
+
+        for name in df.columns:
+            column_type = table.columns[name].type
+            if isinstance(column_type, sa.Integer):
+                df[name] = pd.to_numeric(df[name], errors='coerce').astype('Int64')
+            elif isinstance(column_type, sa.Float):
+                df[name] = pd.to_numeric(df[name], errors='coerce')
+            else:
+                df[name] = df[name].str.strip().replace('', None)
+
+        yield df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+
+class PartitionIndex:
+    """
+    파티션 단위 기존 행 인덱스: natural key -> [(pk, 컬럼값 dict), ...] (pk 순서)
+    현재 청크에 없는 파티션의 행은 메모리에서 제거
+    같은 키의 순번(ordinal)은 적재가 끝날 때까지 유지: 파티션이 나중 청크에 다시 나오면 이번 적재에서 넣은 행까지
+    DB에서 다시 읽히는데 (pk 순서상 기존 행 뒤), 순번이 이어지므로 이미 매칭/추가한 행과 다시 매칭되지 않음
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.model = spec['model']
+        self.pk_column = list(self.model.__table__.primary_key.columns)[0]
+        self.columns = [c for c in self.model.__table__.columns if c is not self.pk_column]
+        self.partitions = {}
+        self.ordinals = {}
+
+    def load(self, partitions):
+        for partition in list(self.partitions):
+            if partition not in partitions:
+                del self.partitions[partition]
+
+        for partition in partitions:
+            if partition in self.partitions:
+                continue
+
+            conditions = [
+                column == value
+                for column, value in zip(
+                    [self.model.__table__.columns[name] for name in self.spec['partition_key']],
+                    partition,
+                )
+            ]
+            stmt = select(self.pk_column, *self.columns).order_by(self.pk_column)
+            if conditions:
+                stmt = stmt.where(and_(*conditions))
+
+            rows = {}
+            for row in db.session.execute(stmt).mappings():
+                values = {column.name: row[column.name] for column in self.columns}
+                key = tuple(values[name] for name in self.spec['natural_key'])
+                rows.setdefault(key, []).append((row[self.pk_column.name], values))
+
+            self.partitions[partition] = rows
+
+    def match(self, partition, key):
+        """
+        같은 키의 n번째 원본 행 -> 기존 n번째 행 (없으면 None = 신규)
+        """
+        ordinal = self.ordinals.setdefault(partition, {})
+        n = ordinal.get(key, 0)
+        ordinal[key] = n + 1
+        rows = self.partitions[partition].get(key, [])
+        return rows[n] if n < len(rows) else None
+
+
+def upsert_chunk(records, spec, index):
+    """
+    청크 단위 upsert: 신규 행 bulk INSERT, 값이 바뀐 행만 pk 기준 bulk UPDATE (한 트랜잭션)
+    반환값: (inserted, updated, unchanged)
+    """
+    model = spec['model']
+    pk_name = index.pk_column.name
+
+    def partition_of(rec):
+        return tuple(rec[name] for name in spec['partition_key'])
+
+    index.load({partition_of(rec) for rec in records})
+
+    # 실거래가는 구/동/용도 등 문자열 컬럼의 정수 코드도 채움 (처음 보는 이름은 참조 테이블에 추가)
+    if model is RealEstateTransaction:
+        assign_lookup_codes(records)
+
+    inserts, updates, unchanged = [], [], 0
+    for rec in records:
+        # 주차장은 적재 시점에 주소 파싱 컬럼도 채움 (Core INSERT는 @validates를 거치지 않음)
+        if model is PublicParking and 'address' in rec:
+            rec['district_name'], rec['legal_dong_name'] = split_address(rec['address'])
+        # 실거래가는 계약일에서 계약 연월 파생
+        if model is RealEstateTransaction and 'contract_date' in rec:
+            rec['contract_month'] = contract_month_of(rec['contract_date'])
+
+        key = tuple(rec[name] for name in spec['natural_key'])
+        existing = index.match(partition_of(rec), key)
+
+        if existing is None:
+            inserts.append(rec)
+            continue
+
+        pk, values = existing
+        if any(values.get(name) != value for name, value in rec.items()):
+            updates.append({pk_name: pk, **rec})
+        else:
+            unchanged += 1
+
+    if inserts:
+        db.session.execute(insert(model), inserts)
+    if updates:
+        db.session.execute(update(model), updates)
+    db.session.commit()
+
+    return len(inserts), len(updates), unchanged
+
+
+def ingest_csv(dataset, path, chunksize=50000, encoding='utf-8-sig', progress=None):
+    """
+    CSV 적재 (재실행해도 바뀐 행만 반영)
+    progress: 청크마다 호출되는 콜백 (누적 통계 dict)
+    """
+    spec = INGEST_DATASETS[dataset]
+    index = PartitionIndex(spec)
+    stats = {'rows': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0, 'elapsed': 0.0, 'rows_per_sec': 0.0}
+
+    started = time.perf_counter()
+    for records in read_csv_chunks(path, spec, chunksize=chunksize, encoding=encoding):
+        inserted, updated, unchanged = upsert_chunk(records, spec, index)
+
+        stats['rows'] += len(records)
+        stats['inserted'] += inserted
+        stats['updated'] += updated
+        stats['unchanged'] += unchanged
+        stats['elapsed'] = time.perf_counter() - started
+        stats['rows_per_sec'] = stats['rows'] / stats['elapsed'] if stats['elapsed'] else 0.0
+
+        if progress is not None:
+            progress(stats)
+
+    return stats
@@ -0,0 +1,348 @@
+import json
+import time
+import threading
+import subprocess
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPSConnection, HTTPException
+from urllib.parse import urlsplit
+import numpy as np
+from sqlalchemy import select, insert, func
+from myapp.models import RealEstateTransaction, PublicParking
+from myapp.summary import refresh_transaction_summary
+from myapp.lookup import assign_lookup_codes
+from myapp.cache import cache, bump_data_version
+from myapp import db
+
+# 벤치마크 / 부하 테스트
+# - 합성 데이터 생성 (flask bench seed)
+# - 엔드포인트별 지연시간 p50/p95/p99 + 처리량 측정 (Flask test client / 동시 HTTP 요청)
+# - 결과를 JSON baseline으로 저장해서 커밋 간 비교 (flask bench compare)
+
+SEOUL_DISTRICTS = (
+    '종로구', '중구', '용산구', '성동구', '광진구', '동대문구', '중랑구', '성북구', '강북구',
+    '도봉구', '노원구', '은평구', '서대문구', '마포구', '양천구', '강서구', '구로구', '금천구',
+    '영등포구', '동작구', '관악구', '서초구', '강남구', '송파구', '강동구',
+)
+DONGS_PER_DISTRICT = 8
+BUILDING_USES = ('아파트', '연립다세대', '단독다가구', '오피스텔')
+BUILDING_USE_WEIGHTS = (0.55, 0.25, 0.12, 0.08)
+
+PERCENTILES = (50, 95, 99)
+
+
+def dong_names(district_name):
+    # 합성 법정동명 ex) 도봉구 -> 도봉1동 ... 도봉8동
+    stem = district_name[:-1]
+    return [f'{stem}{i}동' for i in range(1, DONGS_PER_DISTRICT + 1)]
+
+
+def generate_transactions(n, rng, years=(2015, 2025), chunksize=100000):
+    """
+    합성 실거래가 레코드를 chunksize 단위로 생성 (지역구별 기준 평단가 + 연도별 상승 추세)
+    건물면적 결측(None)/0 행도 일부 포함해서 원본과 같은 필터 경로를 타도록 함
+    """
+    n_districts = len(SEOUL_DISTRICTS)
+    base_price = rng.uniform(8e6, 3e7, n_districts)  # 지역구별 기준 평단가(원/㎡)
+    growth = rng.uniform(0.98, 1.08, n_districts)  # 지역구별 연 상승률
+
+    for offset in range(0, n, chunksize):
+        m = min(chunksize, n - offset)
+        district = rng.integers(0, n_districts, m)
+        dong = rng.integers(0, DONGS_PER_DISTRICT, m)
+        year = rng.integers(years[0], years[1] + 1, m)
+        month = rng.integers(1, 13, m)
+        day = rng.integers(1, 29, m)
+        use = rng.choice(len(BUILDING_USES), m, p=BUILDING_USE_WEIGHTS)
+
+        area = np.round(rng.uniform(15, 200, m), 2)
+        price = base_price[district] * growth[district] ** (year - years[0]) * rng.lognormal(0, 0.2, m)
+        amount = np.maximum(np.round(price * area / 10000), 1).astype(np.int64)  # 만원
+
+        area_kind = rng.random(m)
+        area = area.astype(object)
+        area[area_kind < 0.02] = None
+        area[(area_kind >= 0.02) & (area_kind < 0.03)] = 0.0
+
+        # DB 드라이버에는 파이썬 기본 타입으로 전달
+        district_names = np.array(SEOUL_DISTRICTS, dtype=object)[district].tolist()
+        dong_no = (dong + 1).tolist()
+        columns = zip(
+            year.tolist(), district.tolist(), district_names, dong_no,
+            (year * 10000 + month * 100 + day).astype(str).tolist(), (year * 100 + month).tolist(),
+            amount.tolist(), area.tolist(), rng.integers(1, 30, m).tolist(),
+            rng.integers(1975, years[1] + 1, m).tolist(), use.tolist(),
+            rng.integers(1, 999, m).tolist(), rng.integers(1, 500, m).tolist(),
+        )
+
+        yield [
+            {
+                'reception_year': y,
+                'district_code': f'11{d:03d}',
+                'district_name': name,
+                'legal_dong_code': f'{no:05d}',
+                'legal_dong_name': f'{name[:-1]}{no}동',
+                'jibun_type': '1',
+                'jibun_type_name': '대지',
+                'main_number': str(main_number),
+                'sub_number': '0',
+                'building_name': f'건물{building_no}',
+                'contract_date': contract_date,
+                'contract_month': contract_month,
+                'amount': amt,
+                'building_area': building_area,
+                'land_area': None,
+                'floor': floor,
+                'right_type': None,
+                'cancel_date': None,
+                'construction_year': construction_year,
+                'building_use': BUILDING_USES[u],
+                'declaration_type': '중개거래',
+                'broker_district_name': name,
+            }
+            for (y, d, name, no, contract_date, contract_month, amt, building_area, floor,
+                 construction_year, u, main_number, building_no) in columns
+        ]
+
+
+def generate_parkings(n, rng, chunksize=100000):
+    """
+    합성 공영주차장 레코드 생성
+    노상 주차장은 원본처럼 같은 주소에 주차면 수만큼 행이 있음 (주소 1개당 평균 10행)
+    """
+    records = []
+    pp_no = 0
+    while pp_no < n:
+        district = SEOUL_DISTRICTS[rng.integers(0, len(SEOUL_DISTRICTS))]
+        dong = dong_names(district)[rng.integers(0, DONGS_PER_DISTRICT)]
+        address = f'{district} {dong} {rng.integers(1, 999)}-{rng.integers(0, 20)}'
+        on_street = rng.random() < 0.6
+        spaces = int(rng.integers(1, 20)) if on_street else int(rng.integers(20, 500))
+        rows = min(spaces if on_street else 1, n - pp_no)
+
+        common = {
+            'parking_code': f'{1000000 + pp_no}',
+            'parking_name': f'{dong} 공영주차장',
+            'address': address,
+            'district_name': district,
+            'legal_dong_name': dong,
+            'parking_type': 'NS' if on_street else 'NW',
+            'parking_type_name': '노상 주차장' if on_street else '노외 주차장',
+            'total_spaces': 1 if on_street else spaces,
+            'current_parking_update_time': '2025-01-01 00:00:00',
+            'basic_rate': int(rng.choice([100, 200, 300, 500])),
+            'basic_time_min': 5,
+            'lat': float(37.45 + rng.uniform(0, 0.25)),
+            'lng': float(126.8 + rng.uniform(0, 0.4)),
+        }
+        for _ in range(rows):
+            current_parking = int(rng.integers(0, 2)) if on_street else int(rng.integers(0, spaces))
+            records.append({**common, 'current_parking': current_parking})
+            pp_no += 1
+
+        if len(records) >= chunksize:
+            yield records
+            records = []
+
+    if records:
+        yield records
+
+
+def seed_database(transactions=100000, parkings=5000, seed=0, chunksize=100000, progress=None):
+    """
+    합성 데이터 적재 후 집계 테이블 전체 재집계 + 데이터 버전 갱신
+    반환값: {'transactions', 'parkings', 'elapsed'}
+    """
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+
+    stats = {'transactions': 0, 'parkings': 0, 'elapsed': 0.0}
+    for key, model, chunks in (
+        ('transactions', RealEstateTransaction, generate_transactions(transactions, rng, chunksize=chunksize)),
+        ('parkings', PublicParking, generate_parkings(parkings, rng, chunksize=chunksize)),
+    ):
+        for records in chunks:
+            if model is RealEstateTransaction:
+                assign_lookup_codes(records)
+            db.session.execute(insert(model), records)
+            db.session.commit()
+            stats[key] += len(records)
+            stats['elapsed'] = time.perf_counter() - started
+            if progress is not None:
+                progress(stats)
+
+    refresh_transaction_summary(full=True)
+    bump_data_version('real_estate_transaction', 'public_parking')
+    stats['elapsed'] = time.perf_counter() - started
+    return stats
+
+
+def table_counts():
+    return {
+        'transactions': db.session.scalar(select(func.count()).select_from(RealEstateTransaction)),
+        'parkings': db.session.scalar(select(func.count()).select_from(PublicParking)),
+    }
+
+
+def build_endpoints(district_name, legal_dong_name, building_use, amount):
+    """
+    측정 대상 요청 목록 (필터 값은 DB 샘플 기준)
+    """
+    return [
+        {'name': 'district', 'method': 'POST', 'path': '/district', 'json': {}},
+        {'name': 'building', 'method': 'POST', 'path': '/building', 'json': {}},
+        {'name': 'predict_location', 'method': 'POST', 'path': '/predict/location', 'json': {}},
+        {'name': 'predict_location_dong', 'method': 'POST', 'path': '/predict/location',
+         'json': {'district': district_name, 'dong': legal_dong_name, 'building_type': building_use}},
+        {'name': 'predict_ranking', 'method': 'POST', 'path': '/predict/ranking', 'json': {'n': 5}},
+        {'name': 'batch_dashboard', 'method': 'POST', 'path': '/batch', 'json': {'requests': [
+            {'id': 'building', 'path': '/building', 'body': {'format': 'pivot'}},
+            {'id': 'district', 'path': '/district', 'body': {}},
+            {'id': 'ranking', 'path': '/predict/ranking', 'body': {'n': 5}},
+        ]}},
+        {'name': 'query_search', 'method': 'POST', 'path': '/query/search',
+         'json': {'district': district_name, 'dong': legal_dong_name}},
+        {'name': 'query_search_amount', 'method': 'POST', 'path': '/query/search',
+         'json': {'building_type': building_use, 'amount': str(amount)}},
+        {'name': 'trend_quarter', 'method': 'POST', 'path': '/trend', 'json': {'period': 'quarter'}},
+        {'name': 'parking_data', 'method': 'POST', 'path': '/parking/data', 'json': {}},
+        {'name': 'parking_data_district', 'method': 'POST', 'path': '/parking/data',
+         'json': {'district': district_name}},
+        {'name': 'parking_nearest', 'method': 'POST', 'path': '/parking/nearest',
+         'json': {'lat': 37.5665, 'lng': 126.978, 'radius': 2000, 'k': 10}},
+        {'name': 'parking_accessibility', 'method': 'POST', 'path': '/parking/accessibility', 'json': {}},
+        {'name': 'api_real_estate_transactions', 'method': 'GET',
+         'path': '/api/real_estate_transactions?limit=1000', 'json': None},
+        {'name': 'api_public_parkings', 'method': 'GET', 'path': '/api/public_parkings?limit=1000', 'json': None},
+    ]
+
+
+def summarize(latencies, errors=0, wall_time=None):
+    """
+    지연시간(초) 목록 -> ms 단위 통계 + 초당 처리량
+    wall_time: 동시 요청 시 전체 경과 시간 (없으면 지연시간 합계 기준)
+    """
+    ms = np.asarray(latencies, dtype=np.float64) * 1000
+    elapsed = wall_time if wall_time is not None else ms.sum() / 1000
+    result = {'count': int(len(ms)), 'errors': int(errors)}
+    if len(ms):
+        for p, value in zip(PERCENTILES, np.percentile(ms, PERCENTILES)):
+            result[f'p{p}_ms'] = round(float(value), 3)
+        result['mean_ms'] = round(float(ms.mean()), 3)
+        result['max_ms'] = round(float(ms.max()), 3)
+    result['rps'] = round(len(ms) / elapsed, 2) if elapsed else 0.0
+    return result
+
+
+def run_client_bench(app, endpoints, iterations=20, warmup=1, cold=False):
+    """
+    Flask test client로 엔드포인트별 순차 요청 (네트워크/WSGI 서버 제외한 앱 처리 시간)
+    cold=True 이면 매 요청 전 응답 캐시를 비움
+    """
+    client = app.test_client()
+    results = {}
+    for endpoint in endpoints:
+        latencies, errors = [], 0
+        for i in range(warmup + iterations):
+            if cold:
+                cache.clear()
+            started = time.perf_counter()
+            response = client.open(endpoint['path'], method=endpoint['method'], json=endpoint['json'])
+            response.get_data()  # 스트리밍 응답까지 소비
+            elapsed = time.perf_counter() - started
+
+            if i < warmup:
+                continue
+            latencies.append(elapsed)
+            errors += response.status_code != 200
+        results[endpoint['name']] = summarize(latencies, errors)
+    return results
+
+
+def run_http_load(base_url, endpoints, concurrency=8, iterations=50, timeout=60):
+    """
+    실행 중인 서버에 엔드포인트별로 iterations 건을 concurrency 개 스레드로 동시 요청
+    (스레드별 keep-alive 연결 재사용, 표준 라이브러리 http.client 사용)
+    """
+    url = urlsplit(base_url)
+    connection_cls = HTTPSConnection if url.scheme == 'https' else HTTPConnection
+    local = threading.local()
+
+    def send(endpoint):
+        body = None if endpoint['json'] is None else json.dumps(endpoint['json']).encode('utf-8')
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+
+        started = time.perf_counter()
+        try:
+            if not hasattr(local, 'connection'):
+                local.connection = connection_cls(url.netloc, timeout=timeout)
+            local.connection.request(endpoint['method'], url.path.rstrip('/') + endpoint['path'], body, headers)
+            response = local.connection.getresponse()
+            response.read()
+            ok = response.status == 200
+        except (OSError, HTTPException):
+            local.__dict__.pop('connection', None)
+            ok = False
+        return time.perf_counter() - started, ok
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for endpoint in endpoints:
+            started = time.perf_counter()
+            outcomes = list(pool.map(send, [endpoint] * iterations))
+            wall_time = time.perf_counter() - started
+
+            latencies = [elapsed for elapsed, ok in outcomes if ok]
+            errors = sum(1 for _, ok in outcomes if not ok)
+            results[endpoint['name']] = summarize(latencies, errors, wall_time)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_baseline(mode, results, **meta):
+    return {
+        'meta': {
+            'mode': mode,
+            'commit': git_commit(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            **meta,
+        },
+        'endpoints': results,
+    }
+
+
+def save_baseline(baseline, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_baselines(base, new, metric='p95_ms', threshold=0.2):
+    """
+    두 baseline의 엔드포인트별 지표 비교
+    반환값: [{'name', 'base', 'new', 'change', 'regressed'}, ...] (change: 증감 비율)
+    rps는 값이 작아질수록, 지연시간 지표는 커질수록 regression
+    """
+    rows = []
+    for name, new_stats in new['endpoints'].items():
+        base_stats = base['endpoints'].get(name)
+        if base_stats is None or metric not in base_stats or metric not in new_stats:
+            continue
+
+        before, after = base_stats[metric], new_stats[metric]
+        change = (after - before) / before if before else 0.0
+        regressed = -change > threshold if metric == 'rps' else change > threshold
+        rows.append({'name': name, 'base': before, 'new': after, 'change': change, 'regressed': regressed})
+    return rows
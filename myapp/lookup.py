@@ -0,0 +1,116 @@
+from sqlalchemy import select, insert, update, and_, or_
+from sqlalchemy.orm import aliased
+from myapp.models import RealEstateTransaction, LOOKUP_COLUMNS
+from myapp import db
+
+# 실거래가 문자열 컬럼 -> 정수 코드 컬럼 -> 참조 테이블 (LOOKUP_COLUMNS, models 에 정의)
+# - 그룹핑/필터는 정수 코드로 (인덱스 키가 짧아지고 비교가 정수 비교)
+# - 응답에는 참조 테이블에서 이름을 복원해서 기존 JSON 형식 유지
+
+LOOKUP_BY_NAME = {name: (code, model) for name, code, model in LOOKUP_COLUMNS}
+LOOKUP_BY_CODE = {code: (name, model) for name, code, model in LOOKUP_COLUMNS}
+
+
+def load_lookup_codes(model):
+    """
+    참조 테이블 전체 -> {이름: 코드}
+    """
+    return dict(db.session.execute(select(model.name, model.id)).all())
+
+
+def assign_lookup_codes(records):
+    """
+    레코드(dict) 목록의 문자열 컬럼 값으로 코드 컬럼 채움 (Core INSERT/UPDATE 직전)
+    처음 보는 이름은 참조 테이블에 추가 (같은 트랜잭션, flush 까지만)
+    """
+    for name, code, model in LOOKUP_COLUMNS:
+        if not any(name in rec for rec in records):
+            continue
+
+        codes = load_lookup_codes(model)
+        missing = {rec.get(name) for rec in records} - codes.keys() - {None}
+        if missing:
+            db.session.execute(insert(model), [{'name': value} for value in sorted(missing)])
+            codes = load_lookup_codes(model)
+
+        for rec in records:
+            if name in rec:
+                rec[code] = codes.get(rec[name])
+    return records
+
+
+def lookup_code(model, value):
+    """
+    이름 -> 코드 스칼라 서브쿼리 (없는 이름이면 NULL -> 조건에 맞는 행 없음)
+    """
+    return select(model.id).where(model.name == value).scalar_subquery()
+
+
+def code_column(model, name):
+    """
+    문자열 컬럼 이름 -> 그룹핑에 쓸 컬럼 (코드 컬럼이 있으면 코드 컬럼, 없으면 그 컬럼 그대로)
+    """
+    if name in LOOKUP_BY_NAME and hasattr(model, LOOKUP_BY_NAME[name][0]):
+        return getattr(model, LOOKUP_BY_NAME[name][0])
+    return getattr(model, name)
+
+
+def name_condition(model, name, value):
+    """
+    문자열 컬럼 동등 조건, 코드 컬럼이 있는 테이블(실거래가)은 코드 비교로 바꿈
+    """
+    if name in LOOKUP_BY_NAME and hasattr(model, LOOKUP_BY_NAME[name][0]):
+        code, lookup = LOOKUP_BY_NAME[name]
+        return getattr(model, code) == lookup_code(lookup, value)
+    return getattr(model, name) == value
+
+
+def decode_lookup_codes(stmt):
+    """
+    코드로 그룹핑한 SELECT -> 코드 컬럼을 참조 테이블 이름 컬럼으로 바꾼 SELECT
+    ex) district_id -> district_name (LEFT OUTER JOIN, 코드가 NULL 이면 이름도 NULL)
+    나머지 컬럼은 그대로, 정렬은 반환된 SELECT 의 selected_columns 기준으로 지정
+    """
+    grouped = stmt.subquery()
+    columns, from_clause = [], grouped
+    for column in grouped.c:
+        if column.key not in LOOKUP_BY_CODE:
+            columns.append(column)
+            continue
+
+        name, model = LOOKUP_BY_CODE[column.key]
+        lookup = aliased(model)
+        from_clause = from_clause.outerjoin(lookup, lookup.id == column)
+        columns.append(lookup.name.label(name))
+
+    return select(*columns).select_from(from_clause)
+
+
+def backfill_lookup_codes(batch_size=10000, refresh_all=False):
+    """
+    기존 거래 행의 코드 컬럼 채우기 (ret_id keyset 배치 단위 bulk UPDATE)
+    refresh_all=False: 이름은 있는데 코드가 비어 있는 행만
+    반환값: 갱신한 행 수
+    """
+    columns = [getattr(RealEstateTransaction, name) for name, _, _ in LOOKUP_COLUMNS]
+    stmt = select(RealEstateTransaction.ret_id, *columns).order_by(RealEstateTransaction.ret_id)
+    if not refresh_all:
+        stmt = stmt.where(or_(*(
+            and_(getattr(RealEstateTransaction, name).isnot(None), getattr(RealEstateTransaction, code).is_(None))
+            for name, code, _ in LOOKUP_COLUMNS
+        )))
+
+    last_id, row_count = 0, 0
+    while True:
+        rows = db.session.execute(stmt.where(RealEstateTransaction.ret_id > last_id).limit(batch_size)).mappings().all()
+        if not rows:
+            break
+
+        records = assign_lookup_codes([dict(row) for row in rows])
+        params = [{'ret_id': rec['ret_id'], **{code: rec[code] for _, code, _ in LOOKUP_COLUMNS}} for rec in records]
+        # 기본키 기준 ORM bulk UPDATE (executemany)
+        db.session.execute(update(RealEstateTransaction), params)
+        db.session.commit()
+        last_id, row_count = rows[-1]['ret_id'], row_count + len(rows)
+
+    return row_count
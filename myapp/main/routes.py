@@ -1,16 +1,168 @@
-from flask import render_template, jsonify, request
-import pandas as pd
+from flask import render_template
+import numpy as np
 from . import main_bp
-from sqlalchemy import select, func
-from myapp.models import RealEstateTransaction
+from sqlalchemy import select, func, case, and_
+from myapp.models import RealEstateTransaction, TransactionYearlySummary, TransactionMonthlySummary
+from myapp.summary import summary_available, monthly_summary_available, avg_price_per_sqm
+from myapp.cache import cache
+from myapp.snapshot import transaction_snapshot
+from myapp.lookup import decode_lookup_codes, name_condition
+from myapp import analytics
+from myapp.responses import json_response, table_response, request_format, request_params
 from myapp import db
 
+def build_yearly_avg_price_by_district_stmt():
+    """
+    연도별 지역구 평균 평단가 + 거래 수 집계 SQL (자치구 코드로 그룹핑 후 이름 복원)
+    """
+    return decode_lookup_codes(
+        select(
+            RealEstateTransaction.district_id,
+            RealEstateTransaction.reception_year,
+            func.avg(
+                (RealEstateTransaction.amount * 10000)
+                / RealEstateTransaction.building_area
+            ).label("avg_price_per_sqm"),
+            func.count().label("transaction_count")
+        )
+        .group_by(
+            RealEstateTransaction.district_id,
+            RealEstateTransaction.reception_year
+        )
+    )
+
+def build_yearly_avg_price_by_building_stmt():
+    """
+    건물유형 × 연도별 평균 평단가 집계 SQL (건물용도 코드로 그룹핑 후 이름 복원)
+    """
+    stmt = decode_lookup_codes(
+        select(
+            RealEstateTransaction.building_use_id,
+            RealEstateTransaction.reception_year,
+            func.avg(
+                (RealEstateTransaction.amount * 10000)
+                / RealEstateTransaction.building_area
+            ).label("avg_price_per_sqm"),
+        )
+        .group_by(
+            RealEstateTransaction.building_use_id,
+            RealEstateTransaction.reception_year,
+        )
+    )
+    return stmt.order_by(
+        stmt.selected_columns.reception_year.nulls_last()
+    )
+
+def build_yearly_avg_price_by_district_summary_stmt():
+    """
+    연도별 지역구 평균 평단가 + 거래 수 (집계 테이블 기준)
+    """
+    return (
+        select(
+            TransactionYearlySummary.district_name,
+            TransactionYearlySummary.reception_year,
+            avg_price_per_sqm().label("avg_price_per_sqm"),
+            func.sum(TransactionYearlySummary.transaction_count).label("transaction_count"),
+        )
+        .group_by(
+            TransactionYearlySummary.district_name,
+            TransactionYearlySummary.reception_year,
+        )
+    )
+
+def build_yearly_avg_price_by_building_summary_stmt():
+    """
+    건물유형 × 연도별 평균 평단가 (집계 테이블 기준)
+    """
+    return (
+        select(
+            TransactionYearlySummary.building_use,
+            TransactionYearlySummary.reception_year,
+            avg_price_per_sqm().label("avg_price_per_sqm"),
+        )
+        .group_by(
+            TransactionYearlySummary.building_use,
+            TransactionYearlySummary.reception_year,
+        )
+        .order_by(
+            TransactionYearlySummary.reception_year.nulls_last()
+        )
+    )
+
+def month_conditions(model, district_name=None, legal_dong_name=None, building_use=None, start=None, end=None):
+    """
+    /trend 필터 조건 (계약 연월은 정수 범위 비교, 원본 테이블의 구/동/용도는 코드 비교)
+    """
+    conditions = [model.contract_month.isnot(None)]
+    if district_name:
+        conditions.append(name_condition(model, 'district_name', district_name))
+    if legal_dong_name:
+        conditions.append(name_condition(model, 'legal_dong_name', legal_dong_name))
+    if building_use:
+        conditions.append(name_condition(model, 'building_use', building_use))
+    if start is not None:
+        conditions.append(model.contract_month >= start)
+    if end is not None:
+        conditions.append(model.contract_month <= end)
+    return conditions
+
+def build_monthly_price_stmt(**filters):
+    """
+    계약 연월별 평단가 합계/건수 + 전체 거래 수 집계 SQL (원본 테이블, 계약 연월 인덱스)
+    """
+    has_price = and_(
+        RealEstateTransaction.building_area > 0,
+        RealEstateTransaction.amount.isnot(None),
+    )
+    price_per_sqm = (RealEstateTransaction.amount * 10000) / RealEstateTransaction.building_area
+
+    return (
+        select(
+            RealEstateTransaction.contract_month,
+            func.coalesce(func.sum(case((has_price, price_per_sqm))), 0).label("price_per_sqm_sum"),
+            func.count(case((has_price, 1))).label("price_per_sqm_count"),
+            func.count().label("transaction_count"),
+        )
+        .where(*month_conditions(RealEstateTransaction, **filters))
+        .group_by(RealEstateTransaction.contract_month)
+        .order_by(RealEstateTransaction.contract_month)
+    )
+
+def build_monthly_price_summary_stmt(**filters):
+    """
+    계약 연월별 평단가 합계/건수 + 전체 거래 수 (월별 집계 테이블 기준)
+    """
+    return (
+        select(
+            TransactionMonthlySummary.contract_month,
+            func.sum(TransactionMonthlySummary.price_per_sqm_sum).label("price_per_sqm_sum"),
+            func.sum(TransactionMonthlySummary.price_per_sqm_count).label("price_per_sqm_count"),
+            func.sum(TransactionMonthlySummary.transaction_count).label("transaction_count"),
+        )
+        .where(*month_conditions(TransactionMonthlySummary, **filters))
+        .group_by(TransactionMonthlySummary.contract_month)
+        .order_by(TransactionMonthlySummary.contract_month)
+    )
+
+def parse_month(value, name):
+    """
+    요청 연월 값 -> YYYYMM 정수 (YYYY-MM / YYYYMM 허용, 없으면 None), 형식이 틀리면 ValueError
+    """
+    if value is None or value == '':
+        return None
+
+    text = str(value).strip().replace('-', '')
+    if isinstance(value, bool) or len(text) != 6 or not text.isdigit() or not 1 <= int(text[4:]) <= 12:
+        raise ValueError(f'{name} 값은 YYYY-MM 형식이어야 합니다: {value}')
+    return int(text)
+
 @main_bp.route('/', methods=['GET'])
 def index():
     return render_template('main/index.html')
 
 
-@main_bp.route('/district', methods=['POST'])
+@main_bp.route('/district', methods=['GET', 'POST'])
+@cache.cached
 def district():
     """
     리팩토링 목적:
@@ -21,114 +173,46 @@ def district():
     After: total waiting for server response: 0.14s
             (1.44 -0.14) /1.44 ×100 ≈90.3% 개선
     """
+    # 응답 형식: records(기본) | columnar (지역구 단위 결과라 연도 pivot 없음)
+    try:
+        fmt = request_format(request_params(), allowed=('records', 'columnar'))
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
+
     # Task 1: DB에서 연도별 지역구 평균 평단가 + 거래수 계산
     def fetch_yearly_avg_price_by_district():
         """
         DB에서 연도별 지역구 평균 평단가 + 거래 수 조회
-        (원본 데이터 로드 없음)
+        (원본 데이터 로드 없음, 실거래가 스냅샷 -> 집계 테이블 -> 원본 테이블 순)
         """
-        stmt = (
-            select(
-                RealEstateTransaction.district_name,
-                RealEstateTransaction.reception_year,
-                func.avg(
-                    (RealEstateTransaction.amount * 10000)
-                    / RealEstateTransaction.building_area
-                ).label("avg_price_per_sqm"),
-                func.count().label("transaction_count")
-            )
-            .group_by(
-                RealEstateTransaction.district_name,
-                RealEstateTransaction.reception_year
-            )
-        )
+        snapshot = transaction_snapshot.get()
+        if snapshot is not None:
+            return snapshot.yearly_by_district()
+
+        if summary_available():
+            stmt = build_yearly_avg_price_by_district_summary_stmt()
+        else:
+            stmt = build_yearly_avg_price_by_district_stmt()
 
         # execute:SQL문을 DB에 직접 실행해라.
         # fetchall: 실행된 SQL의 결과 행들을 한 번에 가져옴
         rows = db.session.execute(stmt).fetchall()
-        return pd.DataFrame(
-            rows,
-            columns=[
-                "district_name",
-                "reception_year",
-                "avg_price_per_sqm",
-                "transaction_count",
-            ],
-        )
-
-    # Task2: 지역구별 전체 상승률 계산 
-    # 정렬 및 라벨링
-    def calculate_total_change_rate_by_district(df_yearly: pd.DataFrame):
-        """
-        지역구별 최초 연도 대비 최종 연도 상승률 계산
-        """
-        total_rate_df = (
-            df_yearly
-            .sort_values(["district_name", "reception_year"])
-            .groupby("district_name")
-            .agg(
-                first=("avg_price_per_sqm", "first"),
-                last=("avg_price_per_sqm", "last"),
-                transaction_count=("transaction_count", "sum"),
-            )
-            .reset_index()
-        )
-
-        total_rate_df["total_change_rate"] = (
-            (total_rate_df["last"] - total_rate_df["first"])
-            / total_rate_df["first"] * 100
-        ).round(2)
-
-        return total_rate_df
-
-    # Task3: 랭킹 계산
-    def apply_total_change_rank(df: pd.DataFrame):
-        """
-        상승률 기준 dense rank 적용
-        """
-        df = df.copy()
-        df["rank"] = (
-            df["total_change_rate"]
-            .rank(method="dense", ascending=False)
-            .astype(int)
-        )
-        # 랭킹으로 정렬
-        return df.sort_values(["rank", "district_name"])
-
-    # Task4: 포맷 컬럼
-    # 포맷팅 round(0)으로 소수점 첫 째 자리에서 반올림 | price_per_sqm_format 컬럼 생성
-    def format_price_columns(df: pd.DataFrame):
-        """
-        프론트 출력용 평단가 포맷 컬럼 생성
-        """
-        df = df.copy()
-        df["price_per_sqm_format"] = (
-            df["last"]
-            .round(0)
-            .map(lambda x: f"{int(x):,}")
-        )
-        return df
+        return {
+            "district_name": analytics.column(rows, 0),
+            "reception_year": analytics.column(rows, 1, np.int64),
+            "avg_price_per_sqm": analytics.column(rows, 2, float),
+            "transaction_count": analytics.column(rows, 3, np.int64),
+        }
 
     # Repository
-    df_yearly = fetch_yearly_avg_price_by_district()
-
-    # Service
-    total_rate_df = calculate_total_change_rate_by_district(df_yearly)
-    total_rate_df = apply_total_change_rank(total_rate_df)
-
-    # Presentation
-    total_rate_df = format_price_columns(total_rate_df)
+    yearly = fetch_yearly_avg_price_by_district()
 
-    result = (
-        total_rate_df
-        .fillna("-")
-        .to_dict(orient="records")
-    )
-
-    return jsonify(result)
+    # Service: 지역구별 전체 상승률 + 랭킹 + 포맷
+    return table_response(analytics.district_change_rank(yearly), fmt)
 
 # 건물유형 연도별 매매가 상승률 추이
-@main_bp.route('/building', methods=['POST'])
+@main_bp.route('/building', methods=['GET', 'POST'])
+@cache.cached
 def building():
     """
     리팩토링 목적:
@@ -139,79 +223,99 @@ def building():
             (1.81 -0.26) /1.81 ×100 ≈85.6% 개선
     """
 
-    # Task1: 건물 유형, 연도별로 컬럼 select, 연도별 평균 평단가 계산, df 변환
+    # 응답 형식: records(기본) | columnar | pivot (건물유형 × 연도)
+    try:
+        fmt = request_format(request_params())
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
+
+    # Task1: 건물 유형, 연도별로 컬럼 select, 연도별 평균 평단가 계산
     def fetch_yearly_avg_price_by_building():
         """
         건물유형 × 연도별 평균 평단가 조회 (차트용)
         """
-        stmt = (
-            select(
-                RealEstateTransaction.building_use,
-                RealEstateTransaction.reception_year,
-                func.avg(
-                    (RealEstateTransaction.amount * 10000)
-                    / RealEstateTransaction.building_area
-                ).label("avg_price_per_sqm"),
-            )
-            .group_by(
-                RealEstateTransaction.building_use,
-                RealEstateTransaction.reception_year,
-            )
-            .order_by(
-                RealEstateTransaction.reception_year
-            )
-        )
+        snapshot = transaction_snapshot.get()
+        if snapshot is not None:
+            return snapshot.yearly_by_building()
+
+        if summary_available():
+            stmt = build_yearly_avg_price_by_building_summary_stmt()
+        else:
+            stmt = build_yearly_avg_price_by_building_stmt()
 
         rows = db.session.execute(stmt).fetchall()
 
-        return pd.DataFrame(
-            rows,
-            columns=[
-                "building_use",
-                "reception_year",
-                "avg_price_per_sqm",
-            ],
-        )
+        return {
+            "building_use": analytics.column(rows, 0),
+            "reception_year": analytics.column(rows, 1, np.int64),
+            "avg_price_per_sqm": analytics.column(rows, 2, float),
+        }
     
-    # Task2: 연도별 상승률 계산
-    def calc_yoy_change_rate_by_building(df: pd.DataFrame):
-        df = df.copy()
-
-        df["yoy_change_rate"] = (
-            df
-            .groupby("building_use")["avg_price_per_sqm"]
-            .pct_change()
-            .mul(100)
-            .round(2)
-        )
+    # Repository
+    yearly = fetch_yearly_avg_price_by_building()
 
-        return df
+    # Service: 건물유형별 전년 대비 상승률
+    return table_response(
+        analytics.building_yoy_change(yearly),
+        fmt,
+        pivot={
+            "keys": ("building_use",),
+            "values": ("avg_price_per_sqm", "yoy_change_rate"),
+        },
+    )
 
-    # 
-    def prepare_building_chart_data(df: pd.DataFrame):
-        df = df.copy()
 
-        df["avg_price_per_sqm"] = (
-            df["avg_price_per_sqm"]
-            .round(0)
-            .astype(int)
-        )
+# 월별 / 분기별 평단가 추이
+@main_bp.route('/trend', methods=['GET', 'POST'])
+@cache.cached
+def trend():
+    """
+    계약일 기준 월별(분기별) 평균 평단가 + 직전 기간 대비 상승률 + 거래 수
+    - body(POST) / 쿼리스트링(GET): period(month | quarter), start / end(YYYY-MM, 포함), district, dong, building_type, format(records | columnar)
+    - 계약일 문자열을 요청마다 파싱하지 않고 계약 연월 정수 컬럼 / 월별 집계 테이블 사용
+    - 분기는 월별 합계/건수를 묶어서 계산 (SQL 은 월 단위 그대로)
+    """
+    data = request_params()
 
-        df["yoy_change_rate"].fillna("-", inplace=True)
+    try:
+        fmt = request_format(data, allowed=('records', 'columnar'))
+        period = data.get('period') or 'month'
+        if period not in ('month', 'quarter'):
+            raise ValueError(f'지원하지 않는 period: {period} (가능한 값: month, quarter)')
+        start = parse_month(data.get('start'), 'start')
+        end = parse_month(data.get('end'), 'end')
+        if start is not None and end is not None and start > end:
+            raise ValueError('start 는 end 보다 늦을 수 없습니다.')
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
 
-        return df
+    # Task 1: 연월별 합계/건수 조회 (실거래가 스냅샷 -> 월별 집계 테이블 -> 원본 테이블 순)
+    def fetch_monthly_price(**filters):
+        snapshot = transaction_snapshot.get()
+        if snapshot is not None:
+            return snapshot.monthly_price(**filters)
 
-    # Repository
-    df_yearly = fetch_yearly_avg_price_by_building()
+        if monthly_summary_available():
+            stmt = build_monthly_price_summary_stmt(**filters)
+        else:
+            stmt = build_monthly_price_stmt(**filters)
 
-    # Service
-    df_yearly = calc_yoy_change_rate_by_building(df_yearly)
+        rows = db.session.execute(stmt).fetchall()
+        return {
+            "contract_month": analytics.column(rows, 0, np.int64),
+            "price_per_sqm_sum": analytics.column(rows, 1, float),
+            "price_per_sqm_count": analytics.column(rows, 2, np.int64),
+            "transaction_count": analytics.column(rows, 3, np.int64),
+        }
 
-    # Presentation
-    result = (
-        df_yearly
-        .fillna("-")
-        .to_dict(orient="records")
+    # Repository
+    monthly = fetch_monthly_price(
+        district_name=data.get('district'),
+        legal_dong_name=data.get('dong'),
+        building_use=data.get('building_type'),
+        start=start,
+        end=end,
     )
 
-    return jsonify(result)
\ No newline at end of file
+    # Service: 월/분기 평균 평단가 + 직전 기간 대비 상승률
+    return table_response(analytics.period_series(monthly, period), fmt)
@@ -0,0 +1,270 @@
+import time
+import threading
+import ipaddress
+from functools import partial
+from flask import current_app, g, request, has_request_context, abort
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+# 요청 단위 계측 (debug toolbar 없이 운영에서도 사용)
+# - 요청 전체 시간 / SQL 실행 횟수·시간(엔진 이벤트) / JSON 직렬화 시간
+# - 응답 헤더 Server-Timing 으로 내려주고, /metrics 에서 Prometheus text 포맷으로 라우트별 히스토그램 제공
+#   (Server-Timing total 은 다른 after_request 처리(압축 등)까지 포함, 스트리밍 본문 전송 시간은 제외)
+# - 지표는 프로세스(gunicorn 워커) 단위로 집계됨
+
+# /metrics 접근 허용 대역 (내부 수집기만)
+DEFAULT_ALLOWED_NETWORKS = ('127.0.0.0/8', '::1/128', '10.0.0.0/8', '172.16.0.0/12', '192.168.0.0/16')
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def record(name, elapsed=0.0, count=0):
+    """
+    현재 요청의 계측 값 누적 (요청 컨텍스트 밖에서는 무시)
+    """
+    if not has_request_context():
+        return
+    state = g.get('_request_metrics')
+    if state is None:
+        return
+    state[f'{name}_time'] += elapsed
+    state[f'{name}_count'] += count
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """
+    jsonify / 스트리밍 응답의 JSON 직렬화 시간 측정 (실제 직렬화는 기존 provider 에 위임)
+    """
+
+    def __init__(self, app, provider):
+        super().__init__(app)
+        self.provider = provider
+
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self.provider.dumps(obj, **kwargs)
+        finally:
+            record('serialize', time.perf_counter() - started)
+
+    def loads(self, s, **kwargs):
+        return self.provider.loads(s, **kwargs)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_metrics_started', None)
+    if started is not None:
+        record('sql', time.perf_counter() - started, 1)
+
+
+class Histogram:
+    """
+    라벨별 누적 히스토그램 (Prometheus histogram 과 같은 의미)
+    """
+
+    def __init__(self, name, help_text, label_names, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        self._series = {}
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series['buckets'][i] += 1
+        series['sum'] += value
+        series['count'] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, series in sorted(self._series.items()):
+            label_text = format_labels(self.label_names, labels)
+            for bound, bucket_count in zip(self.buckets, series['buckets']):
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {bucket_count}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {series["count"]}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {series["sum"]:.6f}')
+            lines.append(f'{self.name}_count{{{label_text}}} {series["count"]}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._series = {}
+
+    def inc(self, labels, value=1):
+        self._series[labels] = self._series.get(labels, 0) + value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for labels, value in sorted(self._series.items()):
+            lines.append(f'{self.name}{{{format_labels(self.label_names, labels)}}} {value}')
+        return lines
+
+
+def format_labels(names, values):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    return ','.join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+
+
+class RequestMetrics:
+    """
+    요청 계측 확장
+    - METRICS_ENABLED: 계측 on/off
+    - METRICS_ENDPOINT: Prometheus text 엔드포인트 경로 (None 이면 등록 안 함)
+    - METRICS_ALLOWED_NETWORKS: 엔드포인트 접근 허용 대역 (CIDR 목록, 밖에서 오면 403)
+    - METRICS_BUCKETS: 히스토그램 구간(초)
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from myapp import db
+
+        app.config.setdefault('METRICS_ENABLED', True)
+        app.config.setdefault('METRICS_ENDPOINT', '/metrics')
+        app.config.setdefault('METRICS_BUCKETS', DEFAULT_BUCKETS)
+        app.config.setdefault('METRICS_ALLOWED_NETWORKS', DEFAULT_ALLOWED_NETWORKS)
+        if not app.config['METRICS_ENABLED']:
+            return
+
+        buckets = app.config['METRICS_BUCKETS']
+        app.extensions['request_metrics'] = {
+            'lock': threading.Lock(),
+            'requests': Counter('http_requests_total', '요청 수', ('route', 'method', 'status')),
+            'duration': Histogram(
+                'http_request_duration_seconds', '요청 처리 시간', ('route', 'method'), buckets,
+            ),
+            'sql_duration': Histogram(
+                'http_request_sql_duration_seconds', '요청당 SQL 실행 시간', ('route',), buckets,
+            ),
+            'sql_queries': Counter('http_request_sql_queries_total', 'SQL 실행 횟수', ('route',)),
+            'serialize_duration': Histogram(
+                'http_request_serialize_duration_seconds', '요청당 JSON 직렬화 시간', ('route',), buckets,
+            ),
+            'allowed_networks': [
+                ipaddress.ip_network(network.strip()) for network in app.config['METRICS_ALLOWED_NETWORKS']
+            ],
+        }
+
+        # SQL 계측: 앱에 연결된 엔진(bind 포함)의 cursor 실행 이벤트
+        with app.app_context():
+            for engine in db.engines.values():
+                if not event.contains(engine, 'before_cursor_execute', before_cursor_execute):
+                    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+                    event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+
+        # 직렬화 계측: 현재 JSON provider(orjson 등)를 감싸서 시간만 측정
+        app.json = TimedJSONProvider(app, app.json)
+
+        app.before_request(self._start)
+        # after_request 는 등록 역순으로 실행 -> 맨 앞에 넣어서 압축 등 다른 후처리가 끝난 뒤 마지막에 측정
+        app.after_request_funcs.setdefault(None, []).insert(0, self._add_server_timing)
+        app.teardown_request(self._teardown)
+
+        if app.config['METRICS_ENDPOINT']:
+            app.add_url_rule(app.config['METRICS_ENDPOINT'], 'metrics', self.render_view)
+
+    @property
+    def _state(self):
+        return current_app.extensions['request_metrics']
+
+    def _start(self):
+        g._request_metrics = {
+            'started': time.perf_counter(),
+            'sql_time': 0.0,
+            'sql_count': 0,
+            'serialize_time': 0.0,
+            'serialize_count': 0,
+            'status': None,
+        }
+
+    def _add_server_timing(self, response):
+        state = g.get('_request_metrics')
+        if state is None:
+            return response
+
+        state['status'] = response.status_code
+        total = (time.perf_counter() - state['started']) * 1000
+        sql = state['sql_time'] * 1000
+        serialize = state['serialize_time'] * 1000
+        # app: SQL / 직렬화를 제외한 나머지 (pandas/numpy 계산, 캐시 조회 등)
+        other = max(total - sql - serialize, 0.0)
+
+        response.headers.add(
+            'Server-Timing',
+            f'total;dur={total:.2f}, '
+            f'sql;dur={sql:.2f};desc="{state["sql_count"]} queries", '
+            f'serialize;dur={serialize:.2f}, '
+            f'app;dur={other:.2f}',
+        )
+
+        # 스트리밍 응답: 헤더는 본문 전송 전 값, 지표는 본문 전송이 끝난(close) 뒤 집계
+        if response.is_streamed:
+            state['streamed'] = True
+            response.call_on_close(partial(
+                self._observe, current_app._get_current_object(), state, self._route(), request.method,
+            ))
+        return response
+
+    def _teardown(self, exc=None):
+        state = g.get('_request_metrics')
+        if state is None or state.get('streamed'):
+            return
+
+        g.pop('_request_metrics')
+        if exc is not None or state['status'] is None:
+            state['status'] = 500
+        self._observe(current_app._get_current_object(), state, self._route(), request.method)
+
+    @staticmethod
+    def _route():
+        return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+    @staticmethod
+    def _observe(app, state, route, method):
+        elapsed = time.perf_counter() - state['started']
+        metrics = app.extensions['request_metrics']
+        with metrics['lock']:
+            metrics['requests'].inc((route, method, str(state['status'])))
+            metrics['duration'].observe((route, method), elapsed)
+            metrics['sql_duration'].observe((route,), state['sql_time'])
+            metrics['sql_queries'].inc((route,), state['sql_count'])
+            metrics['serialize_duration'].observe((route,), state['serialize_time'])
+
+    def render(self):
+        metrics = self._state
+        with metrics['lock']:
+            lines = []
+            for name in ('requests', 'duration', 'sql_duration', 'sql_queries', 'serialize_duration'):
+                lines.extend(metrics[name].render())
+        return '\n'.join(lines) + '\n'
+
+    def _allowed(self, remote_addr):
+        try:
+            address = ipaddress.ip_address(remote_addr or '')
+        except ValueError:
+            return False
+        return any(address in network for network in self._state['allowed_networks'])
+
+    def render_view(self):
+        if not self._allowed(request.remote_addr):
+            abort(403)
+        return current_app.response_class(self.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+metrics = RequestMetrics()
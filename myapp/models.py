@@ -1,8 +1,80 @@
+from sqlalchemy import event, inspect, select, insert
+from sqlalchemy.orm import validates
 from myapp import db
 
+
+def split_address(address):
+    """
+    주소 문자열에서 (자치구, 법정동) 추출
+    ex) "도봉구 방학동 123-4" -> ("도봉구", "방학동")
+    """
+    tokens = (address or '').split()
+    district_name = tokens[0] if len(tokens) > 0 else None
+    legal_dong_name = tokens[1] if len(tokens) > 1 else None
+    return district_name, legal_dong_name
+
+
+def contract_month_of(contract_date):
+    """
+    계약일 문자열(YYYYMMDD)에서 계약 연월 정수(YYYYMM) 추출, 형식이 맞지 않으면 None
+    ex) "20230415" -> 202304
+    """
+    value = (contract_date or '').strip()
+    if len(value) != 8 or not value.isdigit() or not 1 <= int(value[4:6]) <= 12:
+        return None
+    return int(value[:6])
+
+# 코드 참조 테이블 공통 컬럼 (이름 -> 정수 코드, 이름은 중복 없음)
+class LookupMixin:
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), unique=True, nullable=False)
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {self.id} {self.name}>'
+
+# 자치구 코드
+class District(LookupMixin, db.Model):
+    __tablename__ = 'district'
+
+# 법정동 코드 (동 이름 기준, 자치구가 달라도 같은 이름이면 같은 코드)
+class LegalDong(LookupMixin, db.Model):
+    __tablename__ = 'legal_dong'
+
+# 지번구분 코드
+class JibunType(LookupMixin, db.Model):
+    __tablename__ = 'jibun_type'
+
+# 권리구분 코드
+class RightType(LookupMixin, db.Model):
+    __tablename__ = 'right_type'
+
+# 건물용도 코드
+class BuildingUse(LookupMixin, db.Model):
+    __tablename__ = 'building_use'
+
+# 신고구분 코드
+class DeclarationType(LookupMixin, db.Model):
+    __tablename__ = 'declaration_type'
+
 # 부동산 실거래가 테이블
 class RealEstateTransaction(db.Model):
     __tablename__ = 'real_estate_transaction'
+    # 인덱스는 라우트 쿼리 형태에 맞춰 구성 (flask explain 으로 실행 계획 확인)
+    __table_args__ = (
+        # /query/search: 구/동/건물용도 코드 동등 조건 + 금액 범위 조건, 키 순서 = 응답 정렬 순서 (정렬 단계 없이 LIMIT)
+        db.Index('ix_ret_search', 'district_id', 'legal_dong_id', 'building_use_id', 'amount'),
+        # /query/search 건물용도 필터 (구/동 없이): 건물용도 동등 조건 뒤로 같은 정렬 순서
+        db.Index('ix_ret_building_search', 'building_use_id', 'district_id', 'legal_dong_id', 'amount'),
+        # /predict/location: 구/동 필터 + 구/동/연도 그룹핑 (코드 기준, 평단가 계산 컬럼까지 커버링)
+        db.Index('ix_ret_dong_year_cover', 'district_id', 'legal_dong_id', 'reception_year',
+                 'building_use_id', 'amount', 'building_area'),
+        # /district: 구/연도 그룹핑 (코드 기준 커버링)
+        db.Index('ix_ret_district_year_cover', 'district_id', 'reception_year', 'amount', 'building_area'),
+        # /building: 건물용도/연도 그룹핑 (코드 기준 커버링)
+        db.Index('ix_ret_building_year_cover', 'building_use_id', 'reception_year', 'amount', 'building_area'),
+        # 계약 연월 범위 조건 (월별 집계 테이블이 비어 있을 때 /trend)
+        db.Index('ix_ret_contract_month', 'contract_month', 'district_id'),
+    )
     
     ret_id = db.Column(db.Integer, primary_key=True)
     reception_year = db.Column(db.Integer)  # 접수연도
@@ -16,6 +88,7 @@ class RealEstateTransaction(db.Model):
     sub_number = db.Column(db.String(10))  # 부번
     building_name = db.Column(db.String(150))  # 건물명
     contract_date = db.Column(db.String(8))  # 계약일
+    contract_month = db.Column(db.Integer)  # 계약 연월(YYYYMM), 계약일에서 파생 (월별 추이 집계/범위 조건용)
     amount = db.Column(db.BigInteger)  # 물건금액(만원)
     building_area = db.Column(db.Float)  # 건물면적(㎡)
     land_area = db.Column(db.Float)  # 토지면적(㎡)
@@ -27,17 +100,79 @@ class RealEstateTransaction(db.Model):
     declaration_type = db.Column(db.String(50))  # 신고구분
     broker_district_name = db.Column(db.String(200))  # 신고한 개업공인중개사 시군구명
 
+    # 반복 값이 적은 문자열 컬럼의 정수 코드 (참조 테이블 id)
+    # - 적재/backfill 은 lookup.assign_lookup_codes 로, ORM 으로 저장하는 행은 fill_lookup_codes 이벤트로 채움
+    # 그룹핑/필터는 코드로 하고 응답의 이름은 참조 테이블에서 복원 (문자열 컬럼은 /api, 내보내기, 적재 키용으로 유지)
+    district_id = db.Column(db.Integer, db.ForeignKey('district.id', name='fk_ret_district'))
+    legal_dong_id = db.Column(db.Integer, db.ForeignKey('legal_dong.id', name='fk_ret_legal_dong'))
+    jibun_type_id = db.Column(db.Integer, db.ForeignKey('jibun_type.id', name='fk_ret_jibun_type'))
+    right_type_id = db.Column(db.Integer, db.ForeignKey('right_type.id', name='fk_ret_right_type'))
+    building_use_id = db.Column(db.Integer, db.ForeignKey('building_use.id', name='fk_ret_building_use'))
+    declaration_type_id = db.Column(db.Integer, db.ForeignKey('declaration_type.id', name='fk_ret_declaration_type'))
+
+    # 계약일이 저장될 때 계약 연월도 함께 채움 (기존 행은 flask summary backfill-month)
+    @validates('contract_date')
+    def parse_contract_date(self, key, contract_date):
+        self.contract_month = contract_month_of(contract_date)
+        return contract_date
+
     def __repr__(self):
         return f'<RealEstateTransaction {self.id} {self.building_name}>'
 
+# 실거래가 문자열 컬럼 -> 정수 코드 컬럼 -> 참조 테이블
+LOOKUP_COLUMNS = (
+    ('district_name', 'district_id', District),
+    ('legal_dong_name', 'legal_dong_id', LegalDong),
+    ('jibun_type_name', 'jibun_type_id', JibunType),
+    ('right_type', 'right_type_id', RightType),
+    ('building_use', 'building_use_id', BuildingUse),
+    ('declaration_type', 'declaration_type_id', DeclarationType),
+)
+
+
+def resolve_lookup_code(connection, model, value):
+    """
+    이름 -> 참조 테이블 코드 (처음 보는 이름이면 같은 연결(트랜잭션)에서 추가)
+    """
+    table = model.__table__
+    code = connection.execute(select(table.c.id).where(table.c.name == value)).scalar()
+    if code is None:
+        code = connection.execute(insert(table).values(name=value)).inserted_primary_key[0]
+    return code
+
+
+# ORM 으로 저장하는 거래 행(노트북/스크립트의 session.add 등)도 코드 컬럼을 채움
+# (Core / ORM bulk INSERT 는 이벤트가 없으므로 호출하는 쪽에서 lookup.assign_lookup_codes 사용)
+@event.listens_for(RealEstateTransaction, 'before_insert')
+@event.listens_for(RealEstateTransaction, 'before_update')
+def fill_lookup_codes(mapper, connection, target):
+    """
+    코드가 비어 있거나, 이름만 바뀌고 코드는 그대로인 컬럼의 코드 채움 (코드를 같이 지정한 행은 그대로 저장)
+    """
+    attrs = inspect(target).attrs
+    for name, code, model in LOOKUP_COLUMNS:
+        value = getattr(target, name)
+        renamed = attrs[name].history.has_changes() and not attrs[code].history.has_changes()
+        if value is None:
+            if renamed:
+                setattr(target, code, None)
+        elif renamed or getattr(target, code) is None:
+            setattr(target, code, resolve_lookup_code(connection, model, value))
+
 # 공공 주차장 테이블
 class PublicParking(db.Model):
     __tablename__ = 'public_parking'
+    __table_args__ = (
+        db.Index('ix_public_parking_district_dong', 'district_name', 'legal_dong_name'),
+        db.Index('ix_public_parking_code', 'parking_code'),  # 주차 현황 피드 반영 (주차장코드 기준 UPDATE)
+    )
 
     pp_id = db.Column(db.Integer, primary_key=True)
     parking_code = db.Column(db.String(20))  # 주차장코드
     parking_name = db.Column(db.String(150))  # 주차장명
     address = db.Column(db.String(255))  # 주소
+    district_name = db.Column(db.String(50))  # 자치구명 (주소에서 파싱)
+    legal_dong_name = db.Column(db.String(50))  # 법정동명 (주소에서 파싱)
     parking_type = db.Column(db.String(20))  # 주차장 종류
     parking_type_name = db.Column(db.String(50))  # 주차장 종류명
     operation_type = db.Column(db.String(20))  # 운영구분
@@ -48,6 +183,7 @@ class PublicParking(db.Model):
     total_spaces = db.Column(db.Integer)  # 총 주차면
     current_parking = db.Column(db.Integer)  # 현재 주차 차량수
     current_parking_update_time = db.Column(db.String(50))  # 현재 주차 차량수 업데이트시간
+    occupancy_version = db.Column(db.Integer, index=True)  # 주차 현황을 마지막으로 바꾼 피드 배치 버전 (워커 증분 반영 기준)
     pay_type = db.Column(db.String(10))  # 유무료구분
     pay_type_name = db.Column(db.String(20))  # 유무료구분명
     night_free_open = db.Column(db.String(1))  # 야간무료개방여부
@@ -80,6 +216,12 @@ class PublicParking(db.Model):
     share_parking_company_link = db.Column(db.String(512))  # 공유 주차장 관리업체 링크
     share_parking_etc = db.Column(db.String(512))  # 공유 주차장 기타사항
 
+    # 주소가 저장될 때 자치구/법정동 컬럼도 함께 채움 (기존 행은 flask parking backfill-area)
+    @validates('address')
+    def parse_address(self, key, address):
+        self.district_name, self.legal_dong_name = split_address(address)
+        return address
+
     def __repr__(self):
         return f'<PublicParking {self.parking_code} {self.parking_name}>'
 
@@ -95,3 +237,116 @@ class Api(db.Model):
     
     def __repr__(self):
         return f'<Api {self.id} {self.name}>'
+
+# 연도별 평단가 집계 테이블 (자치구 | 법정동 | 건물용도 | 접수연도)
+# 평균 대신 합계/건수를 저장해서 어떤 그룹핑 레벨에서도 평균을 다시 계산할 수 있음 (flask summary refresh 로 갱신)
+class TransactionYearlySummary(db.Model):
+    __tablename__ = 'transaction_yearly_summary'
+    __table_args__ = (
+        db.Index('ix_tys_key', 'district_name', 'legal_dong_name', 'building_use', 'reception_year'),
+    )
+
+    tys_id = db.Column(db.Integer, primary_key=True)
+    district_name = db.Column(db.String(50))  # 자치구명
+    legal_dong_name = db.Column(db.String(50))  # 법정동명
+    building_use = db.Column(db.String(50))  # 건물용도
+    reception_year = db.Column(db.Integer)  # 접수연도
+    price_per_sqm_sum = db.Column(db.Float, default=0)  # 평단가 합계 (건물면적 > 0, 물건금액 존재 거래)
+    price_per_sqm_count = db.Column(db.Integer, default=0)  # 평단가 계산 대상 거래 수
+    transaction_count = db.Column(db.Integer, default=0)  # 전체 거래 수
+    max_ret_id = db.Column(db.Integer)  # 반영된 마지막 거래 ret_id (증분 갱신 기준)
+
+    def __repr__(self):
+        return f'<TransactionYearlySummary {self.district_name} {self.legal_dong_name} {self.building_use} {self.reception_year}>'
+
+# 월별 평단가 집계 테이블 (자치구 | 법정동 | 건물용도 | 계약 연월)
+# 연도별 집계 테이블과 같은 합계/건수 구조, 분기 추이는 월별 행을 묶어서 계산 (flask summary refresh 로 갱신)
+class TransactionMonthlySummary(db.Model):
+    __tablename__ = 'transaction_monthly_summary'
+    __table_args__ = (
+        db.Index('ix_tms_key', 'district_name', 'legal_dong_name', 'building_use', 'contract_month'),
+        db.Index('ix_tms_month', 'contract_month'),
+    )
+
+    tms_id = db.Column(db.Integer, primary_key=True)
+    district_name = db.Column(db.String(50))  # 자치구명
+    legal_dong_name = db.Column(db.String(50))  # 법정동명
+    building_use = db.Column(db.String(50))  # 건물용도
+    contract_month = db.Column(db.Integer)  # 계약 연월(YYYYMM)
+    price_per_sqm_sum = db.Column(db.Float, default=0)  # 평단가 합계 (건물면적 > 0, 물건금액 존재 거래)
+    price_per_sqm_count = db.Column(db.Integer, default=0)  # 평단가 계산 대상 거래 수
+    transaction_count = db.Column(db.Integer, default=0)  # 전체 거래 수
+    max_ret_id = db.Column(db.Integer)  # 반영된 마지막 거래 ret_id (증분 갱신 기준)
+
+    def __repr__(self):
+        return f'<TransactionMonthlySummary {self.district_name} {self.legal_dong_name} {self.building_use} {self.contract_month}>'
+
+# 법정동 | 접수연도별 평단가 + 전년 대비 상승률 (건물용도 전체, 집계 테이블에서 파생)
+# 집계 테이블 갱신 시 새 거래가 들어온 법정동만 다시 계산 (summary.refresh_dong_changes)
+class DongYearlyChange(db.Model):
+    __tablename__ = 'dong_yearly_change'
+    __table_args__ = (
+        db.Index('ix_dyc_key', 'district_name', 'legal_dong_name', 'reception_year'),
+    )
+
+    dyc_id = db.Column(db.Integer, primary_key=True)
+    district_name = db.Column(db.String(50))  # 자치구명
+    legal_dong_name = db.Column(db.String(50))  # 법정동명
+    reception_year = db.Column(db.Integer)  # 접수연도
+    avg_price_per_sqm = db.Column(db.Float)  # 평균 평단가
+    transaction_count = db.Column(db.Integer)  # 평단가 계산 대상 거래 수
+    yoy_change_rate = db.Column(db.Float)  # 전년 대비 상승률(%)
+
+    def __repr__(self):
+        return f'<DongYearlyChange {self.district_name} {self.legal_dong_name} {self.reception_year}>'
+
+# 법정동별 최초 연도 대비 최근 연도 상승률 (랭킹은 조회 시 필터 범위 안에서 계산)
+class DongChange(db.Model):
+    __tablename__ = 'dong_change'
+    __table_args__ = (
+        db.Index('ix_dong_change_key', 'district_name', 'legal_dong_name'),
+    )
+
+    dc_id = db.Column(db.Integer, primary_key=True)
+    district_name = db.Column(db.String(50))  # 자치구명
+    legal_dong_name = db.Column(db.String(50))  # 법정동명
+    first_price = db.Column(db.Float)  # 최초 연도 평균 평단가
+    last_price = db.Column(db.Float)  # 최근 연도 평균 평단가
+    total_change_rate = db.Column(db.Float)  # 최초 대비 최근 상승률(%)
+    transaction_count = db.Column(db.Integer)  # 평단가 계산 대상 거래 수 합계
+    updated_at = db.Column(db.DateTime)  # 마지막 재계산 시각
+
+    def __repr__(self):
+        return f'<DongChange {self.district_name} {self.legal_dong_name}>'
+
+# 법정동별 주차 접근성 지수 (주차장 수용 면수 집계 + 집계 테이블 거래 수/평단가 결합)
+# 집계 테이블 갱신 / 주차장 적재 시 전체 재계산 (summary.refresh_parking_accessibility)
+class ParkingAccessibility(db.Model):
+    __tablename__ = 'parking_accessibility'
+    __table_args__ = (
+        db.Index('ix_parking_accessibility_key', 'district_name', 'legal_dong_name'),
+    )
+
+    pa_id = db.Column(db.Integer, primary_key=True)
+    district_name = db.Column(db.String(50))  # 자치구명
+    legal_dong_name = db.Column(db.String(50))  # 법정동명
+    parking_lot_count = db.Column(db.Integer)  # 주차장 수 (노상 주차장은 주소별 1곳)
+    parking_capacity = db.Column(db.Integer)  # 총 주차면 합계 (노상 주차장은 행 수)
+    transaction_count = db.Column(db.Integer)  # 전체 거래 수
+    avg_price_per_sqm = db.Column(db.Float)  # 평균 평단가
+    accessibility_index = db.Column(db.Float)  # 주차 접근성 지수 = 총 주차면 / 거래 수
+    updated_at = db.Column(db.DateTime)  # 마지막 재계산 시각
+
+    def __repr__(self):
+        return f'<ParkingAccessibility {self.district_name} {self.legal_dong_name}>'
+
+# 데이터 버전 테이블 (데이터 적재/갱신 시 버전 증가 -> 응답 캐시 무효화 기준)
+class DataVersion(db.Model):
+    __tablename__ = 'data_version'
+
+    name = db.Column(db.String(50), primary_key=True)  # 데이터셋 이름 ex) real_estate_transaction
+    version = db.Column(db.Integer, nullable=False, default=0)  # 버전 (적재마다 +1)
+    updated_at = db.Column(db.DateTime)  # 마지막 갱신 시각
+
+    def __repr__(self):
+        return f'<DataVersion {self.name} {self.version}>'
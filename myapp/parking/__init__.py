@@ -2,4 +2,4 @@ from flask import Blueprint
 
 parking_bp = Blueprint('parking', __name__)
 
-from . import routes
+from . import routes, commands
@@ -0,0 +1,134 @@
+import sys
+import time
+import click
+import pandas as pd
+from sqlalchemy import select, update
+from . import parking_bp
+from .services import fetch_parking_summary
+from .occupancy import OccupancyState, StubOccupancyFeed, read_occupancy_file
+from myapp.models import PublicParking, split_address
+from myapp.cache import bump_data_version
+from myapp.summary import refresh_parking_accessibility
+from myapp import db
+
+
+def fetch_parking_summary_pandas(district_name=None, dong_name=None):
+    """
+    기존 /parking/data pandas 파이프라인 (회귀 비교 기준)
+    전체 테이블 로드 -> 노상/노외 분리 -> 주소별 카운팅 -> Gu/Dong split -> 필터
+    """
+    df_pp = pd.read_sql(select(PublicParking), db.session.connection())
+
+    selected_cols = ['parking_name', 'address', 'parking_type_name', 'total_spaces', 'current_parking', 'basic_rate']
+    parking_df = df_pp[selected_cols]
+
+    parking_nw = parking_df[parking_df['parking_type_name'].str.contains('노외 주차장')]
+
+    parking_nss = parking_df[parking_df['parking_type_name'].str.contains('노상 주차장')].copy()
+    parking_nss['total_spaces'] = parking_nss.groupby('address')['address'].transform('count')
+    parking_ns = parking_nss.drop_duplicates(subset=['address'])
+
+    parking = pd.concat([parking_nw, parking_ns], ignore_index=True)
+    parking = parking.sort_values(by='total_spaces', ascending=False).reset_index(drop=True)
+
+    parking['Area_Gu'] = parking['address'].str.split().str[0]
+    parking['Area_Dong'] = parking['address'].str.split().str[1]
+
+    parking['available_spaces'] = (parking['total_spaces'] - parking['current_parking'])
+    parking['available_spaces'] = parking['available_spaces'].astype(int)
+
+    if district_name:
+        parking = parking[parking['Area_Gu'] == district_name]
+    if dong_name is not None:
+        parking = parking[parking['Area_Dong'] == dong_name]
+
+    return parking.to_dict(orient='records')
+
+
+def _canonical(records):
+    """
+    동률(total_spaces)의 순서는 기존 quicksort 기준으로 보장되지 않으므로 행 집합으로 비교
+    """
+    return sorted(records, key=lambda r: tuple(str(r[k]) for k in sorted(r)))
+
+
+@parking_bp.cli.command('compare')
+@click.option('--district', default=None, help='비교할 자치구 (미지정 시 전체 자치구)')
+def compare(district):
+    """SQL 집계 경로와 기존 pandas 파이프라인의 /parking/data 응답 비교"""
+    areas = {(r['Area_Gu'], r['Area_Dong']) for r in fetch_parking_summary(district_name=district)}
+    cases = [(district, None)] + sorted(areas - {(None, None)}, key=str)
+
+    mismatches = 0
+    for district_name, dong_name in cases:
+        expected = fetch_parking_summary_pandas(district_name, dong_name)
+        actual = fetch_parking_summary(district_name, dong_name)
+
+        spaces = [r['total_spaces'] for r in actual]
+        if _canonical(expected) != _canonical(actual) or spaces != sorted(spaces, reverse=True):
+            mismatches += 1
+            click.echo(f'불일치: district={district_name} dong={dong_name} '
+                       f'(pandas {len(expected)}건 / sql {len(actual)}건)')
+
+    click.echo(f'비교 {len(cases)}건, 불일치 {mismatches}건')
+    if mismatches:
+        sys.exit(1)
+
+
+@parking_bp.cli.command('backfill-area')
+@click.option('--batch-size', default=1000, show_default=True, help='UPDATE 배치 크기')
+@click.option('--all', 'refresh_all', is_flag=True, help='이미 채워진 행도 다시 파싱')
+def backfill_area(batch_size, refresh_all):
+    """기존 주차장 행의 주소를 파싱해 자치구/법정동 컬럼 채우기"""
+    stmt = select(PublicParking.pp_id, PublicParking.address)
+    if not refresh_all:
+        stmt = stmt.where(PublicParking.district_name.is_(None), PublicParking.address.isnot(None))
+
+    rows = db.session.execute(stmt).all()
+
+    for start in range(0, len(rows), batch_size):
+        params = []
+        for pp_id, address in rows[start:start + batch_size]:
+            district_name, legal_dong_name = split_address(address)
+            params.append({
+                'pp_id': pp_id,
+                'district_name': district_name,
+                'legal_dong_name': legal_dong_name,
+            })
+        # 기본키 기준 ORM bulk UPDATE (executemany)
+        db.session.execute(update(PublicParking), params)
+        db.session.commit()
+
+    # 법정동이 채워졌으므로 주차 접근성 지수 재계산
+    refresh_parking_accessibility()
+    bump_data_version('public_parking')
+    click.echo(f'자치구/법정동 backfill 완료: {len(rows)}건')
+
+
+@parking_bp.cli.command('occupancy')
+@click.argument('path', required=False, type=click.Path(exists=True, dir_okay=False))
+@click.option('--stub', is_flag=True, help='파일 대신 무작위 테스트 피드 사용')
+@click.option('--interval', default=0.0, show_default=True, help='반복 주기(초), 0이면 한 번만 반영')
+@click.option('--iterations', default=0, show_default=True, help='반복 횟수 (0이면 중단할 때까지)')
+@click.option('--change-ratio', default=0.1, show_default=True, help='stub 피드: 배치마다 값이 바뀌는 주차장 비율')
+@click.option('--seed', 'seed_value', default=None, type=int, help='stub 피드 난수 시드')
+def occupancy(path, stub, interval, iterations, change_ratio, seed_value):
+    """주차 현황 피드(CSV/JSON 파일 또는 stub) 반영: 현재 주차 차량수가 바뀐 주차장만 UPDATE"""
+    if bool(path) == stub:
+        raise click.UsageError('PATH 또는 --stub 중 하나를 지정하세요.')
+
+    feed = StubOccupancyFeed(change_ratio=change_ratio, seed=seed_value) if stub else (lambda: read_occupancy_file(path))
+    state = OccupancyState()
+    count = 0
+    while True:
+        started = time.monotonic()
+        stats = state.apply(feed())
+        count += 1
+        click.echo(
+            f"[{count}] {stats['rows']:,}건 -> 변경 {stats['changed']:,} / 동일 {stats['unchanged']:,} / "
+            f"미등록 {stats['unknown']:,} | 버전 {stats['version'] or '-'} | {stats['elapsed'] * 1000:.1f}ms"
+        )
+
+        if interval <= 0 or (iterations and count >= iterations):
+            break
+        time.sleep(max(interval - (time.monotonic() - started), 0))
@@ -0,0 +1,192 @@
+import json
+import random
+import time
+from datetime import datetime
+import pandas as pd
+from sqlalchemy import select, update, bindparam
+from myapp.ingest import PARKING_CSV_COLUMNS
+from myapp.models import PublicParking, DataVersion
+from myapp import db
+
+# 실시간 주차 현황(현재 주차 차량수) 반영
+# - 피드(파일 / 서울시 OpenAPI 응답 JSON / 테스트용 stub)에서 주차장코드별 현재 주차 차량수를 배치로 받아
+#   값이 바뀐 주차장만 UPDATE (테이블 전체 재작성 / pandas 재로드 없음)
+# - 바뀐 행에는 배치 버전(occupancy_version)을 기록 -> 각 워커는 자기 버전 이후 바뀐 행만 메모리 테이블에 반영
+# - parking_occupancy 버전은 응답 캐시 키에서 제외 (cache.UNCACHED_VERSIONS)
+
+OCCUPANCY_VERSION = 'parking_occupancy'
+
+# 서울시 공영주차장 안내 정보 OpenAPI (GetParkingInfo) 필드
+OPENAPI_COLUMNS = {
+    'PKLT_CD': 'parking_code',
+    'NOW_PRK_VHCL_CNT': 'current_parking',
+    'NOW_PRK_VHCL_UPDT_TM': 'current_parking_update_time',
+}
+
+OCCUPANCY_COLUMNS = ('parking_code', 'current_parking', 'current_parking_update_time')
+
+
+def normalize_occupancy(records):
+    """
+    피드 레코드 -> {parking_code, current_parking, current_parking_update_time}
+    주차장코드 / 현재 주차 차량수가 없거나 숫자가 아닌 레코드는 제외
+    """
+    result = []
+    for record in records:
+        item = {}
+        for name, value in record.items():
+            name = str(name).strip()
+            column = OPENAPI_COLUMNS.get(name) or PARKING_CSV_COLUMNS.get(name) or name
+            if column in OCCUPANCY_COLUMNS:
+                item[column] = value
+
+        code = str(item.get('parking_code') or '').strip()
+        try:
+            current = int(float(item.get('current_parking')))
+        except (TypeError, ValueError):
+            continue
+        if not code or current < 0:
+            continue
+
+        update_time = item.get('current_parking_update_time')
+        result.append({
+            'parking_code': code,
+            'current_parking': current,
+            'current_parking_update_time': str(update_time).strip() if update_time not in (None, '') else None,
+        })
+    return result
+
+
+def read_occupancy_file(path, encoding='utf-8-sig'):
+    """
+    주차 현황 파일 읽기
+    - CSV: 한글 원본 헤더(주차장코드, 현재 주차 차량수, ...) 또는 영문 컬럼명
+    - JSON: 레코드 목록 또는 OpenAPI 응답 ({"GetParkingInfo": {"row": [...]}})
+    """
+    if str(path).lower().endswith('.json'):
+        with open(path, encoding=encoding) as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = (data.get('GetParkingInfo') or data).get('row') or []
+        return normalize_occupancy(data)
+
+    df = pd.read_csv(path, dtype=str, encoding=encoding)
+    return normalize_occupancy(df.where(df.notna(), None).to_dict(orient='records'))
+
+
+class StubOccupancyFeed:
+    """
+    테스트용 피드: 배치마다 주차장 일부(change_ratio)의 현재 주차 차량수를 무작위로 증감 (0 ~ 총 주차면)
+    """
+
+    def __init__(self, change_ratio=0.1, max_step=5, seed=None):
+        self.change_ratio = change_ratio
+        self.max_step = max_step
+        self.random = random.Random(seed)
+        self.lots = None
+
+    def _load(self):
+        rows = db.session.execute(
+            select(PublicParking.parking_code, PublicParking.total_spaces, PublicParking.current_parking)
+            .where(PublicParking.parking_code.isnot(None), PublicParking.total_spaces > 0)
+        ).all()
+        lots = {}
+        for code, total, current in rows:
+            lots[code] = [total, current or 0]
+        return lots
+
+    def __call__(self):
+        if self.lots is None:
+            self.lots = self._load()
+
+        codes = list(self.lots)
+        count = round(len(codes) * self.change_ratio)
+        update_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        records = []
+        for code in self.random.sample(codes, min(count, len(codes))):
+            lot = self.lots[code]
+            lot[1] = min(max(lot[1] + self.random.randint(-self.max_step, self.max_step), 0), lot[0])
+            records.append({
+                'parking_code': code,
+                'current_parking': lot[1],
+                'current_parking_update_time': update_time,
+            })
+        return records
+
+
+class OccupancyState:
+    """
+    피드 반영용 주차장코드 -> 현재 주차 차량수 (마지막으로 반영한 값)
+    처음 한 번만 DB에서 읽고, 이후 배치는 이 값과 비교해서 바뀐 주차장만 UPDATE
+    """
+
+    def __init__(self):
+        self.current = None
+
+    def load(self):
+        rows = db.session.execute(
+            select(PublicParking.parking_code, PublicParking.current_parking)
+            .where(PublicParking.parking_code.isnot(None))
+        ).all()
+
+        current = {}
+        for code, count in rows:
+            # 노상 주차장은 같은 코드의 행이 여러 개 -> 값이 서로 다르면 다음 배치에서 한 번 맞춰줌
+            current[code] = count if current.get(code, count) == count else False
+        self.current = current
+
+    def apply(self, records):
+        """
+        배치 반영 -> 처리 통계 dict
+        바뀐 주차장이 있을 때만 parking_occupancy 버전 증가 + UPDATE(executemany) + 한 번 commit
+        """
+        started = time.perf_counter()
+        if self.current is None:
+            self.load()
+
+        latest = {}
+        for record in records:
+            latest[record['parking_code']] = record  # 같은 배치에 같은 코드가 여러 번 오면 마지막 값
+
+        changed, unknown = [], 0
+        for code, record in latest.items():
+            if code not in self.current:
+                unknown += 1
+            elif self.current[code] is False or self.current[code] != record['current_parking']:
+                changed.append(record)
+
+        version = None
+        if changed:
+            row = db.session.get(DataVersion, OCCUPANCY_VERSION, with_for_update=True)
+            if row is None:
+                row = DataVersion(name=OCCUPANCY_VERSION, version=0)
+                db.session.add(row)
+            row.version += 1
+            row.updated_at = datetime.now()
+            version = row.version
+
+            table = PublicParking.__table__
+            stmt = (
+                update(table)
+                .where(table.c.parking_code == bindparam('b_parking_code'))
+                .values(
+                    current_parking=bindparam('b_current_parking'),
+                    current_parking_update_time=bindparam('b_current_parking_update_time'),
+                    occupancy_version=version,
+                )
+            )
+            db.session.execute(stmt, [{f'b_{name}': value for name, value in r.items()} for r in changed])
+            db.session.commit()
+
+            for record in changed:
+                self.current[record['parking_code']] = record['current_parking']
+
+        return {
+            'version': version,
+            'rows': len(records),
+            'changed': len(changed),
+            'unchanged': len(latest) - len(changed) - unknown,
+            'unknown': unknown,
+            'elapsed': time.perf_counter() - started,
+        }
@@ -1,53 +1,150 @@
-from flask import jsonify, request
-import pandas as pd
-from . import parking_bp
+import math
+from flask import request
+import numpy as np
 from sqlalchemy import select
-from myapp.models import PublicParking
+from . import parking_bp
+from .spatial import parking_index
+from myapp.models import ParkingAccessibility
+from myapp.summary import parking_accessibility_available, compute_parking_accessibility
+from myapp.cache import cache
+from myapp import analytics
+from myapp.responses import json_response, table_response, request_format, request_params
 from myapp import db
 
+NEAREST_MAX_RADIUS_M = 5000
+NEAREST_MAX_K = 50
+
+
+def parse_number(data, name, default=None, cast=float, minimum=None, maximum=None):
+    """
+    요청 body 숫자 값 검증 (없으면 default, default도 없으면 필수)
+    숫자가 아니거나 NaN/무한대, cast=int 인데 정수가 아니거나(2.7), 범위 밖이면 ValueError
+    """
+    value = data.get(name)
+    if value is None or value == '':
+        if default is None:
+            raise ValueError(f'{name} 값이 필요합니다.')
+        return default
+
+    try:
+        if isinstance(value, bool):
+            raise ValueError
+        number = float(value)
+        if not math.isfinite(number) or (cast is int and not number.is_integer()):
+            raise ValueError
+        number = cast(number)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} 값이 올바르지 않습니다: {value}')
+
+    if minimum is not None and maximum is not None:
+        if not minimum <= number <= maximum:
+            raise ValueError(f'{name} 값은 {minimum} ~ {maximum} 사이여야 합니다.')
+    elif minimum is not None and number < minimum:
+        raise ValueError(f'{name} 값은 {minimum} 이상이어야 합니다.')
+    elif maximum is not None and number > maximum:
+        raise ValueError(f'{name} 값은 {maximum} 이하여야 합니다.')
+    return number
+
 @parking_bp.route('/data', methods=['POST'])
 def parking():
-    data = request.get_json()
+    """
+    리팩토링 목적:
+    - public_parking 전체 테이블을 pd.read_sql로 로드하지 않기
+    - 필요한 6개 컬럼만 select, 지역구/법정동은 WHERE 절에서 필터링
+    - 노상 주차장 주소별 카운팅은 GROUP BY로 DB에서 처리
+    - 응답 JSON은 기존 pandas 파이프라인과 동일 (flask parking compare 로 검증)
+    - 주차장 목록은 지역별로 워커 메모리에 보관, 현재 주차 차량수/주차 가능 면수는 주차 현황 메모리 테이블 값
+      (피드 반영 후 PARKING_INDEX_CHECK_INTERVAL 안에 반영, 바뀐 행만 다시 읽음)
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return json_response({'error': '요청 body 는 JSON 객체여야 합니다.'}, 400)
     input_district_name = data.get('district')
     input_dong_name = data.get('dong')
-    # DataFrame으로 변환
-    stmt = select(PublicParking)
-    df_pp = pd.read_sql(stmt, db.session.connection())
 
-    print(f"총 레코드 수: {len(df_pp)}")
+    try:
+        result = parking_index.get().parking_summary(
+            district_name=input_district_name,
+            dong_name=input_dong_name,
+        )
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
+
+    return json_response(result)
 
-    selected_cols = ['parking_name', 'address', 'parking_type_name','total_spaces','current_parking','basic_rate'] #필요한 컬럼을 가지고 데이터 프레임 생성
-    parking_df = df_pp[selected_cols]
 
-    parking_nw = parking_df[parking_df['parking_type_name'].str.contains('노외 주차장')] 
-    parking_nw.sort_values(by='total_spaces', ascending=False).reset_index(drop=True)        # 주차장(노외) 통합 데이터 총 주차면수 순서대로       
+@parking_bp.route('/nearest', methods=['POST'])
+def nearest():
+    """
+    좌표 기준 반경 안에서 주차 가능한 가장 가까운 주차장 k곳
+    - body: lat, lng (필수), radius(m, 기본 1000, 최대 5000), k(기본 10, 최대 50), min_available(기본 1, 0이면 만차 포함)
+    - 메모리 격자 인덱스에서 조회 (DB 조회 없음, 인덱스는 주차장 데이터 버전이 바뀌면 다시 생성)
+    - 응답: 거리 오름차순, distance_m / available_spaces 포함
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return json_response({'error': '요청 body 는 JSON 객체여야 합니다.'}, 400)
 
-    parking_nss = parking_df[parking_df['parking_type_name'].str.contains('노상 주차장')] # 노상주차장은 코드 카운팅 해서 총 주차면수 정해야함
+    try:
+        lat = parse_number(data, 'lat', minimum=-90, maximum=90)
+        lng = parse_number(data, 'lng', minimum=-180, maximum=180)
+        radius = parse_number(data, 'radius', default=1000, minimum=1, maximum=NEAREST_MAX_RADIUS_M)
+        k = parse_number(data, 'k', default=10, cast=int, minimum=1, maximum=NEAREST_MAX_K)
+        min_available = parse_number(data, 'min_available', default=1, cast=int, minimum=0)
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
 
-    parking_nss['address_count'] = parking_nss.groupby('address')['address'].transform('count') # 중복되는 address를 count하여 새로운 컬럼을 생성 
+    snapshot = parking_index.get()
+    return json_response(snapshot.nearest(lat, lng, radius_m=radius, k=k, min_available=min_available))
 
-    parking_nss['total_spaces'] = parking_nss['address_count'] #위 새롭게 생성된 컬럼을 total_spaces로 바꿔줌
-    parking_nss.drop(columns='address_count',inplace=True)
-    parking_ns = parking_nss.copy()
 
-    parking_ns.drop_duplicates(subset=['address'], inplace=True)
+def fetch_parking_accessibility(district_name=None):
+    """
+    저장된 법정동별 주차 접근성 지수 (테이블이 비어 있으면 주차장/집계 테이블에서 바로 계산)
+    """
+    if not parking_accessibility_available():
+        return compute_parking_accessibility(district_name)
 
-    parking_ns = parking_ns.sort_values(by='total_spaces', ascending=False).reset_index(drop=True)  # 주차장(노상) 통합 데이터 총 주차면수 순서대로
+    stmt = select(
+        ParkingAccessibility.district_name,
+        ParkingAccessibility.legal_dong_name,
+        ParkingAccessibility.parking_lot_count,
+        ParkingAccessibility.parking_capacity,
+        ParkingAccessibility.transaction_count,
+        ParkingAccessibility.avg_price_per_sqm,
+        ParkingAccessibility.accessibility_index,
+    )
+    if district_name:
+        stmt = stmt.where(ParkingAccessibility.district_name == district_name)
 
-    parking = pd.concat([parking_nw, parking_ns], ignore_index=True)
-    parking = parking.sort_values(by='total_spaces', ascending=False).reset_index(drop=True)    # 주차장(노외, 노상) 통합 데이터 총 주차면수 순서대로
+    rows = db.session.execute(stmt).fetchall()
+    return {
+        "district_name": analytics.column(rows, 0),
+        "legal_dong_name": analytics.column(rows, 1),
+        "parking_lot_count": analytics.column(rows, 2, np.int64),
+        "parking_capacity": analytics.column(rows, 3, np.int64),
+        "transaction_count": analytics.column(rows, 4, np.int64),
+        "avg_price_per_sqm": analytics.column(rows, 5, float),
+        "accessibility_index": analytics.column(rows, 6, float),
+    }
 
-    parking['Area_Gu'] = parking['address'].str.split().str[0]
-    parking['Area_Dong'] = parking['address'].str.split().str[1]        # address 주소를 split해서 Gu, Dong별로 컬럼을 생성해줌
 
-    parking['available_spaces'] = (parking['total_spaces'] - parking['current_parking'])    # 총 주차면수 - 주차차량수 = 주차가능한 공간을 컬럼으로 생성 
-    parking['available_spaces'] = parking['available_spaces'].astype(int)                   # 실수형 컬럼을 정수형으로 변환함
-    
-    result = parking.copy()
+@parking_bp.route('/accessibility', methods=['GET', 'POST'])
+@cache.cached
+def accessibility():
+    """
+    법정동별 주차 접근성 지수(PAI) = 총 주차면 / 거래 수 ("주차 가성비" 산포도: 평단가 x 지수)
+    - body(POST) / 쿼리스트링(GET): district, format(records | columnar)
+    - 주차장/거래 원본을 매번 읽지 않고 미리 계산해 둔 parking_accessibility 테이블 조회
+      (flask summary refresh / 주차장 적재 시 재계산)
+    - 응답: 지수 내림차순 accessibility_rank (조회 범위 안에서 계산)
+    """
+    data = request_params()
 
-    if input_dong_name is not None:
-        result = result[result['Area_Dong'] == input_dong_name]
-    
-    result=result.to_dict(orient='records')
+    try:
+        fmt = request_format(data, allowed=('records', 'columnar'))
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
 
-    return jsonify(result)
+    per_dong = fetch_parking_accessibility(district_name=data.get('district'))
+    return table_response(analytics.rank_parking_accessibility(per_dong), fmt)
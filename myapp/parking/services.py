@@ -0,0 +1,144 @@
+from sqlalchemy import select, func, case, and_
+from myapp.models import PublicParking
+from myapp import db
+
+OFF_STREET_TYPE = '노외 주차장'
+ON_STREET_TYPE = '노상 주차장'
+
+
+def build_area_conditions(district_name=None, dong_name=None):
+    """
+    지역구/법정동 WHERE 조건 (주소에서 파싱해 저장한 인덱스 컬럼 동등 비교)
+    법정동은 기존 pandas 파이프라인처럼 None 일 때만 필터 생략 (빈 문자열이면 일치하는 행 없음)
+    """
+    conditions = []
+
+    if district_name:
+        conditions.append(PublicParking.district_name == district_name)
+
+    if dong_name is not None:
+        conditions.append(PublicParking.legal_dong_name == dong_name)
+
+    return conditions
+
+
+def build_parking_capacity_stmt():
+    """
+    자치구 | 법정동별 주차장 수 + 총 주차면 (/parking/data 와 같은 기준)
+    - 노외 주차장: 행마다 1곳, 총 주차면 컬럼 합계
+    - 노상 주차장: 주소별 1곳, 행 수 = 주차면수
+    """
+    off_street = PublicParking.parking_type_name.contains(OFF_STREET_TYPE)
+    on_street = and_(PublicParking.parking_type_name.contains(ON_STREET_TYPE), PublicParking.address.isnot(None))
+
+    return (
+        select(
+            PublicParking.district_name,
+            PublicParking.legal_dong_name,
+            (
+                func.count(case((off_street, 1)))
+                + func.count(func.distinct(case((on_street, PublicParking.address))))
+            ).label('parking_lot_count'),
+            (
+                func.coalesce(func.sum(case((off_street, PublicParking.total_spaces))), 0)
+                + func.count(case((on_street, 1)))
+            ).label('parking_capacity'),
+        )
+        .where(PublicParking.district_name.isnot(None), PublicParking.legal_dong_name.isnot(None))
+        .group_by(PublicParking.district_name, PublicParking.legal_dong_name)
+    )
+
+
+def fetch_parking_lots(district_name=None, dong_name=None):
+    """
+    /parking/data 주차장 목록 (주차 가능 면수 계산 전, 주차 현황 반영용 pp_id 포함)
+    - 필요한 컬럼만 select
+    - 노외 주차장: 행 그대로 사용
+    - 노상 주차장: 주소별 GROUP BY, 총 주차면수 = 같은 주소의 행 수, 나머지 값은 주소별 첫 행
+    - 총 주차면수 내림차순 정렬 (동률이면 노외 -> 노상, 각각 테이블 순서)
+    """
+    conditions = build_area_conditions(district_name, dong_name)
+
+    # Task 1: 노외 주차장
+    off_street_stmt = (
+        select(
+            PublicParking.pp_id,
+            PublicParking.parking_name,
+            PublicParking.address,
+            PublicParking.parking_type_name,
+            PublicParking.total_spaces,
+            PublicParking.current_parking,
+            PublicParking.basic_rate,
+            PublicParking.district_name.label('Area_Gu'),
+            PublicParking.legal_dong_name.label('Area_Dong'),
+        )
+        .where(PublicParking.parking_type_name.contains(OFF_STREET_TYPE), *conditions)
+        .order_by(PublicParking.pp_id)
+    )
+
+    # Task 2: 노상 주차장 주소별 카운팅
+    on_street_group = (
+        select(
+            func.min(PublicParking.pp_id).label('first_id'),
+            func.count().label('total_spaces'),
+        )
+        .where(
+            PublicParking.parking_type_name.contains(ON_STREET_TYPE),
+            PublicParking.address.isnot(None),
+            *conditions,
+        )
+        .group_by(PublicParking.address)
+        .subquery()
+    )
+
+    on_street_stmt = (
+        select(
+            PublicParking.pp_id,
+            PublicParking.parking_name,
+            PublicParking.address,
+            PublicParking.parking_type_name,
+            on_street_group.c.total_spaces,
+            PublicParking.current_parking,
+            PublicParking.basic_rate,
+            PublicParking.district_name.label('Area_Gu'),
+            PublicParking.legal_dong_name.label('Area_Dong'),
+        )
+        .join(on_street_group, PublicParking.pp_id == on_street_group.c.first_id)
+        .order_by(on_street_group.c.first_id)
+    )
+
+    rows = (
+        db.session.execute(off_street_stmt).mappings().all()
+        + db.session.execute(on_street_stmt).mappings().all()
+    )
+    lots = [dict(r) for r in rows]
+
+    # Task 4: 총 주차면수 내림차순 (stable sort)
+    lots.sort(key=lambda item: (item['total_spaces'] is None, -(item['total_spaces'] or 0)))
+    return lots
+
+
+def with_available_spaces(lots, current_parking=None):
+    """
+    Task 3: 주차 가능 면수 = 총 주차면수 - 현재 주차 차량수
+    current_parking: pp_id -> 현재 주차 차량수 함수 (주차 현황 메모리 테이블), 없으면 조회 시점 DB 값
+    """
+    result = []
+    for lot in lots:
+        item = {name: value for name, value in lot.items() if name != 'pp_id'}
+        if current_parking is not None:
+            item['current_parking'] = current_parking(lot['pp_id'])
+        item['available_spaces'] = (
+            item['total_spaces'] - item['current_parking']
+            if item['total_spaces'] is not None and item['current_parking'] is not None
+            else None
+        )
+        result.append(item)
+    return result
+
+
+def fetch_parking_summary(district_name=None, dong_name=None):
+    """
+    /parking/data 응답 데이터 조회 (DB 값 기준, flask parking compare 비교 대상)
+    """
+    return with_available_spaces(fetch_parking_lots(district_name, dong_name))
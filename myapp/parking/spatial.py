@@ -0,0 +1,344 @@
+import logging
+import math
+import threading
+import time
+import numpy as np
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from myapp.cache import SimpleCacheBackend
+from myapp.models import PublicParking, DataVersion
+from myapp.parking.occupancy import OCCUPANCY_VERSION
+from myapp.parking.services import fetch_parking_lots, with_available_spaces
+from myapp import db
+
+# 주차장 좌표(lat/lng) 기반 근접 검색
+# - 격자(grid) 인덱스: 좌표를 일정 크기(m) 셀로 나누고 셀 번호 순으로 정렬한 배열
+# - 조회: 반경이 걸치는 셀 구간만 searchsorted 로 잘라서 후보 추출 -> 후보만 거리 계산
+# - 인덱스는 프로세스(워커)마다 메모리에 보관, public_parking 데이터 버전이 바뀌면 다시 생성
+# - 주차 현황(parking_occupancy 버전)만 바뀌면 바뀐 행만 읽어서 메모리 테이블 갱신 (인덱스 유지)
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE = 111320.0  # 위도 1도 거리(m), 경도는 cos(위도) 배
+
+
+def haversine_m(lat, lng, lats, lngs):
+    """
+    한 지점 -> 여러 지점 대원 거리(m)
+    """
+    lat, lng = np.radians(lat), np.radians(lng)
+    lats, lngs = np.radians(lats), np.radians(lngs)
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lngs - lng) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GridIndex:
+    """
+    좌표 격자 인덱스 (좌표가 없거나 0인 점은 제외)
+    셀 키 = 행 번호 * 너비 + 열 번호 -> 같은 행의 연속된 열은 정렬 배열에서도 연속 구간
+    """
+
+    def __init__(self, lat, lng, cell_m=500):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        self.cell_m = float(cell_m)
+
+        valid = ~np.isnan(self.lat) & ~np.isnan(self.lng) & (self.lat != 0) & (self.lng != 0)
+        points = np.flatnonzero(valid)
+        # 경도 방향 거리 보정은 데이터 중심 위도 기준 (서울 범위에서는 오차 무시 가능)
+        self.cos_lat = float(np.cos(np.radians(self.lat[points].mean()))) if len(points) else 1.0
+
+        rows, cols = self._cells(self.lat[points], self.lng[points])
+        self.row_min, self.row_max = (int(rows.min()), int(rows.max())) if len(points) else (0, -1)
+        self.col_min, self.col_max = (int(cols.min()), int(cols.max())) if len(points) else (0, -1)
+        self.width = self.col_max - self.col_min + 1
+
+        keys = (rows - self.row_min) * self.width + (cols - self.col_min)
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.points = points[order]
+
+    def __len__(self):
+        return len(self.points)
+
+    def _cells(self, lat, lng):
+        rows = np.floor(np.asarray(lat) * METERS_PER_DEGREE / self.cell_m).astype(np.int64)
+        cols = np.floor(np.asarray(lng) * METERS_PER_DEGREE * self.cos_lat / self.cell_m).astype(np.int64)
+        return rows, cols
+
+    def candidates(self, lat, lng, radius_m):
+        """
+        반경이 걸치는 셀들의 점 번호 (반경 밖 점 포함, 거리 계산 전 후보)
+        """
+        if not len(self.points):
+            return self.points
+
+        # 한 지점이라 numpy 대신 math 로 계산 (조회당 오버헤드 감소)
+        row = math.floor(lat * METERS_PER_DEGREE / self.cell_m)
+        col = math.floor(lng * METERS_PER_DEGREE * self.cos_lat / self.cell_m)
+        # 경도 방향 셀 폭은 위도와 같은 m 단위로 맞춰 두었으므로 행/열 모두 같은 칸 수
+        span = math.ceil(radius_m / self.cell_m)
+
+        first_row, last_row = max(row - span, self.row_min), min(row + span, self.row_max)
+        first_col, last_col = max(col - span, self.col_min), min(col + span, self.col_max)
+        if first_row > last_row or first_col > last_col:
+            return self.points[:0]
+
+        base = (np.arange(first_row, last_row + 1) - self.row_min) * self.width
+        lo = np.searchsorted(self.keys, base + (first_col - self.col_min), side='left')
+        hi = np.searchsorted(self.keys, base + (last_col - self.col_min), side='right')
+        return np.concatenate([self.points[a:b] for a, b in zip(lo, hi) if b > a] or [self.points[:0]])
+
+    def query(self, lat, lng, radius_m, k, mask=None):
+        """
+        반경 radius_m 안의 가까운 점 k개 -> (점 번호 배열, 거리(m) 배열), 거리 오름차순
+        mask: 점 번호별 사용 가능 여부 (bool 배열)
+        """
+        candidates = self.candidates(lat, lng, radius_m)
+        if mask is not None:
+            candidates = candidates[mask[candidates]]
+
+        distances = haversine_m(lat, lng, self.lat[candidates], self.lng[candidates])
+        inside = distances <= radius_m
+        candidates, distances = candidates[inside], distances[inside]
+
+        # 전체 정렬 대신 k개만 골라서 정렬
+        if len(candidates) > k:
+            nearest = np.argpartition(distances, k - 1)[:k]
+            candidates, distances = candidates[nearest], distances[nearest]
+        order = np.argsort(distances, kind='stable')
+        return candidates[order], distances[order]
+
+
+def brute_force_query(lat, lng, lats, lngs, radius_m, k, mask=None):
+    """
+    인덱스 없이 전체 점 거리 계산 (검증/비교용)
+    """
+    distances = haversine_m(lat, lng, lats, lngs)
+    ok = (distances <= radius_m) & ~np.isnan(distances) & (lats != 0) & (lngs != 0)
+    if mask is not None:
+        ok &= mask
+    points = np.flatnonzero(ok)
+    order = np.argsort(distances[points], kind='stable')[:k]
+    return points[order], distances[points][order]
+
+
+class ParkingSnapshot:
+    """
+    인덱스 생성 시점의 주차장 데이터 (응답 컬럼 + 주차 현황 메모리 테이블)
+    - total / current / available: pp_id 순서 배열, 주차 현황 피드가 반영되면 바뀐 행만 갱신
+    - 지역별 /parking/data 주차장 목록은 한 번 조회 후 보관 (현재 주차 차량수만 메모리 값으로 덮어씀)
+    """
+
+    COLUMNS = (
+        'pp_id', 'parking_name', 'address', 'parking_type_name', 'total_spaces', 'current_parking', 'basic_rate',
+        'lat', 'lng',
+    )
+
+    def __init__(self, rows, cell_m):
+        self.records = [dict(zip(self.COLUMNS, row)) for row in rows]
+        self.position = {r['pp_id']: i for i, r in enumerate(self.records)}
+        self.total = np.array([np.nan if r['total_spaces'] is None else r['total_spaces'] for r in self.records], dtype=np.float64)
+        self.current = np.array([np.nan if r['current_parking'] is None else r['current_parking'] for r in self.records], dtype=np.float64)
+        self.available = self.total - self.current  # 총 주차면 / 현재 주차 차량수 중 하나라도 없으면 NaN
+        self.index = GridIndex(
+            [np.nan if r['lat'] is None else r['lat'] for r in self.records],
+            [np.nan if r['lng'] is None else r['lng'] for r in self.records],
+            cell_m=cell_m,
+        )
+        self.lots = SimpleCacheBackend(maxsize=512, ttl=float('inf'))
+
+    def apply_occupancy(self, rows):
+        """
+        주차 현황 변경분 [(pp_id, 현재 주차 차량수), ...] 반영 -> 반영한 행 수
+        """
+        positions, values = [], []
+        for pp_id, current in rows:
+            position = self.position.get(pp_id)
+            if position is not None:
+                positions.append(position)
+                values.append(np.nan if current is None else current)
+
+        if positions:
+            positions = np.array(positions, dtype=np.int64)
+            self.current[positions] = values
+            self.available[positions] = self.total[positions] - self.current[positions]
+        return len(positions)
+
+    def current_parking(self, pp_id):
+        current = self.current[self.position[pp_id]]
+        return None if np.isnan(current) else int(current)
+
+    def parking_summary(self, district_name=None, dong_name=None):
+        """
+        /parking/data 응답 (주차장 목록은 지역별로 한 번만 조회, 주차 가능 면수는 메모리 테이블 기준)
+        district_name / dong_name: 문자열 또는 None (캐시 키로 사용, 아니면 ValueError)
+        """
+        for name, value in (('district', district_name), ('dong', dong_name)):
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f'{name} 값은 문자열이어야 합니다.')
+        key = (district_name, dong_name)
+        lots = self.lots.get(key)
+        if lots is None:
+            lots = fetch_parking_lots(district_name, dong_name)
+            self.lots.set(key, lots)
+        return with_available_spaces(lots, self.current_parking)
+
+    def nearest(self, lat, lng, radius_m=1000, k=10, min_available=1):
+        """
+        반경 안에서 주차 가능 면수가 min_available 이상인 가까운 주차장 k곳
+        """
+        mask = None
+        if min_available > 0:
+            with np.errstate(invalid='ignore'):
+                mask = self.available >= min_available
+
+        points, distances = self.index.query(lat, lng, radius_m, k, mask=mask)
+
+        result = []
+        for point, distance in zip(points.tolist(), distances.tolist()):
+            item = dict(self.records[point])
+            current, available = self.current[point], self.available[point]
+            item['current_parking'] = None if np.isnan(current) else int(current)
+            item['available_spaces'] = None if np.isnan(available) else int(available)
+            item['distance_m'] = round(distance, 1)
+            result.append(item)
+        return result
+
+
+class ParkingIndex:
+    """
+    주차장 근접 검색 인덱스 + 주차 현황 메모리 테이블 확장
+    - PARKING_INDEX_CELL_M: 격자 셀 크기(m)
+    - PARKING_INDEX_CHECK_INTERVAL: 데이터 버전 확인 주기(초)
+      public_parking 버전이 바뀌면 다시 생성, parking_occupancy 버전만 바뀌면 바뀐 행만 반영
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PARKING_INDEX_CELL_M', 500)
+        app.config.setdefault('PARKING_INDEX_CHECK_INTERVAL', 5)
+        app.extensions['parking_index'] = {
+            'lock': threading.Lock(),
+            'build_lock': threading.Lock(),
+            'snapshot': None,
+            'version': None,
+            'occupancy_version': None,
+            'checked_at': 0.0,
+        }
+
+    @property
+    def _state(self):
+        return current_app.extensions['parking_index']
+
+    @staticmethod
+    def _data_versions():
+        """
+        (public_parking 버전, parking_occupancy 버전)
+        """
+        rows = dict(db.session.execute(
+            select(DataVersion.name, DataVersion.version)
+            .where(DataVersion.name.in_(('public_parking', OCCUPANCY_VERSION)))
+        ).all())
+        return rows.get('public_parking'), rows.get(OCCUPANCY_VERSION) or 0
+
+    def build(self):
+        """
+        public_parking 전체 좌표/주차 현황 로드 -> 인덱스 생성 (현재 앱 상태에 저장)
+        """
+        state = self._state
+        started = time.perf_counter()
+        # 버전을 먼저 읽음 -> 로드 중에 반영된 주차 현황은 다음 확인 때 한 번 더 읽을 뿐 (같은 값 덮어쓰기)
+        version, occupancy_version = self._data_versions()
+        rows = db.session.execute(
+            select(*(getattr(PublicParking, name) for name in ParkingSnapshot.COLUMNS)).order_by(PublicParking.pp_id)
+        ).all()
+        snapshot = ParkingSnapshot(rows, current_app.config['PARKING_INDEX_CELL_M'])
+
+        with state['lock']:
+            state['snapshot'] = snapshot
+            state['version'] = version
+            state['occupancy_version'] = occupancy_version
+            state['checked_at'] = time.monotonic()
+
+        logger.info('주차장 인덱스 생성: %d곳 (좌표 %d곳), %.1fms',
+                    len(rows), len(snapshot.index), (time.perf_counter() - started) * 1000)
+        return snapshot
+
+    def refresh_occupancy(self, snapshot, occupancy_version):
+        """
+        마지막으로 반영한 버전 이후 주차 현황이 바뀐 행만 읽어서 메모리 테이블에 반영
+        - 조회는 lock 밖에서 하고, lock 은 메모리 테이블 갱신 + 버전 기록에만 사용
+        - 조회하는 동안 다른 스레드가 먼저 반영했거나 인덱스가 다시 생성되었으면 읽은 행은 버림
+          (먼저 반영한 쪽이 더 최신 값일 수 있으므로 덮어쓰지 않음, 남은 변경분은 다음 확인 때 반영)
+        """
+        state = self._state
+        started = time.perf_counter()
+        with state['lock']:
+            seen = state['occupancy_version']
+            if state['snapshot'] is not snapshot or seen >= occupancy_version:
+                return
+
+        rows = db.session.execute(
+            select(PublicParking.pp_id, PublicParking.current_parking)
+            .where(PublicParking.occupancy_version > seen)
+        ).all()
+
+        with state['lock']:
+            if state['snapshot'] is not snapshot or state['occupancy_version'] != seen:
+                return
+            applied = snapshot.apply_occupancy(rows)
+            state['occupancy_version'] = occupancy_version
+
+        logger.debug('주차 현황 반영: 버전 %s -> %s, %d행, %.1fms',
+                     seen, occupancy_version, applied, (time.perf_counter() - started) * 1000)
+
+    def warm(self):
+        """
+        서버 시작 시 미리 생성 (테이블이 아직 없으면 첫 조회 때 생성)
+        """
+        try:
+            self.build()
+        except SQLAlchemyError:
+            db.session.rollback()
+            logger.warning('주차장 인덱스를 미리 만들지 못했습니다. 첫 조회 때 생성합니다.', exc_info=True)
+
+    def get(self):
+        """
+        현재 데이터 버전의 인덱스 (확인 주기마다 버전 비교)
+        """
+        state = self._state
+        snapshot = state['snapshot']
+        now = time.monotonic()
+        if snapshot is not None and now - state['checked_at'] < current_app.config['PARKING_INDEX_CHECK_INTERVAL']:
+            return snapshot
+
+        version, occupancy_version = self._data_versions()
+        if snapshot is None or version != state['version']:
+            # 다시 생성은 한 스레드만 (기다린 스레드는 먼저 만든 인덱스가 같은 버전이면 그대로 사용)
+            with state['build_lock']:
+                if state['snapshot'] is not None and state['version'] == version:
+                    return state['snapshot']
+                return self.build()
+
+        self.refresh_occupancy(snapshot, occupancy_version)
+        state['checked_at'] = now
+        return snapshot
+
+    def stats(self):
+        state = self._state
+        snapshot = state['snapshot']
+        return {
+            'version': state['version'],
+            'occupancy_version': state['occupancy_version'],
+            'parkings': len(snapshot.records) if snapshot else 0,
+            'indexed': len(snapshot.index) if snapshot else 0,
+        }
+
+
+parking_index = ParkingIndex()
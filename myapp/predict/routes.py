@@ -1,14 +1,224 @@
-from flask import render_template, jsonify, request
-import pandas as pd
+from flask import render_template
+import numpy as np
 from . import predict_bp
 from sqlalchemy import select, func, and_
-from myapp.models import RealEstateTransaction
+from myapp.models import RealEstateTransaction, TransactionYearlySummary, DongYearlyChange, DongChange
+from myapp.summary import summary_available, dong_changes_available, avg_price_per_sqm
+from myapp.cache import cache
+from myapp.snapshot import transaction_snapshot
+from myapp.lookup import decode_lookup_codes, name_condition
+from myapp import analytics
+from myapp.responses import (
+    json_response, table_response, request_format, request_params, request_text, request_int,
+)
 from myapp import db
+
+def build_yearly_avg_price_by_dong_stmt(
+    district_name=None,
+    legal_dong_name=None,
+    building_use=None,
+    amount=None,
+):
+    """
+    지역구 | 법정동 | 연도별 평균 평단가 + 거래 수 집계 SQL
+    """
+    conditions = [
+        RealEstateTransaction.building_area.isnot(None),
+        RealEstateTransaction.building_area > 0,
+        RealEstateTransaction.amount.isnot(None),
+    ]
+
+    if amount is not None and str(amount).strip() != "":
+        conditions.append(RealEstateTransaction.amount < int(amount))
+
+    if building_use:
+        conditions.append(name_condition(RealEstateTransaction, 'building_use', building_use))
+
+    if district_name:
+        conditions.append(name_condition(RealEstateTransaction, 'district_name', district_name))
+
+    if legal_dong_name:
+        conditions.append(name_condition(RealEstateTransaction, 'legal_dong_name', legal_dong_name))
+
+    # DB에서 컬럼들 선택적으로 가져오기 + 평단가 컬럼 "avg_price_per_sqm" 계산 및 생성
+    # 자치구/법정동은 코드로 그룹핑한 뒤 참조 테이블에서 이름 복원
+    stmt = decode_lookup_codes(
+        select(
+            RealEstateTransaction.district_id,
+            RealEstateTransaction.legal_dong_id,
+            RealEstateTransaction.reception_year,
+            func.avg(
+                (RealEstateTransaction.amount * 10000) / RealEstateTransaction.building_area
+            ).label("avg_price_per_sqm"),
+            func.count().label("transaction_count"),
+        )
+        .where(and_(*conditions))
+        # 지역구 | 법정동 | 연도 별 그룹핑
+        .group_by(
+            RealEstateTransaction.district_id,
+            RealEstateTransaction.legal_dong_id,
+            RealEstateTransaction.reception_year,
+        )
+    )
+    # 지역구 | 법정동 | 연도 별 정렬 (복원한 이름 기준)
+    return stmt.order_by(
+        stmt.selected_columns.legal_dong_name,
+        stmt.selected_columns.district_name,
+        stmt.selected_columns.reception_year.nulls_last(),
+    )
+
+def build_yearly_avg_price_by_dong_summary_stmt(
+    district_name=None,
+    legal_dong_name=None,
+    building_use=None,
+):
+    """
+    지역구 | 법정동 | 연도별 평균 평단가 + 거래 수 (집계 테이블 기준)
+    금액 조건은 집계 키에 없으므로 금액 필터가 없을 때만 사용
+    """
+    conditions = [
+        TransactionYearlySummary.price_per_sqm_count > 0,
+    ]
+
+    if building_use:
+        conditions.append(TransactionYearlySummary.building_use == building_use)
+
+    if district_name:
+        conditions.append(TransactionYearlySummary.district_name == district_name)
+
+    if legal_dong_name:
+        conditions.append(TransactionYearlySummary.legal_dong_name == legal_dong_name)
+
+    # 원본 쿼리와 동일하게 평단가 계산 가능한 거래만 카운트
+    return (
+        select(
+            TransactionYearlySummary.district_name,
+            TransactionYearlySummary.legal_dong_name,
+            TransactionYearlySummary.reception_year,
+            avg_price_per_sqm().label("avg_price_per_sqm"),
+            func.sum(TransactionYearlySummary.price_per_sqm_count).label("transaction_count"),
+        )
+        .where(and_(*conditions))
+        .group_by(
+            TransactionYearlySummary.district_name,
+            TransactionYearlySummary.legal_dong_name,
+            TransactionYearlySummary.reception_year,
+        )
+        .order_by(
+            TransactionYearlySummary.legal_dong_name,
+            TransactionYearlySummary.district_name,
+            TransactionYearlySummary.reception_year.nulls_last(),
+        )
+    )
+
+def build_dong_yearly_change_stmt(district_name=None, legal_dong_name=None):
+    """
+    법정동 | 연도별 평단가 + 연도/전체 상승률 (법정동 상승률 테이블 기준, 건물용도/금액 필터 없을 때)
+    법정동 키가 NULL인 행은 dong_change 와 조인되지 않아 전체 상승률/최근 평단가가 NULL
+    """
+    conditions = []
+    if district_name:
+        conditions.append(DongYearlyChange.district_name == district_name)
+    if legal_dong_name:
+        conditions.append(DongYearlyChange.legal_dong_name == legal_dong_name)
+
+    return (
+        select(
+            DongYearlyChange.district_name,
+            DongYearlyChange.legal_dong_name,
+            DongYearlyChange.reception_year,
+            DongYearlyChange.avg_price_per_sqm,
+            DongYearlyChange.transaction_count,
+            DongYearlyChange.yoy_change_rate,
+            DongChange.total_change_rate,
+            DongChange.first_price,
+            DongChange.last_price,
+        )
+        .outerjoin(DongChange, and_(
+            DongChange.district_name == DongYearlyChange.district_name,
+            DongChange.legal_dong_name == DongYearlyChange.legal_dong_name,
+        ))
+        .where(and_(*conditions))
+        .order_by(
+            DongYearlyChange.legal_dong_name,
+            DongYearlyChange.district_name,
+            DongYearlyChange.reception_year.nulls_last(),
+        )
+    )
+
+def build_dong_change_summary_stmt(district_name=None):
+    """
+    법정동당 한 행 (법정동 상승률 테이블 기준, build_dong_change_stmt 와 같은 컬럼)
+    """
+    stmt = select(
+        DongChange.district_name,
+        DongChange.legal_dong_name,
+        DongChange.first_price,
+        DongChange.last_price,
+        DongChange.transaction_count,
+    )
+    if district_name:
+        stmt = stmt.where(DongChange.district_name == district_name)
+    return stmt
+
+def fetch_dong_yearly_changes(district_name=None, legal_dong_name=None):
+    """
+    저장된 법정동 상승률 -> analytics.dong_yearly_changes 와 같은 컬럼 배열
+    """
+    rows = db.session.execute(build_dong_yearly_change_stmt(district_name, legal_dong_name)).fetchall()
+    return {
+        "district_name": analytics.column(rows, 0),
+        "legal_dong_name": analytics.column(rows, 1),
+        "reception_year": analytics.column(rows, 2, np.int64),
+        "avg_price_per_sqm": analytics.column(rows, 3, float),
+        "transaction_count": analytics.column(rows, 4, np.int64),
+        "yoy_change_rate": analytics.column(rows, 5, float),
+        "total_change_rate": analytics.column(rows, 6, float),
+        "first_price": analytics.column(rows, 7, float),
+        "last_price": analytics.column(rows, 8, float),
+    }
+
+def build_dong_change_stmt(yearly_stmt):
+    """
+    법정동 | 연도별 집계 SQL -> 법정동당 한 행 (최초/최근 연도 평단가 + 거래 수 합계)
+    최초/최근 평단가는 윈도 함수(first_value)로 계산, 평단가가 NULL인 연도는 건너뜀
+    접수연도가 NULL인 그룹은 가장 늦은 연도로 취급 (analytics.sort_order / 스냅샷과 같은 기준)
+    """
+    yearly = yearly_stmt.order_by(None).subquery()
+    partition = (yearly.c.district_name, yearly.c.legal_dong_name)
+    missing_price = yearly.c.avg_price_per_sqm.is_(None)
+
+    per_year = select(
+        yearly.c.district_name,
+        yearly.c.legal_dong_name,
+        yearly.c.transaction_count,
+        func.first_value(yearly.c.avg_price_per_sqm).over(
+            partition_by=partition,
+            order_by=(missing_price, yearly.c.reception_year.nulls_last()),
+        ).label("first_price"),
+        func.first_value(yearly.c.avg_price_per_sqm).over(
+            partition_by=partition,
+            order_by=(missing_price, yearly.c.reception_year.desc().nulls_first()),
+        ).label("last_price"),
+    ).subquery()
+
+    return (
+        select(
+            per_year.c.district_name,
+            per_year.c.legal_dong_name,
+            func.max(per_year.c.first_price).label("first_price"),
+            func.max(per_year.c.last_price).label("last_price"),
+            func.sum(per_year.c.transaction_count).label("transaction_count"),
+        )
+        .group_by(per_year.c.district_name, per_year.c.legal_dong_name)
+    )
+
 @predict_bp.route('/', methods=['GET'])
 def predict():
     return render_template('predict/predict.html')
 
-@predict_bp.route('/location', methods=['POST'])
+@predict_bp.route('/location', methods=['GET', 'POST'])
+@cache.cached
 def predict_by_loaction():
 
     """
@@ -21,17 +231,23 @@ def predict_by_loaction():
             (1.70 − 0.24) / 1.70 × 100 ≈ 85.9% 성능 개선
     """
     
-    # silent=True 가 없으면 body 값이 비어있거나 JSON이 아니면 에러가 날 수 있어서 명시
-    data = request.get_json(silent=True) or {}
+    # GET 은 쿼리스트링, POST 는 JSON body (body 값이 비어있거나 JSON이 아니면 빈 dict)
+    data = request_params()
 
 
     # input data 예시 "지역구" = 도봉구, "법정동" = 방학동 | "법정동" 데이터는 프론트로 부터 받지 않을 수도 있음.
-    input_district_name = data.get('district')
-    input_legal_dong_name = data.get('dong')
-    input_building_use = data.get('building_type')
-    input_amount = data.get('amount')
+    # 응답 형식: records(기본) | columnar | pivot (법정동 × 연도, 법정동별 랭킹/합계 포함)
+    # 필터는 문자열, 금액은 정수만 허용 (아니면 400)
+    try:
+        input_district_name = request_text(data, 'district')
+        input_legal_dong_name = request_text(data, 'dong')
+        input_building_use = request_text(data, 'building_type')
+        input_amount = request_int(data, 'amount')
+        fmt = request_format(data)
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
     
-    # Task 1: 요청 값에 따라 필요한 컬럼만 선별해서 DataFame 로드
+    # Task 1: 요청 값에 따라 필요한 컬럼만 선별해서 로드
     # 함수 정의할 떄 None으로 초기화해도, 값은 덮어 씌워 지지 않음. 호출할 때 값을 넘기면 넘긴 값 그대로 초기화 됨.
     # But, 함수를 호출할때, fetch_yearly_avg_price_by_dong(district_name=None) 처럼 넘기면 값은 무조건 None으로 넘어옴
     def fetch_yearly_avg_price_by_dong(
@@ -40,143 +256,142 @@ def predict_by_loaction():
         building_use=None,
         amount=None,
     ):
-        conditions = [
-            RealEstateTransaction.building_area.isnot(None),
-            RealEstateTransaction.building_area > 0,
-            RealEstateTransaction.amount.isnot(None),
-        ]
-
-        if amount is not None and str(amount).strip() != "":
-            conditions.append(RealEstateTransaction.amount < int(amount))
-
-        if building_use:
-            conditions.append(RealEstateTransaction.building_use == building_use)
-
-        if district_name:
-            conditions.append(RealEstateTransaction.district_name == district_name)
-
-        if legal_dong_name:
-            conditions.append(RealEstateTransaction.legal_dong_name == legal_dong_name)
-
-        # DB에서 컬럼들 선택적으로 가져오기 + 평단가 컬럼 "avg_price_per_sqm" 계산 및 생성
-        stmt = (
-            select(
-                RealEstateTransaction.district_name,
-                RealEstateTransaction.legal_dong_name,
-                RealEstateTransaction.reception_year,
-                func.avg(
-                    (RealEstateTransaction.amount * 10000) / RealEstateTransaction.building_area
-                ).label("avg_price_per_sqm"),
-                func.count().label("transaction_count"),
+        # 실거래가 스냅샷이 있으면 금액 필터까지 메모리에서 집계
+        snapshot = transaction_snapshot.get()
+        if snapshot is not None:
+            return snapshot.yearly_by_dong(
+                district_name=district_name,
+                legal_dong_name=legal_dong_name,
+                building_use=building_use,
+                amount=amount,
             )
-            .where(and_(*conditions))
-            # 지역구 | 법정동 | 연도 별 그룹핑
-            .group_by(
-                RealEstateTransaction.district_name,
-                RealEstateTransaction.legal_dong_name,
-                RealEstateTransaction.reception_year,
+
+        has_amount = amount is not None and str(amount).strip() != ""
+
+        if not has_amount and summary_available():
+            stmt = build_yearly_avg_price_by_dong_summary_stmt(
+                district_name=district_name,
+                legal_dong_name=legal_dong_name,
+                building_use=building_use,
             )
-            # 지역구 | 법정동 | 연도 별 정렬
-            .order_by(
-                RealEstateTransaction.legal_dong_name,
-                RealEstateTransaction.district_name,
-                RealEstateTransaction.reception_year,
+        else:
+            stmt = build_yearly_avg_price_by_dong_stmt(
+                district_name=district_name,
+                legal_dong_name=legal_dong_name,
+                building_use=building_use,
+                amount=amount,
             )
-        )
 
         # 데이터 꺼내옴
         rows = db.session.execute(stmt).fetchall()
 
-        # DataFrame으로 변환 후 반환
-        return pd.DataFrame(
-            rows,
-            columns=[
-                "district_name",
-                "legal_dong_name",
-                "reception_year",
-                "avg_price_per_sqm",
-                "transaction_count",
-            ],
-        )
-    
-    # Task 2: 받은 데이터 프레임에서 연도별 상승률 계산
-    def calc_yoy_change_rate(df: pd.DataFrame):
-        df = df.copy()
-        df["yoy_change_rate"] = (
-            df.groupby(["district_name", "legal_dong_name"])["avg_price_per_sqm"]
-            .pct_change()
-            .mul(100)
-            .round(2)
-        )
-        return df
-    
-    # Task 3: 받은 데이터 프레임에서 전체 상승률 계산
-    def calc_total_change_rate(df: pd.DataFrame):
-        df = df.copy()
-        # 평균 평단가를 이용해서 first는 2022년도 평단가 평균(시작 데이터가 거기라면) last는 2025년도 평단가 평균(끝 데이터가 거기라면)
-        total_rate = (
-            df.sort_values(["district_name", "legal_dong_name", "reception_year"])
-            .groupby(["district_name", "legal_dong_name"])["avg_price_per_sqm"]
-            .agg(["first", "last"])
-            .reset_index()
-        )
-        # 위의 first, last를 이용해서 2022년 대비 2025년의 전체 상승률을 계산
-        total_rate["total_change_rate"] = (
-            (total_rate["last"] - total_rate["first"]) / total_rate["first"] * 100
-        ).round(2)
-
-        # merge 하는 이유: 프론트에서는 연도별 row를 그대로 받아야하니까, 전체 상승률을 다 붙여줌, total_rank를 연도별로 다 붙이는 이유와 동일, last도 merge하는 이유는 프론트에서 최근 평단가 데이터 필요해서 format 함수 쓰려면 필요함
-        return df.merge(
-            total_rate[["district_name", "legal_dong_name", "total_change_rate", "last"]],
-            on=["district_name", "legal_dong_name"],
-            how="left",
-        )
+        # 컬럼별 NumPy 배열로 변환 후 반환
+        return {
+            "district_name": analytics.column(rows, 0),
+            "legal_dong_name": analytics.column(rows, 1),
+            "reception_year": analytics.column(rows, 2, np.int64),
+            "avg_price_per_sqm": analytics.column(rows, 3, float),
+            "transaction_count": analytics.column(rows, 4, np.int64),
+        }
     
-    # Task 4: 전체 랭킹 붙이기 및 랭킹으로 정렬
-    def apply_change_rank(df: pd.DataFrame):
-        df = df.copy()
-        df["change_rank"] = (
-            df["total_change_rate"]
-            .rank(method="dense", ascending=False)
-            .astype(int)
+    has_amount = input_amount is not None and str(input_amount).strip() != ""
+
+    if not has_amount and not input_building_use and dong_changes_available():
+        # 건물용도/금액 필터가 없으면 저장된 법정동 상승률 사용 (집계 테이블 갱신 시 변경된 법정동만 재계산됨)
+        changes = fetch_dong_yearly_changes(
+            district_name=input_district_name,
+            legal_dong_name=input_legal_dong_name,
         )
-        return df
-    # Task 5: last 값 이용, 10000 단위에 대한 포맷팅
-    def format_price_column(df: pd.DataFrame):
-        df = df.copy()
-        # merge에서 가져온 last(최신 avg_price_per_sqm) 기준으로 포맷 생성
-        df["price_per_sqm_format"] = (
-            df["last"]
-            .round(0)
-            .map(lambda x: f"{int(x):,}" if pd.notna(x) else "-")
+    else:
+        yearly = fetch_yearly_avg_price_by_dong(
+            district_name=input_district_name,
+            legal_dong_name=input_legal_dong_name,
+            building_use=input_building_use,
+            amount=input_amount,
         )
-        return df
+        # Service: 법정동별 연도 상승률 + 전체 상승률
+        changes = analytics.dong_yearly_changes(yearly)
 
-    df_yearly = fetch_yearly_avg_price_by_dong(
-        district_name=input_district_name,
-        legal_dong_name=input_legal_dong_name,
-        building_use=input_building_use,
-        amount=input_amount,
+    # Service: 전체 상승률 랭킹 + 포맷
+    return table_response(
+        analytics.rank_dong_changes(changes),
+        fmt,
+        pivot={
+            "keys": ("district_name", "legal_dong_name"),
+            "values": ("avg_price_per_sqm", "yoy_change_rate", "transaction_count"),
+            "attributes": ("change_rank", "total_change_rate", "price_per_sqm_format"),
+            "totals": ("transaction_count",),
+        },
     )
 
-    if df_yearly.empty:
-        return jsonify([])
 
-    df_yearly = calc_yoy_change_rate(df_yearly)
-    df_yearly = calc_total_change_rate(df_yearly)
-    df_yearly = apply_change_rank(df_yearly)
+@predict_bp.route('/ranking', methods=['GET', 'POST'])
+@cache.cached
+def ranking():
+    """
+    법정동 전체 상승률 상위/하위 N위 (메인 대시보드 표)
+    - /predict/location 전체 행(법정동 × 연도)을 받아 브라우저에서 거르던 것을 서버에서 처리
+    - body(POST) / 쿼리스트링(GET): n(기본 5, 1~100), order(top | bottom), district, building_type, amount, format(records | columnar)
+    """
+    data = request_params()
 
-    # 기존과 동일하게 rank + year 정렬(프론트 가정 유지) | merge하면 행순서 보장 안됨
-    df_yearly = df_yearly.sort_values(["change_rank", "reception_year"])
+    try:
+        fmt = request_format(data, allowed=('records', 'columnar'))
+        n = data.get('n')
+        n = 5 if n in (None, '') else n
+        if isinstance(n, bool) or not str(n).strip().isdigit() or not 1 <= int(n) <= 100:
+            raise ValueError('n 은 1 ~ 100 사이 정수여야 합니다.')
+        n = int(n)
+        order = data.get('order') or 'top'
+        if order not in ('top', 'bottom'):
+            raise ValueError(f'지원하지 않는 order: {order} (가능한 값: top, bottom)')
+        district_name = request_text(data, 'district')
+        building_use = request_text(data, 'building_type')
+        amount = request_int(data, 'amount')
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
 
-    df_yearly = format_price_column(df_yearly)
+    # Task 1: 법정동당 한 행으로 줄여서 로드 (연도별 집계 -> 윈도 함수로 최초/최근 평단가)
+    def fetch_dong_change(district_name=None, building_use=None, amount=None):
+        has_amount = amount is not None and str(amount).strip() != ""
+        snapshot = transaction_snapshot.get()
 
-    # Presentation
-    df_yearly["yoy_change_rate"] = df_yearly["yoy_change_rate"].fillna("-")
-    df_yearly["total_change_rate"] = df_yearly["total_change_rate"].fillna("-")
+        if not has_amount and not building_use and dong_changes_available():
+            # 건물용도/금액 필터가 없으면 저장된 법정동 상승률 사용
+            stmt = build_dong_change_summary_stmt(district_name=district_name)
+        elif snapshot is not None:
+            # 실거래가 스냅샷이 있으면 금액 필터까지 메모리에서 집계
+            return snapshot.dong_change(
+                district_name=district_name,
+                building_use=building_use,
+                amount=amount,
+            )
+        elif not has_amount and summary_available():
+            stmt = build_dong_change_stmt(build_yearly_avg_price_by_dong_summary_stmt(
+                district_name=district_name,
+                building_use=building_use,
+            ))
+        else:
+            stmt = build_dong_change_stmt(build_yearly_avg_price_by_dong_stmt(
+                district_name=district_name,
+                building_use=building_use,
+                amount=amount,
+            ))
 
-    # last 컬럼은 내부 계산용이니 내려주기 싫으면 drop 가능(프론트 사용 안 함)
-    df_yearly = df_yearly.drop(columns=["last"], errors="ignore")
+        rows = db.session.execute(stmt).fetchall()
+        return {
+            "district_name": analytics.column(rows, 0),
+            "legal_dong_name": analytics.column(rows, 1),
+            "first_price": analytics.column(rows, 2, float),
+            "last_price": analytics.column(rows, 3, float),
+            "transaction_count": analytics.column(rows, 4, np.int64),
+        }
+
+    per_dong = fetch_dong_change(
+        district_name=district_name,
+        building_use=building_use,
+        amount=amount,
+    )
 
-    result = df_yearly.fillna("-").to_dict(orient="records")
-    return jsonify(result)
\ No newline at end of file
+    # Service: 상승률 + 전체 랭킹 -> 상위/하위 n위까지만
+    return table_response(analytics.dong_change_top(per_dong, n=n, bottom=order == 'bottom'), fmt)
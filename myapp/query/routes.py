@@ -1,10 +1,70 @@
-from flask import render_template, jsonify, request
-import pandas as pd
+from flask import render_template, request
 from . import query_bp
 from sqlalchemy import select, and_
 from myapp.models import RealEstateTransaction
+from myapp.lookup import name_condition
+from myapp.responses import json_response, row_records
 from myapp import db
 
+# Task 1: 필요 컬럼만 DB에서 select
+def build_select_stmt():
+    return select(
+        RealEstateTransaction.district_name,
+        RealEstateTransaction.legal_dong_name,
+        RealEstateTransaction.building_name,
+        RealEstateTransaction.building_area,
+        RealEstateTransaction.amount,
+        RealEstateTransaction.construction_year,
+        RealEstateTransaction.building_use,
+    )
+
+# Task 2: Where 필터
+def apply_filters(stmt, district_name=None, legal_dong_name=None, building_use=None, amount=None):
+    conditions = []
+
+    # 구/동/건물용도는 코드 비교 (ix_ret_search / ix_ret_building_year_cover 키)
+    if district_name:
+        conditions.append(name_condition(RealEstateTransaction, 'district_name', district_name))
+
+    if legal_dong_name:
+        conditions.append(name_condition(RealEstateTransaction, 'legal_dong_name', legal_dong_name))
+
+    if building_use:
+        conditions.append(name_condition(RealEstateTransaction, 'building_use', building_use))
+
+    if amount is not None:
+        conditions.append(RealEstateTransaction.amount <= amount)
+
+    if conditions:
+        stmt = stmt.where(and_(*conditions))
+
+    return stmt
+
+# Task 3: ORDER BY 입력값 기반 정렬
+# 지역구(district_name)를 받음에 상관없이, 결과를 "구 -> 동" 순서로 정렬
+# 구만 넣었을 때는 "구 내에서 동 정렬 ", 같은 구/동 안에서는 건물용도 -> 금액 순
+# ix_ret_search 키 순서(코드) 그대로 정렬 -> 정렬 단계 없이 인덱스 순서로 앞 1000행만 읽음
+# (참조 테이블 코드는 적재/backfill 때 이름순으로 추가되므로 기존 이름은 코드 순서 = 이름 순서)
+def apply_ordering(stmt):
+    return stmt.order_by(
+        RealEstateTransaction.district_id.asc(),
+        RealEstateTransaction.legal_dong_id.asc(),
+        RealEstateTransaction.building_use_id.asc(),
+        RealEstateTransaction.amount.asc(),
+    )
+
+def build_search_stmt(district_name=None, legal_dong_name=None, building_use=None, amount=None):
+    stmt = build_select_stmt()
+    stmt = apply_filters(
+        stmt,
+        district_name=district_name,
+        legal_dong_name=legal_dong_name,
+        building_use=building_use,
+        amount=amount,
+    )
+    return apply_ordering(stmt)
+
+
 @query_bp.route('/', methods=['GET'])
 def query():
     return render_template('query/query.html')
@@ -21,6 +81,8 @@ def search():
             (6.28 − 0.08) / 6.28 × 100 ≈ 98.7% 성능 개선
     """
     data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return json_response({'error': '요청 body 는 JSON 객체여야 합니다.'}, 400)
 
     #input 데이터 처리
     input_district_name = data.get('district')
@@ -35,75 +97,18 @@ def search():
         except (TypeError, ValueError):
             input_amount = None
 
-    # Task 1: 필요 컬럼만 DB에서 select
-    def build_select_stmt():
-        return select(
-            RealEstateTransaction.district_name,
-            RealEstateTransaction.legal_dong_name,
-            RealEstateTransaction.building_name,
-            RealEstateTransaction.building_area,
-            RealEstateTransaction.amount,
-            RealEstateTransaction.construction_year,
-            RealEstateTransaction.building_use,
-        )
-
-    # Task 2: Where 필터
-    def apply_filters(stmt, district_name=None, legal_dong_name=None, building_use=None, amount=None):
-        conditions = []
-
-        if district_name:
-            conditions.append(RealEstateTransaction.district_name == district_name)
-
-        if legal_dong_name:
-            conditions.append(RealEstateTransaction.legal_dong_name == legal_dong_name)
-
-        if building_use:
-            conditions.append(RealEstateTransaction.building_use == building_use)
-
-        if amount is not None:
-            conditions.append(RealEstateTransaction.amount <= amount)
-
-        if conditions:
-            stmt = stmt.where(and_(*conditions))
-
-        return stmt
-
-    # Task 3: ORDER BY 입력값 기반 정렬
-    # 지역구(district_name)를 받음에 상관없이, 결과를 "구 -> 동" 순서로 정렬
-    # 구만 넣었을 때는 "구 내에서 동 정렬 "
-    def apply_ordering(stmt):
-        return stmt.order_by(
-            RealEstateTransaction.district_name.asc(),
-            RealEstateTransaction.legal_dong_name.asc(),
-        )
-
     # Task 4: DB limit
     def fetch_rows(stmt, limit_size=1000):
         stmt = stmt.limit(limit_size)
         return db.session.execute(stmt).mappings().all()
 
-    def to_response(rows):
-        result = []
-        for r in rows:
-            item = dict(r)
-            for k, v in item.items():
-                if v is None:
-                    item[k] = '-'
-            result.append(item)
-        return result
-    
-    stmt = build_select_stmt()
-
-    stmt = apply_filters(
-        stmt,
+    stmt = build_search_stmt(
         district_name=input_district_name,
         legal_dong_name=input_legal_dong_name,
         building_use=input_building_use,
         amount=input_amount,
     )
-
-    stmt = apply_ordering(stmt)
     rows = fetch_rows(stmt, limit_size=1000)
-    result = to_response(rows)
 
-    return jsonify(result)
\ No newline at end of file
+    # None -> "-" 치환 후 바로 JSON bytes 로 직렬화
+    return json_response(row_records(rows))
\ No newline at end of file
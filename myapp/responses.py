@@ -0,0 +1,243 @@
+import gzip
+import json
+import time
+import numpy as np
+from flask import current_app, request, abort
+from flask.json.provider import DefaultJSONProvider
+from myapp.analytics import to_records, to_columns, fill_missing, pivot_by_year
+from myapp.metrics import record
+
+# JSON 응답 공통 처리
+# - orjson 이 있으면 orjson 으로 바로 bytes 직렬화 (numpy 배열/스칼라 네이티브 지원), 없으면 표준 json
+# - 결측값(None/NaN)은 프론트 표기와 같게 "-" 로 치환
+# - 큰 응답은 Accept-Encoding 에 따라 br(brotli 설치 시) / gzip 압축
+#   (강한 ETag 가 있으면 압축 방식별로 "<etag>-gzip" / "<etag>-br" 로 구분)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+NA = '-'
+
+# 차트/표 응답 형식 (요청 JSON body 의 "format")
+# - records: 행 단위 dict 목록 (기본값, 기존 응답)
+# - columnar: 컬럼별 배열 {컬럼명: [...]}
+# - pivot: series × year 행렬 (Chart.js datasets 에 그대로 사용, 빈 칸은 null)
+FORMATS = ('records', 'columnar', 'pivot')
+
+
+def default(obj):
+    """
+    기본 인코더가 모르는 타입 처리 (numpy 스칼라/배열, 날짜 등)
+    """
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def dumps(obj, indent=False):
+    """
+    obj -> JSON bytes (키 정렬은 기존 jsonify 와 동일)
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+
+    return json.dumps(
+        obj, default=default, sort_keys=True, ensure_ascii=False,
+        indent=2 if indent else None, separators=None if indent else (',', ':'),
+    ).encode('utf-8')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    jsonify / current_app.json.dumps 를 orjson 으로 처리 (미설치 시 기본 구현)
+    """
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, indent=bool(kwargs.get('indent'))).decode('utf-8')
+
+
+def row_records(rows, na=NA):
+    """
+    SQL 결과(mappings 또는 Row) -> dict 목록 (None 은 na)
+    """
+    if not rows:
+        return []
+
+    if hasattr(rows[0], 'keys'):  # RowMapping
+        names = list(rows[0].keys())
+        rows = [row.values() for row in rows]
+    else:  # Row
+        names = list(rows[0]._fields)
+
+    return [
+        {name: na if value is None else value for name, value in zip(names, row)}
+        for row in rows
+    ]
+
+
+def frame_records(df, na=NA):
+    """
+    DataFrame -> dict 목록 (컬럼 단위 변환, NaN/None 은 na)
+    """
+    return to_records({name: df[name].to_numpy() for name in df.columns}, na=na)
+
+
+def request_params():
+    """
+    조회 파라미터: GET 은 쿼리스트링, POST 는 JSON body (둘 다 dict)
+    body 가 JSON 객체가 아니면(ex. [1], "x") 400 응답으로 중단 (캐시 키 계산 / 뷰 모두 같은 검사)
+    """
+    if request.method in ('GET', 'HEAD'):
+        return request.args.to_dict()
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        abort(json_response({'error': '요청 body 는 JSON 객체여야 합니다.'}, 400))
+    return data
+
+
+def request_text(data, name):
+    """
+    요청 문자열 필터 값 검증 (없거나 빈 문자열이면 None), 문자열이 아니면 ValueError
+    """
+    value = data.get(name)
+    if value is None or value == '':
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f'{name} 값은 문자열이어야 합니다.')
+    return value
+
+
+def request_int(data, name):
+    """
+    요청 정수 값 검증 (없거나 빈 문자열이면 None), 정수가 아니면 ValueError
+    ex) 100000, "100000", 100000.0 -> 100000 | "abc", 1.5, true -> ValueError
+    """
+    value = data.get(name)
+    if value is None or (isinstance(value, str) and value.strip() == ''):
+        return None
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().lstrip('-').isdigit():
+        return int(value)
+    raise ValueError(f'{name} 값은 정수여야 합니다: {value}')
+
+
+def request_format(data, allowed=FORMATS):
+    """
+    요청 body 의 format 값 검증 (없으면 records), 지원하지 않는 값이면 ValueError
+    """
+    fmt = data.get('format') or 'records'
+    if fmt not in allowed:
+        raise ValueError(f"지원하지 않는 format: {fmt} (가능한 값: {', '.join(allowed)})")
+    return fmt
+
+
+def table_response(table, fmt='records', pivot=None, na=NA):
+    """
+    analytics 결과(컬럼명 -> 배열) 를 요청 형식에 맞게 응답
+    pivot: format=pivot 일 때 pivot_by_year 인자 dict (keys, values, attributes, totals)
+    """
+    if fmt == 'columnar':
+        return json_response(to_columns(table, na=na))
+
+    if fmt == 'pivot':
+        result = pivot_by_year(table, **pivot)
+        return json_response({
+            'years': result['years'].tolist(),
+            'series': to_columns(result['series'], na=na),
+            'values': {name: fill_missing(matrix, None) for name, matrix in result['values'].items()},
+        })
+
+    return json_response(to_records(table, na=na))
+
+
+def json_response(obj, status=200):
+    """
+    jsonify 대체: 직렬화 결과 bytes 를 그대로 응답 본문으로 사용
+    """
+    started = time.perf_counter()
+    body = dumps(obj, indent=current_app.debug)
+    record('serialize', time.perf_counter() - started)
+    return current_app.response_class(body, status=status, mimetype='application/json')
+
+
+def choose_encoding(accept_encoding):
+    accepted = {value.split(';')[0].strip().lower() for value in accept_encoding.split(',')}
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+class ResponseCompression:
+    """
+    JSON 응답 압축 (응답 캐시에는 압축 전 본문이 저장되고, 캐시 HIT 응답도 여기서 압축)
+    - JSON_COMPRESS_MIN_SIZE: 이 크기(bytes) 이상일 때만 압축, 0 이면 비활성화
+    - JSON_COMPRESS_LEVEL: gzip 압축 레벨 (brotli 는 quality 로 사용)
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('JSON_COMPRESS_MIN_SIZE', 8192)
+        app.config.setdefault('JSON_COMPRESS_LEVEL', 5)
+        app.json = FastJSONProvider(app)
+        app.after_request(self.compress)
+
+    def compress(self, response):
+        min_size = current_app.config['JSON_COMPRESS_MIN_SIZE']
+        if (
+            not min_size
+            or response.mimetype != 'application/json'
+            or response.is_streamed
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+        data = response.get_data()
+        if encoding is None or len(data) < min_size:
+            return response
+
+        level = current_app.config['JSON_COMPRESS_LEVEL']
+        if encoding == 'br':
+            data = brotli.compress(data, quality=level)
+        else:
+            data = gzip.compress(data, compresslevel=level)
+
+        response.set_data(data)
+        response.headers['Content-Encoding'] = encoding
+
+        # 같은 표현(압축 전 본문)이라도 압축 방식이 다르면 바이트가 다르므로 강한 ETag 를 구분
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(f'{etag}-{encoding}')
+        return response
+
+
+compression = ResponseCompression()
@@ -0,0 +1,581 @@
+import os
+import json
+import math
+import shutil
+import logging
+import threading
+import time
+from datetime import datetime
+import numpy as np
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+from myapp.api.streaming import iter_keyset_rows
+from myapp.cache import get_data_version
+from myapp.models import RealEstateTransaction
+from myapp import analytics
+
+# 실거래가 분석 컬럼 스냅샷 (선택 엔진, TRANSACTION_SNAPSHOT_DIR 를 지정하면 사용)
+# - 지역구 / 법정동 / 건물용도는 사전(dictionary) 인코딩한 작은 정수 코드, 금액/면적/연도/연월은 타입 지정 배열
+# - 데이터 버전별 디렉터리에 컬럼별 .npy 파일로 저장 -> 워커는 np.load(mmap_mode='r') 로 읽어서
+#   같은 파일의 페이지 캐시를 공유 (워커 수만큼 메모리를 복제하지 않음)
+# - 집계는 필터 마스크 + 조합 키 bincount 로 계산 (SQLAlchemy 왕복 / DataFrame 생성 없음)
+# - 결과는 각 라우트의 SQL 조회 함수와 같은 컬럼 배열 dict -> 이후 analytics 계산은 그대로
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 디렉터리 rename 으로만 보호
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 'real_estate_transaction'
+SNAPSHOT_PREFIX = 'transactions-v'
+
+# 사전 인코딩 컬럼 (스냅샷 이름, 모델 컬럼)
+DICTIONARY_COLUMNS = (
+    ('district', RealEstateTransaction.district_name),
+    ('dong', RealEstateTransaction.legal_dong_name),
+    ('building_use', RealEstateTransaction.building_use),
+)
+
+# 값 배열 컬럼 (스냅샷 이름, 모델 컬럼, dtype, NULL 대체값)
+VALUE_COLUMNS = (
+    ('reception_year', RealEstateTransaction.reception_year, np.int16, 0),
+    ('contract_month', RealEstateTransaction.contract_month, np.int32, 0),
+    ('amount', RealEstateTransaction.amount, np.float64, np.nan),
+    ('building_area', RealEstateTransaction.building_area, np.float64, np.nan),
+)
+
+ARRAYS = ('district', 'dong', 'building_use', 'reception_year', 'contract_month', 'amount', 'building_area', 'price_per_sqm')
+
+
+def code_dtype(size):
+    return np.int16 if size < np.iinfo(np.int16).max else np.int32
+
+
+def sorted_dictionary(values):
+    """
+    사전 값 정렬 (None 은 맨 뒤, analytics.sort_order 와 같은 기준)
+    """
+    return sorted(values, key=lambda value: (value is None, value or ''))
+
+
+def snapshot_path(root, version):
+    return os.path.join(root, f'{SNAPSHOT_PREFIX}{version}')
+
+
+def current_version():
+    """
+    실거래가 데이터 버전 (적재 전이라 버전 행이 없으면 0)
+    """
+    return dict(get_data_version((SNAPSHOT_VERSION,))).get(SNAPSHOT_VERSION, 0)
+
+
+def write_snapshot(root, version, batch_size=50000):
+    """
+    DB에서 keyset 배치 단위로 읽어 스냅샷 디렉터리 생성 -> 경로
+    임시 디렉터리에 쓴 뒤 rename 하므로 읽는 쪽은 완성된 스냅샷만 봄
+    """
+    started = time.perf_counter()
+    os.makedirs(root, exist_ok=True)
+    target = snapshot_path(root, version)
+    temp = f'{target}.tmp-{os.getpid()}-{threading.get_ident()}'
+    shutil.rmtree(temp, ignore_errors=True)
+    os.makedirs(temp)
+
+    # Task 1: 배치마다 문자열 -> 임시 코드(처음 본 순서) 변환, 값 컬럼은 dtype 배열로 변환
+    lookups = {name: {} for name, _ in DICTIONARY_COLUMNS}
+    parts = {name: [] for name in ARRAYS if name != 'price_per_sqm'}
+    columns = [column for _, column in DICTIONARY_COLUMNS] + [column for _, column, _, _ in VALUE_COLUMNS]
+
+    def flush(batch):
+        for i, (name, _) in enumerate(DICTIONARY_COLUMNS):
+            lookup = lookups[name]
+            if name == 'dong':
+                # 법정동은 (지역구, 법정동) 쌍으로 인코딩 (같은 이름의 법정동이 여러 지역구에 있음)
+                keys = [(row[0], row[1]) for row in batch]
+            else:
+                keys = [row[i] for row in batch]
+            parts[name].append(np.array([lookup.setdefault(key, len(lookup)) for key in keys], dtype=np.int64))
+
+        offset = len(DICTIONARY_COLUMNS)
+        for i, (name, _, dtype, null) in enumerate(VALUE_COLUMNS):
+            values = [row[offset + i] for row in batch]
+            parts[name].append(np.array([null if value is None else value for value in values], dtype=dtype))
+
+    batch = []
+    for row in iter_keyset_rows(RealEstateTransaction.ret_id, columns, batch_size=batch_size):
+        batch.append(row[1:])
+        if len(batch) == batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    # Task 2: 사전 정렬 -> 임시 코드를 정렬 순서 코드로 변환 (코드 순서 = 응답 정렬 순서)
+    districts = sorted_dictionary(
+        set(lookups['district']) | {district for district, _ in lookups['dong']}
+    )
+    district_codes = {value: code for code, value in enumerate(districts)}
+    # 법정동 사전은 SQL 응답 순서와 같게 (법정동명, 지역구명) 기준 정렬
+    dongs = sorted(lookups['dong'], key=lambda key: (key[1] is None, key[1] or '', key[0] is None, key[0] or ''))
+    building_uses = sorted_dictionary(lookups['building_use'])
+
+    dong_codes = {key: code for code, key in enumerate(dongs)}
+    building_use_codes = {value: code for code, value in enumerate(building_uses)}
+    orders = {
+        'district': [district_codes[value] for value in lookups['district']],
+        'dong': [dong_codes[key] for key in lookups['dong']],
+        'building_use': [building_use_codes[value] for value in lookups['building_use']],
+    }
+    sizes = {'district': len(districts), 'dong': len(dongs), 'building_use': len(building_uses)}
+
+    arrays = {}
+    for name, _ in DICTIONARY_COLUMNS:
+        remap = np.array(orders[name], dtype=code_dtype(sizes[name]))
+        codes = np.concatenate(parts[name]) if parts[name] else np.zeros(0, dtype=np.int64)
+        arrays[name] = remap[codes] if len(remap) else codes.astype(code_dtype(0))
+    for name, _, dtype, _ in VALUE_COLUMNS:
+        arrays[name] = np.concatenate(parts[name]) if parts[name] else np.zeros(0, dtype=dtype)
+
+    # Task 3: 평단가는 한 번만 계산해서 저장 (면적 0 이하 / 금액 NULL 은 NaN, 집계 테이블과 같은 기준)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        valid = (arrays['building_area'] > 0) & ~np.isnan(arrays['amount'])
+        arrays['price_per_sqm'] = np.where(valid, arrays['amount'] * 10000 / arrays['building_area'], np.nan)
+
+    for name in ARRAYS:
+        np.save(os.path.join(temp, f'{name}.npy'), arrays[name])
+
+    present_years = arrays['reception_year'][arrays['reception_year'] > 0]
+    present_months = arrays['contract_month'][arrays['contract_month'] > 0]
+    meta = {
+        'version': version,
+        'rows': int(len(arrays['district'])),
+        'built_at': datetime.now().isoformat(timespec='seconds'),
+        'districts': districts,
+        'dongs': [[district_codes[district], name] for district, name in dongs],
+        'building_uses': building_uses,
+        'years': [int(present_years.min()), int(present_years.max())] if len(present_years) else [0, -1],
+        'months': [int(present_months.min()), int(present_months.max())] if len(present_months) else [0, -1],
+    }
+    with open(os.path.join(temp, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    try:
+        os.rename(temp, target)
+    except OSError:
+        # 다른 프로세스가 같은 버전을 먼저 만듦
+        shutil.rmtree(temp, ignore_errors=True)
+
+    logger.info('실거래가 스냅샷 생성: 버전 %s, %d행, %.1fms', version, meta['rows'], (time.perf_counter() - started) * 1000)
+    return target
+
+
+def snapshot_version(name):
+    """
+    스냅샷 디렉터리 이름 -> 데이터 버전 (스냅샷 디렉터리가 아니면 None)
+    """
+    if not name.startswith(SNAPSHOT_PREFIX) or '.tmp-' in name:
+        return None
+    try:
+        return int(name[len(SNAPSHOT_PREFIX):])
+    except ValueError:
+        return None
+
+
+def prune_snapshots(root, keep, retain=1):
+    """
+    keep 과 그 이전 버전 중 최근 retain 개를 남기고 스냅샷 디렉터리 삭제
+    - 직전 버전은 다른 워커가 버전 확인 후 아직 열지 못했을 수 있으므로 남김
+    - 이미 memory-map 한 워커는 파일이 지워져도 계속 읽을 수 있음
+    """
+    versions = []
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        version = snapshot_version(name)
+        if version is not None and path != keep:
+            versions.append((version, path))
+
+    versions.sort()
+    for _, path in versions[:max(len(versions) - retain, 0)]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def same_table(expected, actual, keys):
+    """
+    컬럼 배열 dict 두 개가 같은 행 집합인지 비교 (회귀 확인용)
+    키 컬럼 기준으로 정렬해서 비교, 실수 컬럼은 합산 순서 차이만 허용 (NaN 끼리는 같음)
+    """
+    if set(expected) != set(actual) or len(expected[keys[0]]) != len(actual[keys[0]]):
+        return False
+
+    def ordered(table):
+        order = analytics.sort_order(*(np.asarray(table[key], dtype=object) for key in keys))
+        return {name: np.asarray(values)[order] for name, values in table.items()}
+
+    expected, actual = ordered(expected), ordered(actual)
+    for name in expected:
+        left, right = expected[name], actual[name]
+        if left.dtype.kind == 'f' or right.dtype.kind == 'f':
+            if not np.allclose(left.astype(float), right.astype(float), rtol=1e-9, atol=0, equal_nan=True):
+                return False
+        elif left.tolist() != right.tolist():
+            return False
+    return True
+
+
+class TransactionSnapshot:
+    """
+    memory-map 한 실거래가 컬럼 + 사전
+    - district / building_use: 사전 코드, dong: (지역구, 법정동) 쌍 사전 코드
+    - reception_year / contract_month: NULL 은 0
+    - amount / building_area / price_per_sqm: NULL(계산 불가)은 NaN
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+
+        self.version = meta['version']
+        self.rows = meta['rows']
+        self.built_at = meta['built_at']
+        self.districts = np.array(meta['districts'], dtype=object)
+        self.dong_districts = np.array([district for district, _ in meta['dongs']], dtype=np.int64)
+        self.dong_names = np.array([name for _, name in meta['dongs']], dtype=object)
+        self.building_uses = np.array(meta['building_uses'], dtype=object)
+        self.year_min, self.year_max = meta['years']
+        self.month_min, self.month_max = meta['months']
+
+        for name in ARRAYS:
+            setattr(self, name, np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r'))
+
+    def __len__(self):
+        return self.rows
+
+    @staticmethod
+    def _match(dictionary, value):
+        """
+        사전 값 -> 코드별 일치 여부 (코드 배열에 인덱싱해서 행 마스크로 사용)
+        """
+        return np.equal(dictionary, value)
+
+    def mask(self, district_name=None, legal_dong_name=None, building_use=None, amount=None):
+        """
+        필터 조건 -> 행 마스크 (조건이 없으면 None)
+        amount: 금액 미만 (SQL 경로와 같은 기준)
+        """
+        conditions = []
+        if district_name:
+            conditions.append(self._match(self.districts, district_name)[self.district])
+        if legal_dong_name:
+            conditions.append(self._match(self.dong_names, legal_dong_name)[self.dong])
+        if building_use:
+            conditions.append(self._match(self.building_uses, building_use)[self.building_use])
+        if amount is not None and str(amount).strip() != "":
+            conditions.append(self.amount < int(amount))
+
+        if not conditions:
+            return None
+        mask = conditions[0]
+        for condition in conditions[1:]:
+            mask &= condition
+        return mask
+
+    def group(self, keys, mask=None):
+        """
+        조합 키 bincount -> (키별 코드 튜플, 평단가 합계, 평단가 건수, 거래 수), 거래가 있는 키만 코드 순서대로
+        keys: [(코드 배열, 코드 개수), ...] (코드 순서 = 결과 정렬 순서)
+        """
+        sizes = tuple(max(size, 1) for _, size in keys)
+        length = math.prod(sizes)
+
+        # 조합 키 = 첫 번째 키 코드 * 나머지 코드 개수 곱 + ... (ravel_multi_index 와 같은 값, 범위 검사 생략)
+        flat = None
+        for (values, _), size in zip(keys, sizes):
+            values = np.asarray(values) if mask is None else np.asarray(values)[mask]
+            flat = values.astype(np.int64) if flat is None else flat * size + values
+        price = np.asarray(self.price_per_sqm) if mask is None else np.asarray(self.price_per_sqm)[mask]
+
+        count = np.bincount(flat, minlength=length)
+        # 평단가 합계/건수는 평단가가 있는 행만
+        has_price = ~np.isnan(price)
+        priced = flat[has_price]
+        price_count = np.bincount(priced, minlength=length)
+        price_sum = np.bincount(priced, weights=price[has_price], minlength=length)
+
+        present = np.flatnonzero(count)
+        return (
+            np.unravel_index(present, sizes),
+            price_sum[present],
+            price_count[present],
+            count[present],
+        )
+
+    @staticmethod
+    def average(price_sum, price_count):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(price_count > 0, price_sum / price_count, np.nan)
+
+    def _year_key(self):
+        """
+        접수연도 키 (연도 - 최소 연도), 연도가 없는 행은 마지막 코드 -> SQL 경로의 NULL 그룹과 같은 위치(맨 뒤)
+        """
+        span = self.year_max - self.year_min + 1
+        years = np.asarray(self.reception_year)
+        return np.where(years > 0, years - self.year_min, span), span + 1
+
+    def _years(self, codes):
+        """
+        접수연도 키 -> 연도 배열 (NULL 그룹이 있으면 None 을 포함한 object 배열, analytics.column 과 같은 형식)
+        """
+        null = codes == self.year_max - self.year_min + 1
+        years = (codes + self.year_min).astype(np.int64)
+        if not null.any():
+            return years
+        years = years.astype(object)
+        years[null] = None
+        return years
+
+    def yearly_by_district(self):
+        """
+        /district: 연도별 지역구 평균 평단가 + 거래 수
+        """
+        (district, year), price_sum, price_count, count = self.group(
+            [(self.district, len(self.districts)), self._year_key()],
+        )
+        return {
+            "district_name": self.districts[district],
+            "reception_year": self._years(year),
+            "avg_price_per_sqm": self.average(price_sum, price_count),
+            "transaction_count": count,
+        }
+
+    def yearly_by_building(self):
+        """
+        /building: 건물유형 × 연도별 평균 평단가 (연도 오름차순)
+        """
+        (year, building_use), price_sum, price_count, _ = self.group(
+            [self._year_key(), (self.building_use, len(self.building_uses))],
+        )
+        return {
+            "building_use": self.building_uses[building_use],
+            "reception_year": self._years(year),
+            "avg_price_per_sqm": self.average(price_sum, price_count),
+        }
+
+    def yearly_by_dong(self, district_name=None, legal_dong_name=None, building_use=None, amount=None):
+        """
+        /predict/location: 지역구 | 법정동 | 연도별 평균 평단가 + 거래 수 (평단가 계산 가능한 거래만)
+        법정동 | 지역구 | 연도 순 (SQL 경로와 같은 정렬)
+        """
+        mask = self.mask(district_name, legal_dong_name, building_use, amount)
+        has_price = ~np.isnan(np.asarray(self.price_per_sqm))
+        mask = has_price if mask is None else mask & has_price
+        (dong, year), price_sum, price_count, _ = self.group([(self.dong, len(self.dong_names)), self._year_key()], mask)
+        return {
+            "district_name": self.districts[self.dong_districts[dong]] if len(dong) else np.array([], dtype=object),
+            "legal_dong_name": self.dong_names[dong],
+            "reception_year": self._years(year),
+            "avg_price_per_sqm": self.average(price_sum, price_count),
+            "transaction_count": price_count,
+        }
+
+    def dong_change(self, district_name=None, building_use=None, amount=None):
+        """
+        /predict/ranking: 법정동당 한 행 (최초/최근 연도 평단가 + 거래 수 합계)
+        """
+        yearly = self.yearly_by_dong(district_name=district_name, building_use=building_use, amount=amount)
+        starts = analytics.group_starts(yearly["district_name"], yearly["legal_dong_name"])
+        first, last = analytics.group_first_last(yearly["avg_price_per_sqm"], starts)
+        return {
+            "district_name": yearly["district_name"][starts],
+            "legal_dong_name": yearly["legal_dong_name"][starts],
+            "first_price": first,
+            "last_price": last,
+            "transaction_count": analytics.group_sum(yearly["transaction_count"], starts),
+        }
+
+    def monthly_price(self, district_name=None, legal_dong_name=None, building_use=None, start=None, end=None):
+        """
+        /trend: 계약 연월별 평단가 합계/건수 + 전체 거래 수 (연월 오름차순)
+        """
+        contract_month = np.asarray(self.contract_month)
+        conditions = contract_month > 0
+        if start is not None:
+            conditions &= contract_month >= start
+        if end is not None:
+            conditions &= contract_month <= end
+        mask = self.mask(district_name, legal_dong_name, building_use)
+        mask = conditions if mask is None else mask & conditions
+
+        (month,), price_sum, price_count, count = self.group(
+            [(contract_month - self.month_min, self.month_max - self.month_min + 1)], mask,
+        )
+        return {
+            "contract_month": (month + self.month_min).astype(np.int64),
+            "price_per_sqm_sum": price_sum,
+            "price_per_sqm_count": price_count,
+            "transaction_count": count,
+        }
+
+
+class TransactionSnapshotStore:
+    """
+    실거래가 컬럼 스냅샷 확장
+    - TRANSACTION_SNAPSHOT_DIR: 스냅샷 디렉터리 (None 이면 비활성화 -> 라우트는 기존 SQL 경로)
+    - TRANSACTION_SNAPSHOT_CHECK_INTERVAL: 데이터 버전 확인 주기(초)
+    - TRANSACTION_SNAPSHOT_BATCH_SIZE: 스냅샷 생성 시 DB 조회 배치 크기
+    데이터 버전이 바뀌면 백그라운드 스레드에서 스냅샷을 만들거나 로드하고, 준비될 때까지 요청은 SQL 경로로 응답
+    (생성은 한 워커(파일 잠금)만, 적재 직후 `flask snapshot build` 를 실행해 두면 워커는 로드만 함)
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('TRANSACTION_SNAPSHOT_DIR', None)
+        app.config.setdefault('TRANSACTION_SNAPSHOT_CHECK_INTERVAL', 5)
+        app.config.setdefault('TRANSACTION_SNAPSHOT_BATCH_SIZE', 50000)
+        app.extensions['transaction_snapshot'] = {
+            'lock': threading.Lock(),
+            'snapshot': None,
+            'version': None,
+            'checked_at': 0.0,
+            'builder': None,
+            'build_started_at': 0.0,
+        }
+
+    @property
+    def _state(self):
+        return current_app.extensions['transaction_snapshot']
+
+    @property
+    def enabled(self):
+        return bool(current_app.config['TRANSACTION_SNAPSHOT_DIR'])
+
+    @staticmethod
+    def _open(path):
+        """
+        스냅샷 디렉터리 열기 (다른 워커가 prune 해서 파일이 없으면 None -> SQL 경로)
+        """
+        try:
+            return TransactionSnapshot(path)
+        except FileNotFoundError:
+            return None
+
+    def _load(self, version):
+        """
+        version 스냅샷 로드 (없으면 파일 잠금을 잡은 프로세스가 생성, 잠금을 못 잡으면 None)
+        """
+        root = current_app.config['TRANSACTION_SNAPSHOT_DIR']
+        path = snapshot_path(root, version)
+        if os.path.isdir(path):
+            return self._open(path)
+
+        os.makedirs(root, exist_ok=True)
+        with open(os.path.join(root, '.lock'), 'w') as lock_file:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return None  # 다른 워커가 생성 중
+
+            if not os.path.isdir(path):
+                write_snapshot(root, version, current_app.config['TRANSACTION_SNAPSHOT_BATCH_SIZE'])
+                prune_snapshots(root, keep=path)
+        return self._open(path)
+
+    def build(self, version=None):
+        """
+        데이터 버전(기본 현재 버전) 스냅샷 생성(없을 때) + 로드 -> 현재 앱 상태에 저장
+        """
+        state = self._state
+        if version is None:
+            version = current_version()
+        snapshot = self._load(version)
+        if snapshot is not None:
+            with state['lock']:
+                state['snapshot'] = snapshot
+                state['version'] = version
+                state['checked_at'] = time.monotonic()
+        return snapshot
+
+    def _build_in_background(self, app, version):
+        with app.app_context():
+            try:
+                self.build(version)
+            except (SQLAlchemyError, OSError):
+                logger.warning('실거래가 스냅샷을 만들지 못했습니다. (버전 %s)', version, exc_info=True)
+
+    def _start_build(self, version):
+        """
+        스냅샷 생성/로드 스레드 시작 (이미 실행 중이거나, 확인 주기 안에 시도했으면 그대로)
+        다른 워커가 파일 잠금을 잡고 생성 중이면 스레드는 바로 끝나고, 확인 주기 후 다시 시도
+        """
+        state = self._state
+        now = time.monotonic()
+        with state['lock']:
+            builder = state['builder']
+            if builder is not None and builder.is_alive():
+                return
+            if now - state['build_started_at'] < current_app.config['TRANSACTION_SNAPSHOT_CHECK_INTERVAL']:
+                return
+
+            builder = threading.Thread(
+                target=self._build_in_background,
+                args=(current_app._get_current_object(), version),
+                name='transaction-snapshot',
+                daemon=True,
+            )
+            state['builder'] = builder
+            state['build_started_at'] = now
+        builder.start()
+
+    def warm(self):
+        """
+        서버 시작 시 미리 로드 (테이블이 아직 없으면 첫 조회 때 생성)
+        """
+        if not self.enabled:
+            return
+        try:
+            self.build()
+        except (SQLAlchemyError, OSError):
+            logger.warning('실거래가 스냅샷을 미리 만들지 못했습니다. 첫 조회 때 생성합니다.', exc_info=True)
+
+    def get(self):
+        """
+        현재 데이터 버전의 스냅샷 (비활성화 / 생성·로드 중이면 None -> SQL 경로)
+        요청 스레드에서는 스냅샷을 만들지 않음 (버전이 바뀌면 백그라운드 스레드 시작 후 바로 None)
+        """
+        if not self.enabled:
+            return None
+
+        state = self._state
+        snapshot = state['snapshot']
+        now = time.monotonic()
+        if snapshot is not None and now - state['checked_at'] < current_app.config['TRANSACTION_SNAPSHOT_CHECK_INTERVAL']:
+            return snapshot
+
+        version = current_version()
+        if snapshot is not None and version == state['version']:
+            state['checked_at'] = now
+            return snapshot
+
+        # 이전 버전 스냅샷은 현재 데이터와 다르므로 쓰지 않음
+        self._start_build(version)
+        return None
+
+    def stats(self):
+        state = self._state
+        snapshot = state['snapshot']
+        return {
+            'enabled': self.enabled,
+            'version': state['version'],
+            'rows': len(snapshot) if snapshot else 0,
+            'built_at': snapshot.built_at if snapshot else None,
+        }
+
+
+transaction_snapshot = TransactionSnapshotStore()
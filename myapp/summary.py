@@ -0,0 +1,329 @@
+from datetime import datetime
+import numpy as np
+from sqlalchemy import select, func, case, and_, or_, delete, insert
+from myapp.models import (
+    RealEstateTransaction, PublicParking, TransactionYearlySummary, TransactionMonthlySummary, DongYearlyChange, DongChange,
+    ParkingAccessibility,
+)
+from myapp.lookup import code_column, decode_lookup_codes
+from myapp import analytics
+from myapp import db
+
+SUMMARY_KEYS = ('district_name', 'legal_dong_name', 'building_use', 'reception_year')
+MONTHLY_SUMMARY_KEYS = ('district_name', 'legal_dong_name', 'building_use', 'contract_month')
+
+# 법정동 조건을 OR 로 묶을 때 한 번에 넣는 법정동 수 (SQLite 식 깊이/파라미터 수 제한)
+DONG_CHUNK_SIZE = 200
+
+
+def summary_available():
+    """
+    집계 테이블이 한 번이라도 갱신되었는지 여부 (비어 있으면 원본 테이블 쿼리 사용)
+    """
+    return db.session.execute(select(TransactionYearlySummary.tys_id).limit(1)).first() is not None
+
+
+def avg_price_per_sqm():
+    """
+    합계/건수로 평균 평단가 재계산 (건수 0이면 NULL)
+    """
+    return (
+        func.sum(TransactionYearlySummary.price_per_sqm_sum)
+        / func.nullif(func.sum(TransactionYearlySummary.price_per_sqm_count), 0)
+    )
+
+
+def monthly_summary_available():
+    """
+    월별 집계 테이블이 채워져 있는지 여부 (비어 있으면 원본 테이블의 계약 연월 컬럼으로 집계)
+    """
+    return db.session.execute(select(TransactionMonthlySummary.tms_id).limit(1)).first() is not None
+
+
+def dong_changes_available():
+    """
+    법정동 상승률 테이블이 채워져 있는지 여부 (비어 있으면 집계 테이블에서 매번 계산)
+    """
+    return db.session.execute(select(DongChange.dc_id).limit(1)).first() is not None
+
+
+def dong_chunks(dongs):
+    dongs = sorted(dongs, key=lambda dong: tuple('' if v is None else v for v in dong))
+    for i in range(0, len(dongs), DONG_CHUNK_SIZE):
+        yield dongs[i:i + DONG_CHUNK_SIZE]
+
+
+def dong_filter(model, dongs):
+    """
+    (자치구, 법정동) 목록 -> WHERE 조건 (None 은 IS NULL 로 비교)
+    """
+    return or_(*(
+        and_(model.district_name == district_name, model.legal_dong_name == legal_dong_name)
+        for district_name, legal_dong_name in dongs
+    ))
+
+
+def build_dong_yearly_stmt():
+    """
+    집계 테이블 -> 법정동 | 연도별 평균 평단가 + 거래 수 (건물용도 전체, /predict/location 집계 테이블 쿼리와 같은 값)
+    """
+    return (
+        select(
+            TransactionYearlySummary.district_name,
+            TransactionYearlySummary.legal_dong_name,
+            TransactionYearlySummary.reception_year,
+            avg_price_per_sqm().label('avg_price_per_sqm'),
+            func.sum(TransactionYearlySummary.price_per_sqm_count).label('transaction_count'),
+        )
+        .where(TransactionYearlySummary.price_per_sqm_count > 0)
+        .group_by(
+            TransactionYearlySummary.district_name,
+            TransactionYearlySummary.legal_dong_name,
+            TransactionYearlySummary.reception_year,
+        )
+        .order_by(
+            TransactionYearlySummary.legal_dong_name,
+            TransactionYearlySummary.district_name,
+            TransactionYearlySummary.reception_year.nulls_last(),
+        )
+    )
+
+
+def refresh_dong_changes(dongs=None):
+    """
+    법정동별 연도 상승률 / 전체 상승률 테이블 재계산 (집계 테이블 기준)
+    - dongs: 다시 계산할 (자치구, 법정동) 집합, None 이면 전체 재계산
+    - 전년 대비/최초 대비 상승률은 같은 법정동의 다른 연도 값에 의존하므로 법정동 단위로 다시 계산
+    commit 은 호출한 쪽에서 함
+    반환값: 재계산한 법정동 수
+    """
+    stmt = build_dong_yearly_stmt()
+    rows = []
+    if dongs is None:
+        db.session.execute(delete(DongYearlyChange))
+        db.session.execute(delete(DongChange))
+        rows = db.session.execute(stmt).fetchall()
+    else:
+        for chunk in dong_chunks(dongs):
+            db.session.execute(delete(DongYearlyChange).where(dong_filter(DongYearlyChange, chunk)))
+            db.session.execute(delete(DongChange).where(dong_filter(DongChange, chunk)))
+            rows.extend(db.session.execute(stmt.where(dong_filter(TransactionYearlySummary, chunk))).fetchall())
+
+    if not rows:
+        return 0
+
+    # 청크 안에서는 법정동 | 지역구 | 연도 순 정렬, 법정동이 청크를 넘어가지 않으므로 그룹은 연속된 행
+    changes = analytics.dong_yearly_changes({
+        'district_name': analytics.column(rows, 0),
+        'legal_dong_name': analytics.column(rows, 1),
+        'reception_year': analytics.column(rows, 2, np.int64),
+        'avg_price_per_sqm': analytics.column(rows, 3, float),
+        'transaction_count': analytics.column(rows, 4, np.int64),
+    })
+
+    yearly_columns = (
+        'district_name', 'legal_dong_name', 'reception_year', 'avg_price_per_sqm', 'transaction_count', 'yoy_change_rate',
+    )
+    db.session.execute(insert(DongYearlyChange), analytics.to_records(
+        {name: changes[name] for name in yearly_columns}, na=None,
+    ))
+
+    starts = analytics.group_starts(changes['district_name'], changes['legal_dong_name'])
+    updated_at = datetime.now()
+    dong_rows = analytics.to_records({
+        'district_name': changes['district_name'][starts],
+        'legal_dong_name': changes['legal_dong_name'][starts],
+        'first_price': changes['first_price'][starts],
+        'last_price': changes['last_price'][starts],
+        'total_change_rate': changes['total_change_rate'][starts],
+        'transaction_count': analytics.group_sum(changes['transaction_count'], starts),
+    }, na=None)
+    for row in dong_rows:
+        row['updated_at'] = updated_at
+    db.session.execute(insert(DongChange), dong_rows)
+
+    return len(dong_rows)
+
+
+def parking_accessibility_available():
+    """
+    주차 접근성 지수 테이블이 채워져 있는지 여부 (비어 있으면 조회 시 매번 계산)
+    """
+    return db.session.execute(select(ParkingAccessibility.pa_id).limit(1)).first() is not None
+
+
+def build_dong_transaction_stmt(district_name=None):
+    """
+    집계 테이블 -> 법정동별 전체 거래 수 + 평균 평단가 (건물용도/연도 전체)
+    """
+    stmt = (
+        select(
+            TransactionYearlySummary.district_name,
+            TransactionYearlySummary.legal_dong_name,
+            func.sum(TransactionYearlySummary.transaction_count).label('transaction_count'),
+            avg_price_per_sqm().label('avg_price_per_sqm'),
+        )
+        .where(
+            TransactionYearlySummary.district_name.isnot(None),
+            TransactionYearlySummary.legal_dong_name.isnot(None),
+        )
+        .group_by(TransactionYearlySummary.district_name, TransactionYearlySummary.legal_dong_name)
+    )
+    if district_name:
+        stmt = stmt.where(TransactionYearlySummary.district_name == district_name)
+    return stmt
+
+
+def compute_parking_accessibility(district_name=None):
+    """
+    주차장 수용 면수 집계 + 법정동별 거래 집계 결합 -> 법정동별 주차 접근성 지수 (analytics 컬럼 dict)
+    """
+    from myapp.parking.services import build_parking_capacity_stmt
+
+    parking_stmt = build_parking_capacity_stmt()
+    if district_name:
+        parking_stmt = parking_stmt.where(PublicParking.district_name == district_name)
+
+    transactions = db.session.execute(build_dong_transaction_stmt(district_name)).fetchall()
+    parking = db.session.execute(parking_stmt).fetchall()
+    return analytics.parking_accessibility(
+        {
+            'district_name': analytics.column(transactions, 0),
+            'legal_dong_name': analytics.column(transactions, 1),
+            'transaction_count': analytics.column(transactions, 2, np.int64),
+            'avg_price_per_sqm': analytics.column(transactions, 3, float),
+        },
+        {
+            'district_name': analytics.column(parking, 0),
+            'legal_dong_name': analytics.column(parking, 1),
+            'parking_lot_count': analytics.column(parking, 2, np.int64),
+            'parking_capacity': analytics.column(parking, 3, np.int64),
+        },
+    )
+
+
+def refresh_parking_accessibility():
+    """
+    주차 접근성 지수 테이블 전체 재계산 (법정동 수만큼의 행이라 증분 갱신 없이 다시 씀)
+    commit 은 호출한 쪽에서 함
+    반환값: 법정동 수
+    """
+    db.session.execute(delete(ParkingAccessibility))
+
+    rows = analytics.to_records(compute_parking_accessibility(), na=None)
+    if not rows:
+        return 0
+
+    updated_at = datetime.now()
+    for row in rows:
+        row['updated_at'] = updated_at
+    db.session.execute(insert(ParkingAccessibility), rows)
+    return len(rows)
+
+
+def build_delta_stmt(min_ret_id=0, keys=SUMMARY_KEYS):
+    """
+    ret_id > min_ret_id 인 거래를 집계 키별로 합계/건수 집계
+    구/동/용도 키는 코드로 그룹핑한 뒤 참조 테이블에서 이름 복원 (결과 컬럼명은 집계 테이블 키 그대로)
+    """
+    has_price = and_(
+        RealEstateTransaction.building_area > 0,
+        RealEstateTransaction.amount.isnot(None),
+    )
+    price_per_sqm = (RealEstateTransaction.amount * 10000) / RealEstateTransaction.building_area
+    keys = [code_column(RealEstateTransaction, key) for key in keys]
+
+    return decode_lookup_codes(
+        select(
+            *keys,
+            func.coalesce(func.sum(case((has_price, price_per_sqm))), 0).label('price_per_sqm_sum'),
+            func.count(case((has_price, 1))).label('price_per_sqm_count'),
+            func.count().label('transaction_count'),
+            func.max(RealEstateTransaction.ret_id).label('max_ret_id'),
+        )
+        .where(RealEstateTransaction.ret_id > min_ret_id)
+        .group_by(*keys)
+    )
+
+
+def merge_summary_deltas(model, keys, full=False):
+    """
+    집계 테이블(연도별/월별) 하나에 워터마크 이후 거래 합계/건수를 더함 (flush 까지만)
+    - 새 거래가 들어온 법정동의 행만 읽어서 병합
+    - full=True: 전체 삭제 후 재집계
+    반환값: (반영된 키 수, 거래 수, 변경된 (자치구, 법정동) 집합)
+    """
+    if full:
+        db.session.execute(delete(model))
+
+    watermark = db.session.execute(select(func.coalesce(func.max(model.max_ret_id), 0))).scalar()
+
+    deltas = db.session.execute(build_delta_stmt(watermark, keys)).mappings().all()
+
+    # 변경된 파티션 -> 법정동 목록 (집계 테이블은 이 법정동들의 행만 읽어서 병합)
+    dirty_dongs = {(delta['district_name'], delta['legal_dong_name']) for delta in deltas}
+
+    existing = {}
+    if not full:
+        for chunk in dong_chunks(dirty_dongs):
+            rows = db.session.execute(select(model).where(dong_filter(model, chunk))).scalars()
+            for row in rows:
+                existing[tuple(getattr(row, key) for key in keys)] = row
+
+    transaction_count = 0
+    for delta in deltas:
+        key = tuple(delta[k] for k in keys)
+        row = existing.get(key)
+        if row is None:
+            row = model(
+                **dict(zip(keys, key)),
+                price_per_sqm_sum=0,
+                price_per_sqm_count=0,
+                transaction_count=0,
+            )
+            db.session.add(row)
+
+        row.price_per_sqm_sum += delta['price_per_sqm_sum']
+        row.price_per_sqm_count += delta['price_per_sqm_count']
+        row.transaction_count += delta['transaction_count']
+        row.max_ret_id = max(row.max_ret_id or 0, delta['max_ret_id'])
+        transaction_count += delta['transaction_count']
+
+    db.session.flush()
+    return len(deltas), transaction_count, dirty_dongs
+
+
+def refresh_transaction_summary(full=False):
+    """
+    집계 테이블 갱신
+    - 기본: 마지막 반영 ret_id(워터마크) 이후 거래만 집계해서 기존 합계/건수에 더함
+      새 거래가 들어온 (자치구, 법정동, 연도) 파티션만 읽고, 해당 법정동의 상승률만 다시 계산
+    - full=True: 전체 삭제 후 재집계 (기존 거래 수정/삭제 반영 시)
+    - 월별 집계 테이블도 같은 방식으로 갱신 (워터마크는 테이블별로 따로 관리)
+    반환값: 반영된 (키 수, 거래 수, 상승률을 다시 계산한 법정동 수)
+    """
+    key_count, transaction_count, dirty_dongs = merge_summary_deltas(TransactionYearlySummary, SUMMARY_KEYS, full)
+    merge_summary_deltas(TransactionMonthlySummary, MONTHLY_SUMMARY_KEYS, full)
+
+    # 하위 테이블(법정동 상승률): 전체 재집계 / 아직 비어 있으면 전체, 아니면 변경된 법정동만
+    if full or not dong_changes_available():
+        dong_count = refresh_dong_changes()
+    else:
+        dong_count = refresh_dong_changes(dirty_dongs) if dirty_dongs else 0
+
+    # 주차 접근성 지수: 거래 수/평단가가 바뀌었으면 다시 계산
+    if full or key_count or not parking_accessibility_available():
+        refresh_parking_accessibility()
+
+    db.session.commit()
+    return key_count, transaction_count, dong_count
+
+
+def rebuild_monthly_summary():
+    """
+    월별 집계 테이블만 전체 재집계 (계약 연월 backfill 후, 워터마크 이전 거래의 연월이 바뀐 경우)
+    반환값: 키 수
+    """
+    key_count, _, _ = merge_summary_deltas(TransactionMonthlySummary, MONTHLY_SUMMARY_KEYS, full=True)
+    db.session.commit()
+    return key_count
@@ -24,3 +24,24 @@ def setup_db_context():
 
     print("데이터베이스 연결 및 앱 컨텍스트 푸시 완료.")
     return app, db
+
+
+def load_export(path):
+    """
+    `flask export` 로 만든 파일을 DataFrame으로 로드합니다.
+    Arrow IPC(.arrow)는 memory-map으로 열어서 파일 전체를 복사하지 않습니다.
+    Args:
+        path: .parquet 또는 .arrow 파일 경로
+    Returns:
+        DataFrame
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if str(path).endswith('.arrow'):
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+    else:
+        table = pq.read_table(path, memory_map=True)
+
+    return table.to_pandas()
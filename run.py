@@ -1,10 +1,13 @@
 import os
 from myapp import create_app
-from flask_debugtoolbar import DebugToolbarExtension
 
 config_name = os.getenv('FLASK_CONFIG') or 'default'
 app = create_app(config_name)
-DebugToolbarExtension(app)
+
+# 디버그 툴바는 DEBUG 모드에서만 로드
+if app.debug:
+    from flask_debugtoolbar import DebugToolbarExtension
+    DebugToolbarExtension(app)
 
 if __name__ == '__main__':
     app.run(host="0.0.0.0", port=5050)
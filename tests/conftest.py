@@ -0,0 +1,20 @@
+import pytest
+from myapp import create_app, db
+
+
+@pytest.fixture
+def app():
+    """
+    테스트용 앱 (메모리 SQLite, 테이블은 모델 기준으로 생성)
+    """
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
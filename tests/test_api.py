@@ -0,0 +1,73 @@
+import json
+import pytest
+from myapp.models import PublicParking
+from myapp.api.streaming import DEFAULT_COLUMNS
+from myapp import db
+
+
+@pytest.fixture
+def parkings(app):
+    for i in range(5):
+        db.session.add(PublicParking(
+            parking_code=str(1000 + i), parking_name=f'주차장 {i}', address=f'도봉구 방학동 {i}',
+            parking_type_name='노외 주차장', total_spaces=10, current_parking=i,
+        ))
+    db.session.commit()
+
+
+def test_default_columns_match_original_response(client, parkings):
+    response = client.get('/api/public_parkings')
+
+    assert response.status_code == 200
+    rows = response.get_json()
+    assert len(rows) == 5
+    assert set(rows[0]) == set(DEFAULT_COLUMNS['public_parking'])
+
+
+def test_page_cursor(client, parkings):
+    first = client.get('/api/public_parkings?limit=2&fields=pp_id')
+    assert [row['pp_id'] for row in first.get_json()] == [1, 2]
+    assert first.headers['X-Next-Cursor'] == '2'
+
+    last = client.get('/api/public_parkings?limit=2&after=4&fields=pp_id')
+    assert [row['pp_id'] for row in last.get_json()] == [5]
+    assert 'X-Next-Cursor' not in last.headers
+
+
+def test_ndjson_stream(client, parkings):
+    response = client.get('/api/public_parkings?limit=0&fields=pp_id,parking_code&format=ndjson')
+
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)['pp_id'] for line in lines] == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.parametrize('query', [
+    'limit=abc', 'limit=-5', 'after=abc', 'after=-1', 'format=csv', 'fields=nope',
+])
+def test_invalid_parameters(client, parkings, query):
+    response = client.get(f'/api/public_parkings?{query}')
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+def test_export_streams_readable_file(client, parkings, fmt):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+
+    response = client.get(f'/api/export/public_parkings?format={fmt}')
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    body = pa.BufferReader(response.get_data())
+    table = pq.read_table(body) if fmt == 'parquet' else pa.ipc.open_file(body).read_all()
+    assert table.column('pp_id').to_pylist() == [1, 2, 3, 4, 5]
+    assert 'district_name' in table.column_names
+
+
+@pytest.mark.parametrize('query', ['format=csv', 'year=2020', 'year=abc'])
+def test_export_invalid_parameters(client, parkings, query):
+    response = client.get(f'/api/export/public_parkings?{query}')
+
+    assert response.status_code == 400
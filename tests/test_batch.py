@@ -0,0 +1,80 @@
+import json
+import time
+import pytest
+
+
+def post_batch(client, requests):
+    response = client.post('/batch', json={'requests': requests})
+    # 결과 순서 확인을 위해 키 순서를 유지해서 파싱
+    return response, json.loads(response.get_data(as_text=True))
+
+
+def test_results_in_request_order(client):
+    response, payload = post_batch(client, [
+        {'id': 'trend', 'path': '/trend', 'body': {'period': 'quarter'}},
+        {'id': 'district', 'path': '/district'},
+        {'path': '/building', 'body': {'format': 'columnar'}},
+    ])
+
+    assert response.status_code == 200
+    assert list(payload['results']) == ['trend', 'district', '2']
+    assert payload['results']['district']['body'] == client.post('/district', json={}).get_json()
+    assert payload['results']['2']['body'] == client.post('/building', json={'format': 'columnar'}).get_json()
+    assert all(result['elapsed_ms'] >= 0 for result in payload['results'].values())
+
+
+def test_per_item_status(client):
+    response, payload = post_batch(client, [
+        {'id': 'ok', 'path': '/district'},
+        {'id': 'bad', 'path': '/parking/nearest', 'body': {'lat': 'nan', 'lng': 127}},
+    ])
+
+    assert response.status_code == 200
+    assert payload['results']['ok']['status'] == 200
+    assert payload['results']['bad']['status'] == 400
+    assert 'error' in payload['results']['bad']['body']
+
+
+@pytest.mark.parametrize('body', [
+    [1],
+    'x',
+    {},
+    {'requests': []},
+    {'requests': [{'path': '/api/real_estate_transactions'}]},
+    {'requests': [{'path': '/batch'}]},
+    {'requests': [{'id': 'a', 'path': '/district'}, {'id': 'a', 'path': '/building'}]},
+    {'requests': [{'path': '/district', 'body': [1]}]},
+    {'requests': ['/district']},
+])
+def test_rejected_batches(client, body):
+    response = client.post('/batch', json=body)
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_too_many_requests(app, client):
+    app.config['BATCH_MAX_REQUESTS'] = 2
+    response = client.post('/batch', json={'requests': [{'path': '/district'}] * 3})
+
+    assert response.status_code == 400
+
+
+def test_timeout_returns_504(app, client, monkeypatch):
+    app.config['BATCH_TIMEOUT'] = 0.05
+
+    def slow_building():
+        time.sleep(0.5)
+        return {}
+
+    monkeypatch.setitem(app.view_functions, 'main.building', slow_building)
+    response, payload = post_batch(client, [
+        {'id': 'fast', 'path': '/district'},
+        {'id': 'slow', 'path': '/building'},
+    ])
+
+    assert response.status_code == 200
+    assert payload['results']['fast']['status'] == 200
+    assert payload['results']['slow'] == {
+        'status': 504, 'body': {'error': '/building 처리 시간 초과'}, 'elapsed_ms': None,
+    }
@@ -0,0 +1,165 @@
+import threading
+import time
+import pytest
+from myapp.cache import cache, bump_data_version
+from myapp.responses import json_response
+
+
+class SlowView:
+    """
+    started 이후 release 될 때까지 계산이 끝나지 않는 뷰 (동시 요청 재현용)
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return json_response({'calls': self.calls})
+
+
+@pytest.fixture
+def cached_app(app):
+    app.config['RESPONSE_CACHE_TYPE'] = 'simple'
+    app.config['RESPONSE_CACHE_WAIT_TIMEOUT'] = 5
+    # 동시 요청 테스트에서 스레드끼리 SQLite 연결을 함께 쓰지 않도록 데이터 버전은 워커 메모리 사용
+    app.config['RESPONSE_CACHE_VERSION_CHECK_INTERVAL'] = 60
+    cache.init_app(app)
+
+    app.slow_view = SlowView()
+    app.add_url_rule('/slow', 'slow', cache.cached(app.slow_view), methods=['GET', 'POST'])
+    return app
+
+
+@pytest.fixture
+def cached_client(cached_app):
+    return cached_app.test_client()
+
+
+def run_in_thread(client, url, responses):
+    thread = threading.Thread(target=lambda: responses.append(client.get(url)))
+    thread.start()
+    return thread
+
+
+def test_etag_and_cache_hit(cached_client):
+    first = cached_client.get('/district')
+    second = cached_client.get('/district')
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert first.headers['Cache-Control'] == 'no-cache'
+    assert second.get_data() == first.get_data()
+
+    # 파라미터가 다르면 다른 ETag
+    assert cached_client.get('/district?x=1').headers['ETag'] != first.headers['ETag']
+
+
+def test_if_none_match_returns_304(cached_app, cached_client):
+    etag = cached_client.get('/district').headers['ETag']
+
+    response = cached_client.get('/district', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert response.get_data() == b''
+    assert cache.stats()['not_modified'] == 1
+    assert cached_client.get('/district', headers={'If-None-Match': '"other"'}).status_code == 200
+
+
+@pytest.mark.parametrize('encoding', ['gzip', 'br'])
+def test_compressed_etag_suffix(cached_app, cached_client, encoding):
+    if encoding == 'br':
+        pytest.importorskip('brotli')
+    cached_app.config['JSON_COMPRESS_MIN_SIZE'] = 1
+
+    plain = cached_client.get('/district').headers['ETag']
+    response = cached_client.get('/district', headers={'Accept-Encoding': encoding})
+
+    assert response.headers['Content-Encoding'] == encoding
+    assert response.headers['ETag'] == f'{plain[:-1]}-{encoding}"'
+
+    etag = response.headers['ETag']
+    revalidated = cached_client.get('/district', headers={'If-None-Match': etag, 'Accept-Encoding': encoding})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['ETag'] == etag
+
+    # 압축 ETag 로 재검증해도 지금 요청이 압축을 받지 않으면 304 가 아님
+    uncompressed = cached_client.get('/district', headers={'If-None-Match': etag})
+    assert uncompressed.status_code == 200
+    assert uncompressed.headers['ETag'] == plain
+
+
+def test_small_response_etag_not_suffixed(cached_client):
+    response = cached_client.get('/district', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert not response.headers['ETag'].endswith('-gzip"')
+    revalidated = cached_client.get('/district', headers={'If-None-Match': response.headers['ETag'], 'Accept-Encoding': 'gzip'})
+    assert revalidated.status_code == 304
+
+
+def test_bump_data_version_invalidates(cached_client):
+    first = cached_client.get('/district')
+
+    bump_data_version('real_estate_transaction')
+    response = cached_client.get('/district', headers={'If-None-Match': first.headers['ETag']})
+
+    assert response.status_code == 200
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.headers['ETag'] != first.headers['ETag']
+
+
+def test_single_flight_coalesces(cached_app, cached_client):
+    cached_app.config['RESPONSE_CACHE_TYPE'] = 'null'
+    cache.init_app(cached_app)
+    cached_client.get('/district')  # 데이터 버전 메모
+    view = cached_app.slow_view
+
+    responses = []
+    leader = run_in_thread(cached_client, '/slow', responses)
+    assert view.started.wait(5)
+    follower = run_in_thread(cached_client, '/slow', responses)
+    time.sleep(0.2)  # follower 가 진행 중인 계산을 기다리는 상태
+    view.release.set()
+    leader.join()
+    follower.join()
+
+    # 캐시 백엔드 없이도 뷰는 1번만 실행
+    assert view.calls == 1
+    assert sorted(response.headers['X-Cache'] for response in responses) == ['COALESCED', 'MISS']
+    assert [response.get_json() for response in responses] == [{'calls': 1}, {'calls': 1}]
+    assert cache.stats()['in_flight'] == 0
+
+
+def test_slot_limit_returns_503(cached_app, cached_client):
+    cached_app.config['RESPONSE_CACHE_MAX_CONCURRENT'] = 1
+    cache.init_app(cached_app)
+    cached_client.get('/district')  # 데이터 버전 메모 (슬롯은 계산이 끝나면 반환)
+    cached_app.config['RESPONSE_CACHE_WAIT_TIMEOUT'] = 0.05
+    view = cached_app.slow_view
+
+    responses = []
+    holder = run_in_thread(cached_client, '/slow', responses)
+    assert view.started.wait(5)
+    try:
+        # 다른 키: 계산 슬롯을 기다리다 시간 초과 / 같은 키: 진행 중인 계산을 기다리다 시간 초과
+        other_key = cached_client.get('/slow?page=2')
+        same_key = cached_client.get('/slow')
+    finally:
+        view.release.set()
+        holder.join()
+
+    for response in (other_key, same_key):
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+        assert 'error' in response.get_json()
+    assert cache.stats()['rejected'] == 2
+    assert view.calls == 1
+    assert responses[0].status_code == 200
@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import select, func
+from myapp.models import RealEstateTransaction
+from myapp.ingest import ingest_csv
+from myapp import db
+
+HEADER = ('접수연도,자치구코드,자치구명,법정동코드,법정동명,지번구분,지번구분명,본번,부번,건물명,계약일,'
+          '물건금액(만원),건물면적(㎡),토지면적(㎡),층,권리구분,취소일,건축년도,건물용도,신고구분,신고한 개업공인중개사 시군구명')
+# 1, 3행은 같은 건물/계약일/층/면적 (다세대 동시 거래), 2행은 다른 파티션 (자치구)
+ROWS = (
+    '2024,11320,도봉구,10100,방학동,1,대지,100,1,A빌라,20240105,30000,59.9,30.1,2,,,2001,연립다세대,중개거래,도봉구',
+    '2024,11380,은평구,10200,신사동,1,대지,200,0,B아파트,20240106,50000,84.9,40.2,5,,,2010,아파트,중개거래,은평구',
+    '2024,11320,도봉구,10100,방학동,1,대지,100,1,A빌라,20240105,30000,59.9,30.1,2,,,2001,연립다세대,중개거래,도봉구',
+)
+
+
+@pytest.fixture
+def duplicate_csv(tmp_path):
+    path = tmp_path / 'dup.csv'
+    path.write_text('\n'.join((HEADER,) + ROWS) + '\n', encoding='utf-8-sig')
+    return path
+
+
+def transaction_count():
+    return db.session.execute(select(func.count()).select_from(RealEstateTransaction)).scalar()
+
+
+@pytest.mark.parametrize('chunksize', [1, 2, 10])
+def test_duplicate_rows_across_chunks(app, duplicate_csv, chunksize):
+    stats = ingest_csv('transactions', duplicate_csv, chunksize=chunksize)
+
+    assert stats['inserted'] == 3
+    assert transaction_count() == 3
+
+
+@pytest.mark.parametrize('chunksize', [1, 10])
+def test_reingest_is_unchanged(app, duplicate_csv, chunksize):
+    ingest_csv('transactions', duplicate_csv, chunksize=10)
+    stats = ingest_csv('transactions', duplicate_csv, chunksize=chunksize)
+
+    assert (stats['inserted'], stats['updated'], stats['unchanged']) == (0, 0, 3)
+    assert transaction_count() == 3
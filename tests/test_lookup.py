@@ -0,0 +1,48 @@
+from sqlalchemy import select, func
+from myapp.models import RealEstateTransaction, District, LegalDong
+from myapp import db
+
+
+def add_transaction(**values):
+    row = RealEstateTransaction(
+        reception_year=2024, building_use='아파트', amount=30000, building_area=60.0, **values,
+    )
+    db.session.add(row)
+    db.session.commit()
+    return row
+
+
+def test_orm_insert_fills_codes(app):
+    first = add_transaction(district_name='도봉구', legal_dong_name='방학동')
+    second = add_transaction(district_name='도봉구', legal_dong_name='쌍문동')
+
+    assert first.district_id is not None
+    assert first.district_id == second.district_id
+    assert first.legal_dong_id != second.legal_dong_id
+    assert db.session.execute(select(func.count()).select_from(District)).scalar() == 1
+    assert db.session.get(LegalDong, second.legal_dong_id).name == '쌍문동'
+
+
+def test_orm_update_refreshes_code(app):
+    row = add_transaction(district_name='도봉구', legal_dong_name='방학동')
+
+    row.district_name = '은평구'
+    row.legal_dong_name = None
+    db.session.commit()
+
+    assert db.session.get(District, row.district_id).name == '은평구'
+    assert row.legal_dong_id is None
+
+
+def test_orm_rows_visible_to_filters(client):
+    add_transaction(district_name='도봉구', legal_dong_name='방학동')
+    add_transaction(district_name='은평구', legal_dong_name='신사동')
+
+    districts = client.post('/district', json={}).get_json()
+    assert {row['district_name'] for row in districts} == {'도봉구', '은평구'}
+
+    search = client.post('/query/search', json={'district': '도봉구', 'dong': '방학동'}).get_json()
+    assert [(row['district_name'], row['legal_dong_name']) for row in search] == [('도봉구', '방학동')]
+
+    location = client.post('/predict/location', json={'district': '은평구'}).get_json()
+    assert {row['legal_dong_name'] for row in location} == {'신사동'}
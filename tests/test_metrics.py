@@ -0,0 +1,23 @@
+import pytest
+from myapp.metrics import metrics
+
+
+def test_server_timing_hook_runs_last(app):
+    assert app.after_request_funcs[None][0] == metrics._add_server_timing
+
+
+def test_server_timing_header(client):
+    response = client.get('/api/public_parkings')
+
+    assert response.headers['Server-Timing'].startswith('total;dur=')
+
+
+@pytest.mark.parametrize('remote_addr, status', [
+    ('127.0.0.1', 200),
+    ('10.1.2.3', 200),
+    ('203.0.113.7', 403),
+])
+def test_metrics_endpoint_restricted(client, remote_addr, status):
+    response = client.get('/metrics', environ_base={'REMOTE_ADDR': remote_addr})
+
+    assert response.status_code == status
@@ -0,0 +1,226 @@
+import threading
+import time
+import pytest
+from sqlalchemy import select
+from myapp.models import PublicParking, DataVersion
+from myapp.cache import bump_data_version
+from myapp.parking.occupancy import OccupancyState, OCCUPANCY_VERSION, normalize_occupancy
+from myapp.parking.spatial import parking_index
+from myapp.parking.commands import fetch_parking_summary_pandas, _canonical
+from myapp.parking.services import fetch_parking_summary
+from myapp import db
+
+# (주소, 주차장 종류명, 총 주차면, 현재 주차 차량수) | 노상 주차장은 같은 주소 행 수 = 주차면수
+PARKING_ROWS = [
+    ('도봉구 방학동 1-1', '노외 주차장', 120, 30),
+    ('도봉구 방학동 2-1', '노외 주차장', 40, 40),
+    ('도봉구 방학동 3-1', '노상 주차장', 1, 0),
+    ('도봉구 방학동 3-1', '노상 주차장', 1, 1),
+    ('도봉구 방학동 3-1', '노상 주차장', 1, 0),
+    ('도봉구 쌍문동 7', '노외 주차장', 3, 0),
+    ('도봉구 쌍문동 8', '노상 주차장', 1, 1),
+    ('도봉구 쌍문동 8', '노상 주차장', 1, 0),
+    ('은평구 신사동 10', '노외 주차장', 3, 1),
+    ('은평구 신사동 11', '노상 주차장', 1, 0),
+    ('은평구 신사동 11', '노상 주차장', 1, 0),
+    ('은평구 신사동 11', '노상 주차장', 1, 1),
+    ('강남구 신사동 5', '노외 주차장', 500, 120),
+]
+
+
+@pytest.fixture
+def parking_rows(app):
+    for i, (address, type_name, total_spaces, current_parking) in enumerate(PARKING_ROWS):
+        db.session.add(PublicParking(
+            parking_code=str(1000 + i),
+            parking_name=f'주차장 {i}',
+            address=address,
+            parking_type_name=type_name,
+            total_spaces=total_spaces,
+            current_parking=current_parking,
+            basic_rate=100 * (i % 3),
+        ))
+    db.session.commit()
+
+
+@pytest.mark.parametrize('district_name, dong_name', [
+    (None, None),
+    ('도봉구', None),
+    ('도봉구', '방학동'),
+    (None, '신사동'),
+    ('은평구', '신사동'),
+    (None, ''),
+    ('없는구', None),
+])
+def test_parking_summary_matches_pandas(parking_rows, district_name, dong_name):
+    expected = fetch_parking_summary_pandas(district_name, dong_name)
+    actual = fetch_parking_summary(district_name, dong_name)
+
+    assert _canonical(actual) == _canonical(expected)
+    spaces = [row['total_spaces'] for row in actual]
+    assert spaces == sorted(spaces, reverse=True)
+
+
+def test_on_street_lots_counted_per_address(parking_rows):
+    rows = fetch_parking_summary('도봉구', '방학동')
+
+    on_street = [row for row in rows if row['address'] == '도봉구 방학동 3-1']
+    assert len(on_street) == 1
+    assert on_street[0]['total_spaces'] == 3
+
+
+def test_parking_data_route(client, parking_rows):
+    response = client.post('/parking/data', json={'district': '은평구', 'dong': '신사동'})
+
+    assert response.status_code == 200
+    assert _canonical(response.get_json()) == _canonical(fetch_parking_summary_pandas('은평구', '신사동'))
+
+
+@pytest.mark.parametrize('body', [
+    {'lat': 'nan', 'lng': 127},
+    {'lat': 37.5, 'lng': 'inf'},
+    {'lat': 37.5, 'lng': 127, 'radius': '-inf'},
+    {'lat': 37.5, 'lng': 127, 'k': 2.7},
+    {'lat': 37.5, 'lng': 127, 'k': '2.5'},
+    {'lat': 37.5, 'lng': 127, 'min_available': -1},
+    {'lat': 91, 'lng': 127},
+    {'lng': 127},
+    [37.5, 127],
+    'x',
+])
+def test_nearest_invalid_parameters(client, parking_rows, body):
+    response = client.post('/parking/nearest', json=body)
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_nearest_error_messages(client, parking_rows):
+    below = client.post('/parking/nearest', json={'lat': 37.5, 'lng': 127, 'min_available': -1}).get_json()
+    out_of_range = client.post('/parking/nearest', json={'lat': 37.5, 'lng': 127, 'k': 51}).get_json()
+
+    assert below['error'] == 'min_available 값은 0 이상이어야 합니다.'
+    assert out_of_range['error'] == 'k 값은 1 ~ 50 사이여야 합니다.'
+
+
+@pytest.mark.parametrize('k', [3, 3.0, '3'])
+def test_nearest_integral_k(client, parking_rows, k):
+    response = client.post('/parking/nearest', json={'lat': 37.5, 'lng': 127, 'k': k})
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('body', [{'district': ['도봉구']}, {'dong': {'name': '방학동'}}, {'district': 1}, ['도봉구']])
+def test_parking_data_invalid_filters(client, parking_rows, body):
+    response = client.post('/parking/data', json=body)
+
+    assert response.status_code == 400
+
+
+def test_parking_index_rebuilt_once_per_version(app, parking_rows, monkeypatch):
+    app.config['PARKING_INDEX_CHECK_INTERVAL'] = 0
+    parking_index.get()
+    bump_data_version('public_parking')
+
+    builds = []
+    build = parking_index.build
+
+    def slow_build():
+        builds.append(1)
+        time.sleep(0.05)
+        return build()
+
+    monkeypatch.setattr(parking_index, 'build', slow_build)
+
+    def worker():
+        with app.app_context():
+            parking_index.get()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+
+
+def parking_by_code(code):
+    return db.session.execute(select(PublicParking).where(PublicParking.parking_code == code)).scalar_one()
+
+
+def feed(*items):
+    return normalize_occupancy({'parking_code': code, 'current_parking': current} for code, current in items)
+
+
+def test_occupancy_apply_updates_changed_lots(parking_rows):
+    state = OccupancyState()
+
+    # 1000: 같은 값 / 1001: 같은 배치에 두 번 (마지막 값) / 9999: 없는 주차장
+    stats = state.apply(feed(('1000', 30), ('1001', 10), ('1001', 12), ('9999', 5)))
+
+    assert (stats['version'], stats['changed'], stats['unchanged'], stats['unknown']) == (1, 1, 1, 1)
+    assert db.session.get(DataVersion, OCCUPANCY_VERSION).version == 1
+    changed, unchanged = parking_by_code('1001'), parking_by_code('1000')
+    assert (changed.current_parking, changed.occupancy_version) == (12, 1)
+    assert (unchanged.current_parking, unchanged.occupancy_version) == (30, None)
+
+    # 바뀐 주차장이 없는 배치는 버전을 올리지 않음
+    stats = state.apply(feed(('1001', 12)))
+    assert (stats['version'], stats['changed'], stats['unchanged']) == (None, 0, 1)
+    assert db.session.get(DataVersion, OCCUPANCY_VERSION).version == 1
+
+
+def test_parking_index_applies_occupancy_delta(app, parking_rows):
+    app.config['PARKING_INDEX_CHECK_INTERVAL'] = 0
+    snapshot = parking_index.get()
+    changed, unchanged = parking_by_code('1001'), parking_by_code('1000')
+
+    OccupancyState().apply(feed(('1001', 15)))
+
+    # 인덱스는 다시 만들지 않고 바뀐 행만 메모리 테이블에 반영
+    assert parking_index.get() is snapshot
+    assert parking_index.stats()['occupancy_version'] == 1
+    assert snapshot.current_parking(changed.pp_id) == 15
+    assert snapshot.available[snapshot.position[changed.pp_id]] == changed.total_spaces - 15
+    assert snapshot.current_parking(unchanged.pp_id) == 30
+
+
+def test_occupancy_refresh_queries_outside_lock(app, parking_rows, monkeypatch):
+    app.config['PARKING_INDEX_CHECK_INTERVAL'] = 0
+    snapshot = parking_index.get()
+    OccupancyState().apply(feed(('1001', 15)))
+
+    state = app.extensions['parking_index']
+    execute = db.session.execute
+    locked = []
+
+    def spy_execute(*args, **kwargs):
+        locked.append(state['lock'].locked())
+        return execute(*args, **kwargs)
+
+    monkeypatch.setattr(db.session, 'execute', spy_execute)
+    parking_index.refresh_occupancy(snapshot, 1)
+
+    assert locked == [False]
+    assert snapshot.current_parking(parking_by_code('1001').pp_id) == 15
+
+
+def test_occupancy_refresh_discards_stale_rows(app, parking_rows, monkeypatch):
+    app.config['PARKING_INDEX_CHECK_INTERVAL'] = 0
+    snapshot = parking_index.get()
+    OccupancyState().apply(feed(('1001', 15)))
+
+    state = app.extensions['parking_index']
+    execute = db.session.execute
+
+    def execute_then_other_refresh(*args, **kwargs):
+        result = execute(*args, **kwargs)
+        state['occupancy_version'] = 2  # 조회하는 동안 다른 스레드가 더 최신 버전을 반영
+        return result
+
+    monkeypatch.setattr(db.session, 'execute', execute_then_other_refresh)
+    parking_index.refresh_occupancy(snapshot, 1)
+
+    assert state['occupancy_version'] == 2
+    assert snapshot.current_parking(parking_by_code('1001').pp_id) == 40
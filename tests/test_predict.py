@@ -0,0 +1,41 @@
+import pytest
+
+
+@pytest.mark.parametrize('body', [
+    {'amount': 'abc'},
+    {'amount': 1.5},
+    {'amount': True},
+    {'district': ['도봉구']},
+    {'building_type': {'name': '아파트'}},
+    {'n': 0},
+    {'order': 'middle'},
+])
+def test_ranking_invalid_parameters(client, body):
+    response = client.post('/predict/ranking', json=body)
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_ranking_invalid_query_string(client):
+    response = client.get('/predict/ranking?amount=abc')
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('body', [
+    {'amount': 'abc'},
+    {'district': ['도봉구']},
+    {'dong': 1},
+])
+def test_location_invalid_parameters(client, body):
+    response = client.post('/predict/location', json=body)
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('body', [{}, {'amount': '100000', 'district': '도봉구'}, {'amount': 100000.0}])
+def test_ranking_valid_parameters(client, body):
+    response = client.post('/predict/ranking', json=body)
+
+    assert response.status_code == 200
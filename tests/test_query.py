@@ -0,0 +1,51 @@
+import pytest
+from myapp.models import RealEstateTransaction
+from myapp.lookup import assign_lookup_codes
+from myapp import db
+
+# (자치구, 법정동, 건물용도, 금액(만원)) | 입력 순서와 다르게 정렬되어야 함
+TRANSACTION_ROWS = [
+    ('은평구', '신사동', '아파트', 50000),
+    ('도봉구', '쌍문동', '연립다세대', 20000),
+    ('도봉구', '방학동', '아파트', 36000),
+    ('도봉구', '방학동', '아파트', 30000),
+    ('도봉구', '방학동', '단독다가구', 70000),
+]
+
+
+def add_transactions():
+    records = assign_lookup_codes([
+        {'district_name': district, 'legal_dong_name': dong, 'building_use': use, 'amount': amount}
+        for district, dong, use, amount in TRANSACTION_ROWS
+    ])
+    db.session.add_all(RealEstateTransaction(**record) for record in records)
+    db.session.commit()
+
+
+def test_search_ordered_by_district_dong(client):
+    add_transactions()
+
+    rows = client.post('/query/search', json={}).get_json()
+
+    assert [(row['district_name'], row['legal_dong_name'], row['building_use'], row['amount']) for row in rows] == [
+        ('도봉구', '방학동', '단독다가구', 70000),
+        ('도봉구', '방학동', '아파트', 30000),
+        ('도봉구', '방학동', '아파트', 36000),
+        ('도봉구', '쌍문동', '연립다세대', 20000),
+        ('은평구', '신사동', '아파트', 50000),
+    ]
+
+
+def test_search_filters(client):
+    add_transactions()
+
+    rows = client.post('/query/search', json={'district': '도봉구', 'building_type': '아파트', 'amount': 32000}).get_json()
+
+    assert [(row['legal_dong_name'], row['amount']) for row in rows] == [('방학동', 30000)]
+
+
+@pytest.mark.parametrize('body', [[1], 'x'])
+def test_search_non_object_body(client, body):
+    response = client.post('/query/search', json=body)
+
+    assert response.status_code == 400
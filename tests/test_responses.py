@@ -0,0 +1,26 @@
+import pytest
+
+# request_params 로 body 를 읽는 POST 라우트
+PARAM_ROUTES = [
+    '/district',
+    '/building',
+    '/predict/location',
+    '/predict/ranking',
+    '/parking/accessibility',
+    '/trend',
+]
+
+
+@pytest.mark.parametrize('url', PARAM_ROUTES)
+@pytest.mark.parametrize('body', [[1], 'x'])
+def test_non_object_body_rejected(client, url, body):
+    response = client.post(url, json=body)
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': '요청 body 는 JSON 객체여야 합니다.'}
+
+
+@pytest.mark.parametrize('url', ['/district', '/building'])
+def test_empty_body_allowed(client, url):
+    assert client.post(url).status_code == 200
+    assert client.post(url, json={}).status_code == 200
@@ -0,0 +1,116 @@
+import os
+import pytest
+from myapp.models import RealEstateTransaction
+from myapp.lookup import assign_lookup_codes
+from myapp.cache import bump_data_version
+from myapp.snapshot import transaction_snapshot, prune_snapshots, snapshot_path
+from myapp import db
+
+# (접수연도, 자치구, 법정동, 건물용도, 금액(만원), 건물면적) | 접수연도가 NULL인 거래 포함
+TRANSACTION_ROWS = [
+    (2021, '도봉구', '방학동', '아파트', 30000, 60.0),
+    (2022, '도봉구', '방학동', '아파트', 36000, 60.0),
+    (None, '도봉구', '방학동', '아파트', 40000, 60.0),
+    (2021, '도봉구', '쌍문동', '연립다세대', 20000, 40.0),
+    (2023, '도봉구', '쌍문동', '연립다세대', 26000, 40.0),
+    (2021, '은평구', '신사동', '아파트', 50000, 84.0),
+    (None, '은평구', '신사동', '오피스텔', 15000, 30.0),
+    (2022, '은평구', '신사동', '아파트', 55000, 0),
+]
+
+
+@pytest.fixture
+def transactions(app):
+    records = [
+        {
+            'reception_year': year, 'district_name': district, 'legal_dong_name': dong, 'building_use': use,
+            'amount': amount, 'building_area': area,
+        }
+        for year, district, dong, use, amount, area in TRANSACTION_ROWS
+    ]
+    for record in assign_lookup_codes(records):
+        db.session.add(RealEstateTransaction(**record))
+    db.session.commit()
+
+
+@pytest.fixture
+def snapshot_dir(app, tmp_path):
+    app.config['TRANSACTION_SNAPSHOT_CHECK_INTERVAL'] = 0
+    return tmp_path
+
+
+def enable_snapshot(app, root):
+    app.config['TRANSACTION_SNAPSHOT_DIR'] = str(root)
+
+
+def wait_for_builder(app):
+    builder = app.extensions['transaction_snapshot']['builder']
+    if builder is not None:
+        builder.join()
+
+
+@pytest.mark.parametrize('url, body', [
+    ('/district', {}),
+    ('/building', {}),
+    ('/building', {'format': 'pivot'}),
+    ('/predict/location', {}),
+    ('/predict/location', {'district': '도봉구'}),
+    ('/predict/ranking', {}),
+])
+def test_snapshot_matches_sql_with_null_years(app, client, transactions, snapshot_dir, url, body):
+    expected = client.post(url, json=body)
+    assert expected.status_code == 200
+
+    enable_snapshot(app, snapshot_dir)
+    assert transaction_snapshot.build() is not None
+    actual = client.post(url, json=body)
+
+    assert actual.get_json() == expected.get_json()
+
+
+def test_null_year_group_kept(app, client, transactions, snapshot_dir):
+    enable_snapshot(app, snapshot_dir)
+    transaction_snapshot.build()
+
+    rows = client.post('/building', json={}).get_json()
+    null_years = [row for row in rows if row['reception_year'] == '-']
+    assert {row['building_use'] for row in null_years} == {'아파트', '오피스텔'}
+    # NULL 그룹은 연도 정렬에서 맨 뒤
+    assert rows[-len(null_years):] == null_years
+
+
+def test_get_builds_in_background(app, transactions, snapshot_dir):
+    enable_snapshot(app, snapshot_dir)
+
+    # 요청 스레드에서는 만들지 않고 SQL 경로 (None), 백그라운드 스레드가 끝나면 스냅샷 사용
+    assert transaction_snapshot.get() is None
+    wait_for_builder(app)
+    snapshot = transaction_snapshot.get()
+    assert snapshot is not None
+    assert len(snapshot) == len(TRANSACTION_ROWS)
+
+    # 데이터 버전이 바뀌면 새 스냅샷이 준비될 때까지 이전 스냅샷 대신 SQL 경로
+    bump_data_version('real_estate_transaction')
+    assert transaction_snapshot.get() is None
+    wait_for_builder(app)
+    assert transaction_snapshot.get().version == snapshot.version + 1
+
+
+def test_prune_keeps_previous_version(snapshot_dir):
+    for version in (1, 2, 3, 4):
+        os.makedirs(snapshot_path(str(snapshot_dir), version))
+    os.makedirs(f'{snapshot_path(str(snapshot_dir), 5)}.tmp-1-1')
+
+    prune_snapshots(str(snapshot_dir), keep=snapshot_path(str(snapshot_dir), 4))
+
+    assert sorted(os.listdir(snapshot_dir)) == ['transactions-v3', 'transactions-v4', 'transactions-v5.tmp-1-1']
+
+
+def test_pruned_snapshot_falls_back_to_sql(app, client, transactions, snapshot_dir):
+    enable_snapshot(app, snapshot_dir)
+    path = snapshot_path(str(snapshot_dir), 0)
+    os.makedirs(path)  # meta.json 을 읽기 전에 다른 워커가 지운 상태
+
+    assert transaction_snapshot._load(0) is None
+    assert client.post('/district', json={}).status_code == 200
+    wait_for_builder(app)
@@ -0,0 +1,136 @@
+import pytest
+from sqlalchemy import select, delete
+from myapp.models import (
+    TransactionYearlySummary, TransactionMonthlySummary, DongYearlyChange, DongChange, ParkingAccessibility,
+)
+from myapp.summary import refresh_transaction_summary
+from myapp import db
+
+HEADER = ('접수연도,자치구코드,자치구명,법정동코드,법정동명,지번구분,지번구분명,본번,부번,건물명,계약일,'
+          '물건금액(만원),건물면적(㎡),토지면적(㎡),층,권리구분,취소일,건축년도,건물용도,신고구분,신고한 개업공인중개사 시군구명')
+
+DISTRICT_CODES = {'도봉구': 11320, '은평구': 11380}
+DONG_CODES = {'방학동': 10100, '쌍문동': 10200, '신사동': 10300, '갈현동': 10400}
+
+# (본번(행 구분), 접수연도, 자치구, 법정동, 건물용도, 금액(만원), 건물면적, 계약일)
+INITIAL_ROWS = [
+    (1, 2021, '도봉구', '방학동', '아파트', 30000, 60.0, 20210105),
+    (2, 2022, '도봉구', '방학동', '아파트', 36000, 60.0, 20220310),
+    (3, 2022, '도봉구', '쌍문동', '연립다세대', 20000, 40.0, 20220101),
+    (4, 2021, '은평구', '신사동', '아파트', 50000, 84.0, 20210720),
+]
+# 기존 법정동의 새 연도 / 기존 (법정동, 연도) 파티션 / 새 법정동 / 면적 0 (평단가 제외)
+NEW_ROWS = [
+    (5, 2023, '도봉구', '방학동', '아파트', 42000, 60.0, 20230402),
+    (6, 2021, '은평구', '신사동', '아파트', 52000, 84.0, 20211130),
+    (7, 2023, '은평구', '갈현동', '단독다가구', 70000, 120.0, 20230815),
+    (8, 2022, '도봉구', '쌍문동', '연립다세대', 25000, 0, 20220620),
+]
+
+# 집계 테이블을 읽는 라우트
+SUMMARY_ROUTES = [
+    ('/district', {}),
+    ('/building', {}),
+    ('/predict/location', {}),
+    ('/predict/location', {'district': '도봉구'}),
+    ('/predict/ranking', {}),
+    ('/parking/accessibility', {}),
+]
+
+
+def csv_line(row):
+    number, year, district, dong, use, amount, area, contract_date = row
+    return (
+        f'{year},{DISTRICT_CODES[district]},{district},{DONG_CODES[dong]},{dong},1,대지,{number},0,건물{number},'
+        f'{contract_date},{amount},{area},30.0,3,,,2005,{use},중개거래,{district}'
+    )
+
+
+@pytest.fixture
+def write_csv(tmp_path):
+    def write(rows, name='transactions.csv'):
+        path = tmp_path / name
+        path.write_text('\n'.join([HEADER] + [csv_line(row) for row in rows]) + '\n', encoding='utf-8-sig')
+        return str(path)
+    return write
+
+
+def run_ingest(app, path):
+    result = app.test_cli_runner().invoke(args=['ingest', 'transactions', path])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def route_results(client):
+    results = []
+    for url, body in SUMMARY_ROUTES:
+        response = client.post(url, json=body)
+        assert response.status_code == 200
+        results.append(response.get_json())
+    return results
+
+
+def test_incremental_refresh_matches_full_rebuild(app, client, write_csv):
+    run_ingest(app, write_csv(INITIAL_ROWS))
+    before = route_results(client)
+
+    # 새 거래만 들어온 적재 -> 워터마크 이후 증분 반영
+    output = run_ingest(app, write_csv(INITIAL_ROWS + NEW_ROWS))
+    assert f'신규 {len(NEW_ROWS)}' in output and '변경 0' in output
+    incremental = route_results(client)
+    assert incremental != before
+
+    key_count, transaction_count, dong_count = refresh_transaction_summary(full=True)
+    assert transaction_count == len(INITIAL_ROWS) + len(NEW_ROWS)
+    assert route_results(client) == incremental
+
+
+def dong_change_rows():
+    yearly = db.session.execute(select(
+        DongYearlyChange.district_name, DongYearlyChange.legal_dong_name, DongYearlyChange.reception_year,
+        DongYearlyChange.avg_price_per_sqm, DongYearlyChange.transaction_count, DongYearlyChange.yoy_change_rate,
+    )).all()
+    total = db.session.execute(select(
+        DongChange.district_name, DongChange.legal_dong_name, DongChange.first_price, DongChange.last_price,
+        DongChange.total_change_rate, DongChange.transaction_count,
+    )).all()
+    return sorted(yearly), sorted(total)
+
+
+def test_dong_changes_recomputed_for_dirty_dongs(app, write_csv):
+    run_ingest(app, write_csv(INITIAL_ROWS))
+
+    # 방학동(새 연도), 신사동(기존 연도), 갈현동(새 법정동), 쌍문동(평단가 제외 거래)만 다시 계산
+    run_ingest(app, write_csv(INITIAL_ROWS + NEW_ROWS))
+    incremental = dong_change_rows()
+    assert len(incremental[1]) == len(DONG_CODES)
+
+    refresh_transaction_summary(full=True)
+    assert dong_change_rows() == incremental
+
+
+def test_refresh_without_new_rows_is_noop(app, client, write_csv):
+    run_ingest(app, write_csv(INITIAL_ROWS))
+    expected = route_results(client)
+
+    assert refresh_transaction_summary() == (0, 0, 0)
+    assert route_results(client) == expected
+
+
+def test_updated_row_triggers_full_refresh(app, client, write_csv):
+    run_ingest(app, write_csv(INITIAL_ROWS + NEW_ROWS))
+    before = route_results(client)
+
+    # 워터마크 이전 거래의 금액 변경: 증분 갱신으로는 반영되지 않으므로 적재 후 전체 재집계
+    updated = [(1, 2021, '도봉구', '방학동', '아파트', 33000, 60.0, 20210105)] + INITIAL_ROWS[1:] + NEW_ROWS
+    output = run_ingest(app, write_csv(updated, 'updated.csv'))
+    assert '변경 1' in output
+    actual = route_results(client)
+    assert actual != before
+
+    # 기준값: 집계 테이블을 모두 비운 뒤 처음부터 다시 집계
+    for model in (TransactionYearlySummary, TransactionMonthlySummary, DongYearlyChange, DongChange, ParkingAccessibility):
+        db.session.execute(delete(model))
+    db.session.commit()
+    refresh_transaction_summary()
+    assert route_results(client) == actual
@@ -0,0 +1,15 @@
+import os
+from myapp import create_app
+from myapp.parking.spatial import parking_index
+from myapp.snapshot import transaction_snapshot
+
+# 운영 서버 진입점 (gunicorn -c gunicorn.conf.py wsgi:app)
+# 개발 서버는 run.py 사용
+config_name = os.getenv('FLASK_CONFIG') or 'production'
+app = create_app(config_name)
+
+# 주차장 근접 검색 인덱스는 마스터에서 미리 만들어 두고 워커가 fork 로 공유 (preload_app)
+# 실거래가 스냅샷도 마스터에서 memory-map (TRANSACTION_SNAPSHOT_DIR 지정 시)
+with app.app_context():
+    parking_index.warm()
+    transaction_snapshot.warm()